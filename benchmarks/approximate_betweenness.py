@@ -0,0 +1,40 @@
+"""
+Measures runtime and error of global betweenness centrality approximated from sampled pivots, compared to exact
+betweenness, with the sparse matrix backend.
+
+Usage: python benchmarks/approximate_betweenness.py [n_interactions] [n_nodes] [k ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import synthetic
+import vtna.graph
+import vtna.node_measure as nome
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    pivot_counts = [int(arg) for arg in sys.argv[3:]] or [50, 200, 800]
+    edges = synthetic.random_edges(n_interactions, n_nodes=n_nodes)
+    temp_graph = vtna.graph.TemporalGraph(edges, None, 1000, columnar=True)
+    start = time.perf_counter()
+    exact = nome.GlobalBetweennessCentrality(temp_graph, backend='sparse')
+    exact_time = time.perf_counter() - start
+    exact_values = np.array([exact[node.get_id()] for node in temp_graph.get_nodes()])
+    print(f'{n_interactions} interactions, {n_nodes} nodes')
+    print(f'{"k":>6} {"time [s]":>9} {"max error":>10} {"bound (95%)":>12}')
+    print(f'{"exact":>6} {exact_time:>9.2f} {0.0:>10.2e} {0.0:>12.2e}')
+    for k in pivot_counts:
+        start = time.perf_counter()
+        approx = nome.GlobalBetweennessCentrality(temp_graph, backend='sparse', k=k, seed=0)
+        elapsed = time.perf_counter() - start
+        approx_values = np.array([approx[node.get_id()] for node in temp_graph.get_nodes()])
+        error = np.abs(approx_values - exact_values).max()
+        print(f'{k:>6} {elapsed:>9.2f} {error:>10.2e} {approx.get_error_bound():>12.2e}')
+
+
+if __name__ == '__main__':
+    main()
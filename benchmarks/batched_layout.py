@@ -0,0 +1,32 @@
+"""
+Measures runtime of the flexible spring layout of many small time step graphs, laid out one by one with the networkx
+and the Barnes-Hut engine or all at once with the batched engine. Every time step holds 50 interactions.
+
+Usage: python benchmarks/batched_layout.py [n_nodes] [n_timesteps ...]
+"""
+import sys
+import time
+
+import synthetic
+import vtna.edge_store
+import vtna.graph
+import vtna.layout
+
+
+def main():
+    n_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    timestep_counts = [int(arg) for arg in sys.argv[2:]] or [100, 1000, 5000]
+    print(f'{"time steps":>10} {"engine":>11} {"time [s]":>9}')
+    for n_timesteps in timestep_counts:
+        columns = synthetic.random_edge_columns(n_timesteps * 50, n_nodes=n_nodes, n_observations=n_timesteps)
+        store = vtna.edge_store.EdgeStore(*columns, 20)
+        temp_graph = vtna.graph.TemporalGraph.from_edge_store(store, None, columnar=True)
+        for engine in vtna.layout.FLEXIBLE_SPRING_ENGINES:
+            start = time.perf_counter()
+            vtna.layout.flexible_spring_layout(temp_graph, engine=engine)
+            elapsed = time.perf_counter() - start
+            print(f'{n_timesteps:>10} {engine:>11} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Measures runtime of the centrality measures with the networkx backend and the sparse matrix backend.
+
+Usage: python benchmarks/centrality_backends.py [n_interactions] [granularity]
+"""
+import sys
+import time
+
+import synthetic
+import vtna.graph
+import vtna.node_measure as nome
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    edges = synthetic.random_edges(n_interactions, n_nodes=1000)
+    temp_graph = vtna.graph.TemporalGraph(edges, None, granularity)
+    print(f'{n_interactions} interactions, {len(temp_graph)} time steps')
+    print(f'{"measure":>30} {"networkx [s]":>13} {"sparse [s]":>11}')
+    for measure in (nome.LocalDegreeCentrality, nome.GlobalDegreeCentrality,
+                    nome.LocalClosenessCentrality, nome.GlobalClosenessCentrality,
+                    nome.LocalBetweennessCentrality, nome.GlobalBetweennessCentrality):
+        times = list()
+        for backend in nome.BACKENDS:
+            start = time.perf_counter()
+            measure(temp_graph, backend=backend)
+            times.append(time.perf_counter() - start)
+        print(f'{measure.get_name():>30} {times[0]:>13.2f} {times[1]:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
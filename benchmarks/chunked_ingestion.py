@@ -0,0 +1,50 @@
+"""
+Compares peak memory of building a columnar TemporalGraph from a whole edge table and from chunks of it.
+
+Usage: python benchmarks/chunked_ingestion.py [n_interactions] [chunk_size]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import synthetic
+import vtna.data_import as dimp
+import vtna.graph
+
+
+def whole(path: str, chunk_size: int):
+    return vtna.graph.TemporalGraph(dimp.read_edge_array(path), None, 300, columnar=True)
+
+
+def chunked(path: str, chunk_size: int):
+    blocks = dimp.iter_edge_blocks(path, chunk_size=chunk_size)
+    return vtna.graph.TemporalGraph.from_edge_blocks(blocks, None, 300, columnar=True)
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    columns = synthetic.random_edge_columns(n_interactions, n_nodes=2000)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'edges.ssv')
+        np.savetxt(path, np.column_stack(columns), fmt='%d', delimiter=' ')
+        del columns
+        print(f'{n_interactions} interactions, chunks of {chunk_size}')
+        print(f'{"ingestion":>10} {"time [s]":>9} {"peak [MB]":>10} {"retained [MB]":>14}')
+        for name, build in (('whole', whole), ('chunked', chunked)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            temp_graph = build(path, chunk_size)
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del temp_graph
+            print(f'{name:>10} {elapsed:>9.2f} {peak / 2**20:>10.1f} {current / 2**20:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
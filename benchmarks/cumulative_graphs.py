@@ -0,0 +1,57 @@
+"""
+Measures memory of accumulated graphs. Compares a graph that never enables cumulative mode, the cumulative index
+behind TemporalGraph.set_cumulative(True), and eagerly copied accumulated edge lists per time step, which is how
+accumulated graphs were represented before.
+
+Usage: python benchmarks/cumulative_graphs.py [n_interactions] [granularity]
+"""
+import sys
+import tracemalloc
+
+import synthetic
+import vtna.graph
+
+
+def eager_copies(temp_graph: vtna.graph.TemporalGraph):
+    """Reference: one list of accumulated edges with copied timestamps per time step."""
+    accumulated, graphs = dict(), list()
+    for graph in temp_graph:
+        for edge in graph.get_edges():
+            accumulated.setdefault(edge.get_incident_nodes(), []).extend(edge.get_timestamps())
+        graphs.append(vtna.graph.Graph([vtna.graph.Edge(n1, n2, timestamps.copy())
+                                        for (n1, n2), timestamps in accumulated.items()]))
+    return graphs
+
+
+def index(temp_graph: vtna.graph.TemporalGraph):
+    temp_graph.set_cumulative(True)
+    graphs = list(temp_graph)
+    temp_graph.set_cumulative(False)
+    return graphs
+
+
+def traced(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    columns = synthetic.random_edge_columns(n_interactions, n_nodes=500)
+    edges = list(zip(*(column.tolist() for column in columns)))
+    temp_graph, graph_bytes, _ = traced(vtna.graph.TemporalGraph, edges, None, granularity, True)
+    print(f'{n_interactions} interactions, {len(temp_graph)} time steps')
+    print(f'{"accumulated graphs":>20} {"retained [MB]":>14} {"peak [MB]":>10}')
+    print(f'{"none":>20} {graph_bytes / 2**20:>14.1f} {graph_bytes / 2**20:>10.1f}')
+    for name, func in (('cumulative index', index), ('eager copies', eager_copies)):
+        graphs, current, peak = traced(func, temp_graph)
+        print(f'{name:>20} {(graph_bytes + current) / 2**20:>14.1f} {(graph_bytes + peak) / 2**20:>10.1f}')
+        del graphs
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""
+Compares a cold load (parse gzipped text and bucket edges) with a warm load (memory-map cached edge store) of a
+TemporalGraph through vtna.cache.EdgeCache.
+
+Usage: python benchmarks/edge_cache.py [n_interactions]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import synthetic
+import vtna.cache
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    columns = synthetic.random_edge_columns(n_interactions, n_nodes=5000)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'edges.ssv.gz')
+        np.savetxt(path, np.column_stack(columns), fmt='%d', delimiter=' ')
+        cache = vtna.cache.EdgeCache(os.path.join(directory, 'cache'))
+        print(f'{n_interactions} interactions')
+        for name in ('cold', 'warm'):
+            start = time.perf_counter()
+            cache.load_temporal_graph(path, None, 300)
+            print(f'{name}: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
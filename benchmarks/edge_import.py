@@ -0,0 +1,41 @@
+"""
+Compares the list of tuples and the structured array representation of edge tables when reading a file and
+applying the edge table helpers of vtna.data_import.
+
+Usage: python benchmarks/edge_import.py [n_interactions]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import synthetic
+import vtna.data_import as dimp
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    columns = synthetic.random_edge_columns(n_interactions, n_nodes=5000)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'edges.ssv')
+        np.savetxt(path, np.column_stack(columns), fmt='%d', delimiter=' ')
+        print(f'{n_interactions} interactions')
+        print(f'{"representation":>15} {"read [s]":>9} {"interval [s]":>13} {"delta [s]":>10} {"group [s]":>10}')
+        for name, reader in (('list', dimp.read_edge_table), ('array', dimp.read_edge_array)):
+            edges, t_read = timed(reader, path)
+            _, t_interval = timed(dimp.get_time_interval_of_edges, edges)
+            _, t_delta = timed(dimp.infer_update_delta, edges)
+            _, t_group = timed(dimp.group_edges_by_granularity, edges, 300)
+            print(f'{name:>15} {t_read:>9.2f} {t_interval:>13.3f} {t_delta:>10.3f} {t_group:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
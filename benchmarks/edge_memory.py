@@ -0,0 +1,81 @@
+"""
+Measures bytes per edge of materialized graphs. Compares edges as they were represented before, a plain object with
+an instance dictionary that owns a list of its timestamps, with the current slotted Edge whose timestamps are a
+slice of a buffer shared by all edges of a time step.
+
+Usage: python benchmarks/edge_memory.py [n_interactions] [granularity]
+"""
+import sys
+import tracemalloc
+
+import numpy as np
+
+import synthetic
+import vtna.edge_store
+import vtna.graph
+
+
+class DictEdge(object):
+    """Reference: Edge before it used slots and shared timestamp buffers."""
+    def __init__(self, node1: int, node2: int, time_stamps):
+        self.__time_stamps = time_stamps
+        self.__node1, self.__node2 = sorted((node1, node2))
+
+
+class DictNode(object):
+    """Reference: TemporalNode before it used slots."""
+    def __init__(self, node_id: int, meta_attributes, n_timesteps: int):
+        self.__node_id = node_id
+        self.__global_attributes = meta_attributes
+        self.__local_attributes = {}
+        self.__n_timesteps = n_timesteps
+
+
+def owned_lists(store: vtna.edge_store.EdgeStore):
+    graphs = list()
+    for t in range(len(store)):
+        node1, node2 = store.get_edge_nodes(t)
+        timestamps = store.get_step_timestamps(t).tolist()
+        bounds = np.cumsum(store.get_edge_counts(t)).tolist()
+        edges, start = list(), 0
+        for n1, n2, stop in zip(node1.tolist(), node2.tolist(), bounds):
+            edges.append(DictEdge(n1, n2, timestamps[start:stop]))
+            start = stop
+        graphs.append(edges)
+    return graphs
+
+
+def shared_buffers(store: vtna.edge_store.EdgeStore):
+    return [vtna.graph._materialize_graph(store, t) for t in range(len(store))]
+
+
+def traced(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    timestamps, node1, node2 = synthetic.random_edge_columns(n_interactions, n_nodes=10000)
+    store = vtna.edge_store.EdgeStore(timestamps, node1, node2, granularity)
+    n_edges = store.get_n_edges()
+    print(f'{n_interactions} interactions, {n_edges} edges, {len(store)} time steps')
+    print(f'{"edges":>16} {"retained [MB]":>14} {"bytes/edge":>11}')
+    for name, func in (('dict + lists', owned_lists), ('slots + buffers', shared_buffers)):
+        graphs, current = traced(func, store)
+        print(f'{name:>16} {current / 2**20:>14.1f} {current / n_edges:>11.1f}')
+        del graphs
+    node_ids = store.get_node_ids().tolist()
+    print(f'{"nodes":>16} {"bytes/node":>11}')
+    for name, cls in (('dict', DictNode), ('slots', vtna.graph.TemporalNode)):
+        nodes, current = traced(lambda: [cls(node_id, {}, len(store)) for node_id in node_ids])
+        print(f'{name:>16} {current / len(node_ids):>11.1f}')
+        del nodes
+
+
+if __name__ == '__main__':
+    main()
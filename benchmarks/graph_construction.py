@@ -0,0 +1,39 @@
+"""
+Compares construction time and peak memory of TemporalGraph with materialized edges and with the columnar backend.
+
+Usage: python benchmarks/graph_construction.py [n_interactions]
+"""
+import sys
+import time
+import tracemalloc
+
+import synthetic
+import vtna.graph
+
+
+def measure(edges, granularity: int, columnar: bool):
+    # Time and memory are measured in separate runs, because tracing allocations slows down construction.
+    start = time.perf_counter()
+    vtna.graph.TemporalGraph(edges, None, granularity, columnar=columnar)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    temp_graph = vtna.graph.TemporalGraph(edges, None, granularity, columnar=columnar)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return temp_graph, elapsed, current, peak
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    edges = synthetic.random_edges(n_interactions, n_nodes=5000)
+    granularity = 300
+    print(f'{n_interactions} interactions, {granularity} granularity')
+    print(f'{"backend":>12} {"time [s]":>10} {"retained [MB]":>14} {"peak [MB]":>10}')
+    for columnar in (False, True):
+        _, elapsed, current, peak = measure(edges, granularity, columnar)
+        name = 'columnar' if columnar else 'materialized'
+        print(f'{name:>12} {elapsed:>10.2f} {current / 2**20:>14.1f} {peak / 2**20:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Measures runtime of local betweenness centrality for different numbers of worker processes.
+
+Usage: python benchmarks/local_centrality.py [n_interactions] [granularity] [n_workers ...]
+"""
+import os
+import sys
+import time
+
+import synthetic
+import vtna.graph
+import vtna.node_measure
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    worker_counts = [int(arg) for arg in sys.argv[3:]] or sorted({1, 2, os.cpu_count() or 1})
+    edges = synthetic.random_edges(n_interactions, n_nodes=1000)
+    temp_graph = vtna.graph.TemporalGraph(edges, None, granularity)
+    print(f'{n_interactions} interactions, {len(temp_graph)} time steps')
+    print(f'{"workers":>8} {"time [s]":>9}')
+    for n_workers in worker_counts:
+        start = time.perf_counter()
+        vtna.node_measure.LocalBetweennessCentrality(temp_graph, n_workers=n_workers)
+        print(f'{n_workers:>8} {time.perf_counter() - start:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
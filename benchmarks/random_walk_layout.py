@@ -0,0 +1,38 @@
+"""
+Measures runtime and peak memory of the random walk PCA layout in dense and sparse mode for growing numbers of
+nodes. The dense mode is skipped above max_dense_nodes, as it needs memory quadratic in the number of nodes.
+
+Usage: python benchmarks/random_walk_layout.py [max_dense_nodes] [n_nodes ...]
+"""
+import sys
+import time
+import tracemalloc
+
+import synthetic
+import vtna.edge_store
+import vtna.graph
+import vtna.layout
+
+
+def main():
+    max_dense_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    node_counts = [int(arg) for arg in sys.argv[2:]] or [1000, 2000, 5000, 20000]
+    print(f'{"nodes":>7} {"mode":>7} {"time [s]":>9} {"peak [MB]":>10}')
+    for n_nodes in node_counts:
+        columns = synthetic.random_edge_columns(n_nodes * 10, n_nodes=n_nodes)
+        store = vtna.edge_store.EdgeStore(*columns, 200)
+        temp_graph = vtna.graph.TemporalGraph.from_edge_store(store, None, columnar=True)
+        for sparse in (False, True):
+            if not sparse and n_nodes > max_dense_nodes:
+                continue
+            tracemalloc.start()
+            start = time.perf_counter()
+            vtna.layout.random_walk_pca_layout(temp_graph, random_state=0, sparse=sparse)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{n_nodes:>7} {"sparse" if sparse else "dense":>7} {elapsed:>9.2f} {peak / 2**20:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
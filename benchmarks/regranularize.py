@@ -0,0 +1,35 @@
+"""
+Measures runtime of changing the granularity of a temporal graph, compared to building the graph again from its
+edge table. Materialized graphs dominate the runtime of both, columnar graphs show the cost of re-bucketing the
+edge store.
+
+Usage: python benchmarks/regranularize.py [n_interactions] [granularity] [new_granularity ...]
+"""
+import sys
+import time
+
+import synthetic
+import vtna.graph
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    new_granularities = [int(arg) for arg in sys.argv[3:]] or [granularity * 10, granularity * 10 + 7]
+    edges = synthetic.random_edges(n_interactions, n_nodes=1000)
+    print(f'{n_interactions} interactions, granularity {granularity}')
+    print(f'{"columnar":>9} {"granularity":>12} {"rebuild [s]":>12} {"regranularize [s]":>18}')
+    for columnar in (False, True):
+        for new_granularity in new_granularities:
+            start = time.perf_counter()
+            vtna.graph.TemporalGraph(edges, None, new_granularity, columnar=columnar)
+            rebuild = time.perf_counter() - start
+            temp_graph = vtna.graph.TemporalGraph(edges, None, granularity, columnar=columnar)
+            start = time.perf_counter()
+            temp_graph.regranularize(new_granularity)
+            regranularize = time.perf_counter() - start
+            print(f'{str(columnar):>9} {new_granularity:>12} {rebuild:>12.2f} {regranularize:>18.2f}')
+
+
+if __name__ == '__main__':
+    main()
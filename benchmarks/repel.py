@@ -0,0 +1,38 @@
+"""
+Measures runtime of the repel step of the random walk PCA layout for growing numbers of points, comparing the exact
+sequential repel with the approximate repel that moves all points at once. Points are drawn from a mixture of
+gaussian clusters, similar to the projected random walks of a graph with communities. The sequential repel is skipped
+above max_sequential_points, as it takes quadratic time.
+
+Usage: python benchmarks/repel.py [max_sequential_points] [n_points ...]
+"""
+import sys
+import time
+
+import numpy as np
+
+import vtna.layout
+
+
+def main():
+    max_sequential_points = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    point_counts = [int(arg) for arg in sys.argv[2:]] or [1000, 5000, 20000, 100000, 500000]
+    # Module level functions, so their names are not mangled
+    repels = dict(sequential=getattr(vtna.layout, '__sequential_repel'),
+                  approximate=getattr(vtna.layout, '__approximate_repel'))
+    random_state = np.random.RandomState(0)
+    print(f'{"points":>7} {"mode":>12} {"time [s]":>9}')
+    for n_points in point_counts:
+        centers = random_state.uniform(-1, 1, size=(20, 2))
+        points = centers[random_state.randint(0, len(centers), n_points)] + random_state.randn(n_points, 2) * 0.1
+        for mode, repel in repels.items():
+            if mode == 'sequential' and n_points > max_sequential_points:
+                continue
+            start = time.perf_counter()
+            repel(points.copy(), 1.0, 2)
+            elapsed = time.perf_counter() - start
+            print(f'{n_points:>7} {mode:>12} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
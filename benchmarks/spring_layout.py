@@ -0,0 +1,34 @@
+"""
+Measures runtime of the static spring layout with the networkx engine and the native Barnes-Hut engine for growing
+numbers of nodes. The networkx engine is skipped above max_networkx_nodes, as it takes quadratic time per iteration.
+
+Usage: python benchmarks/spring_layout.py [max_networkx_nodes] [n_nodes ...]
+"""
+import sys
+import time
+
+import synthetic
+import vtna.edge_store
+import vtna.graph
+import vtna.layout
+
+
+def main():
+    max_networkx_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    node_counts = [int(arg) for arg in sys.argv[2:]] or [1000, 5000, 10000, 50000]
+    print(f'{"nodes":>7} {"engine":>11} {"time [s]":>9}')
+    for n_nodes in node_counts:
+        columns = synthetic.random_edge_columns(n_nodes * 5, n_nodes=n_nodes)
+        store = vtna.edge_store.EdgeStore(*columns, 200)
+        temp_graph = vtna.graph.TemporalGraph.from_edge_store(store, None, columnar=True)
+        for engine in vtna.layout.SPRING_ENGINES:
+            if engine == 'networkx' and n_nodes > max_networkx_nodes:
+                continue
+            start = time.perf_counter()
+            vtna.layout.static_spring_layout(temp_graph, engine=engine)
+            elapsed = time.perf_counter() - start
+            print(f'{n_nodes:>7} {engine:>11} {elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
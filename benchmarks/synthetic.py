@@ -0,0 +1,35 @@
+"""
+Synthetic contact traces for the benchmark scripts in this directory.
+"""
+import typing as typ
+
+import numpy as np
+
+
+def random_edge_columns(n_interactions: int, n_nodes: int, update_delta: int=20, n_observations: int=None,
+                        seed: int=0) -> typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns a SocioPatterns-like trace as three int64 columns (timestamp, node1, node2), sorted by timestamp.
+
+    Args:
+        n_interactions: Number of temporal edges.
+        n_nodes: Number of distinct nodes.
+        update_delta: Time between two observations.
+        n_observations: Number of distinct observation times. Defaults to one observation per 50 interactions.
+        seed: Seed of the random number generator.
+    """
+    rng = np.random.RandomState(seed)
+    if n_observations is None:
+        n_observations = max(1, n_interactions // 50)
+    timestamps = np.sort(rng.randint(0, n_observations, size=n_interactions).astype(np.int64)) * update_delta
+    node1 = rng.randint(0, n_nodes, size=n_interactions).astype(np.int64)
+    # Avoid self loops by shifting the second node by a non-zero offset.
+    node2 = (node1 + rng.randint(1, n_nodes, size=n_interactions)) % n_nodes
+    return timestamps, node1, node2
+
+
+def random_edges(n_interactions: int, n_nodes: int, update_delta: int=20, n_observations: int=None,
+                 seed: int=0) -> typ.List[typ.Tuple[int, int, int]]:
+    """Same as random_edge_columns, but returns a list of (timestamp, node1, node2) tuples."""
+    columns = random_edge_columns(n_interactions, n_nodes, update_delta, n_observations, seed)
+    return list(zip(*(column.tolist() for column in columns)))
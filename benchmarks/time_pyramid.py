@@ -0,0 +1,34 @@
+"""
+Measures the runtime of switching between granularities with a TimePyramid, compared to re-bucketing the edge store
+for every switch, and the memory of the pyramid levels.
+
+Usage: python benchmarks/time_pyramid.py [n_interactions] [granularity]
+"""
+import sys
+import time
+
+import synthetic
+import vtna.edge_store
+
+
+def main():
+    n_interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    granularity = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    timestamps, node1, node2 = synthetic.random_edge_columns(n_interactions, n_nodes=1000)
+    store = vtna.edge_store.EdgeStore(timestamps, node1, node2, granularity)
+    start = time.perf_counter()
+    pyramid = vtna.edge_store.TimePyramid(store)
+    print(f'{n_interactions} interactions, {len(pyramid)} levels built in {time.perf_counter() - start:.2f} s, '
+          f'{pyramid.nbytes() / 2**20:.1f} MB')
+    print(f'{"granularity":>12} {"rebuild [s]":>12} {"pyramid [s]":>12}')
+    for level_granularity in pyramid.get_granularities()[1::2]:
+        start = time.perf_counter()
+        vtna.edge_store.EdgeStore(timestamps, node1, node2, level_granularity, store.get_earliest())
+        rebuild = time.perf_counter() - start
+        start = time.perf_counter()
+        pyramid.get_store(level_granularity)
+        print(f'{level_granularity:>12} {rebuild:>12.2f} {time.perf_counter() - start:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
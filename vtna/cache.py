@@ -0,0 +1,346 @@
+"""
+Module vtna.cache
+
+On-disk cache for parsed edge tables and bucketed edge stores. Parsing a large, compressed text file with pandas
+and bucketing its edges takes much longer than memory-mapping the result, so the cache persists both as .npy files.
+
+Entries are keyed by path, modification time and size of the source file, the column separator and, for edge stores,
+the granularity. A changed source file therefore never hits a stale entry. The cache is bounded in size and evicts the
+least recently used entries first.
+
+Node measures are memoized by MeasureCache, which keys results by the fingerprint of the temporal graph. Measures of
+a graph that changed since are never returned. Parameters of measures are part of the key as well, so they are
+restricted to primitive values, see MeasureCache.get. Measures pickled to disk are bounded by the same number of
+entries as those in memory and evicted least recently used first as well.
+"""
+__all__ = ['EdgeCache', 'MeasureCache']
+
+import collections
+import copy
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import typing as typ
+
+import numpy as np
+
+import vtna.data_import as dimp
+import vtna.edge_store
+import vtna.graph
+import vtna.node_measure
+
+
+class EdgeCache(object):
+    def __init__(self, cache_dir: str, max_bytes: int=2 ** 30):
+        """
+        Args:
+            cache_dir: Directory for cache entries. Is created if it does not exist.
+            max_bytes: Upper bound for the total size of all entries. Least recently used entries are evicted, when
+                a new entry exceeds the bound.
+        """
+        self.__cache_dir = os.path.abspath(cache_dir)
+        self.__max_bytes = max_bytes
+        os.makedirs(self.__cache_dir, exist_ok=True)
+
+    def load_edge_array(self, graph_data_path: str, col_sep: str=None) -> dimp.TemporalEdgeArray:
+        """
+        Returns the edge table of the provided file as structured edge array, see data_import.read_edge_array.
+        On a cache hit the array is memory-mapped read-only, otherwise the file is parsed and cached.
+        Files that are not on the local file system, e.g. URLs, are parsed without caching.
+        """
+        key = self.__key(graph_data_path, col_sep)
+        if key is None:
+            return dimp.read_edge_array(graph_data_path, col_sep)
+        entry = self.__lookup(key)
+        if entry is not None:
+            return np.load(os.path.join(entry, 'edges.npy'), mmap_mode='r')
+        edges = dimp.read_edge_array(graph_data_path, col_sep)
+        self.__store(key, graph_data_path, lambda directory: np.save(os.path.join(directory, 'edges.npy'), edges))
+        return edges
+
+    def load_edge_store(self, graph_data_path: str, granularity: int, col_sep: str=None) \
+            -> vtna.edge_store.EdgeStore:
+        """
+        Returns the edges of the provided file bucketed into time steps of width granularity.
+        On a cache hit the store is memory-mapped read-only, otherwise it is built from the (cached) edge table.
+        """
+        return self.__load_edge_store(graph_data_path, granularity, col_sep)[0]
+
+    def load_temporal_graph(self, graph_data_path: str, meta_table: dimp.MetadataTable, granularity: int,
+                            col_sep: str=None, columnar: bool=True) -> vtna.graph.TemporalGraph:
+        """
+        Creates a TemporalGraph from the cached edge store of the provided file, see load_edge_store.
+        The entry keeps the order in which nodes first interact, so nodes are ordered like in a graph created from
+        the parsed file. By default the graph is columnar, so its edges stay views into the memory-mapped store.
+        """
+        store, node_order = self.__load_edge_store(graph_data_path, granularity, col_sep)
+        return vtna.graph.TemporalGraph.from_edge_store(store, meta_table, columnar=columnar, node_order=node_order)
+
+    def invalidate(self, graph_data_path: str=None):
+        """
+        Removes all entries of the provided source file, regardless of separator and granularity.
+        If graph_data_path is None, all entries are removed.
+        """
+        source = None if graph_data_path is None else os.path.abspath(graph_data_path)
+        for entry, info in self.__entries():
+            if source is None or info['source'] == source:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def get_size(self) -> int:
+        """Returns the total size of all entries in bytes."""
+        return sum(info['nbytes'] for _, info in self.__entries())
+
+    def get_max_bytes(self) -> int:
+        return self.__max_bytes
+
+    def __key(self, graph_data_path: str, col_sep: typ.Optional[str], granularity: int=None) -> typ.Optional[str]:
+        """Returns the key of a cache entry, or None if the source is not a local file."""
+        try:
+            stat = os.stat(graph_data_path)
+        except (OSError, TypeError, ValueError):
+            return None
+        key = repr((os.path.abspath(graph_data_path), stat.st_mtime_ns, stat.st_size, col_sep, granularity))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def __load_edge_store(self, graph_data_path: str, granularity: int, col_sep: typ.Optional[str]) \
+            -> typ.Tuple[vtna.edge_store.EdgeStore, np.ndarray]:
+        """
+        Returns the edge store of the provided file and the ids of its nodes in the order of their first interaction,
+        see graph.first_seen_node_ids. Both are stored in the same entry, the node order as nodes.npy.
+        """
+        key = self.__key(graph_data_path, col_sep, granularity)
+        if key is None:
+            edges = dimp.read_edge_array(graph_data_path, col_sep)
+            return _build_edge_store(edges, granularity), vtna.graph.first_seen_node_ids(edges)
+        entry = self.__lookup(key)
+        if entry is not None and not os.path.isfile(os.path.join(entry, 'nodes.npy')):
+            # Incomplete entry, which is rebuilt like a miss.
+            shutil.rmtree(entry, ignore_errors=True)
+            entry = None
+        if entry is not None:
+            return vtna.edge_store.EdgeStore.load(entry), np.load(os.path.join(entry, 'nodes.npy'), mmap_mode='r')
+        edges = self.load_edge_array(graph_data_path, col_sep)
+        store = _build_edge_store(edges, granularity)
+        node_order = vtna.graph.first_seen_node_ids(edges)
+
+        def write(directory: str):
+            store.save(directory)
+            np.save(os.path.join(directory, 'nodes.npy'), node_order)
+
+        self.__store(key, graph_data_path, write)
+        return store, node_order
+
+    def __lookup(self, key: str) -> typ.Optional[str]:
+        """Returns directory of entry and marks it as recently used, or None if there is no such entry."""
+        entry = os.path.join(self.__cache_dir, key)
+        info_path = os.path.join(entry, 'info.json')
+        if not os.path.isfile(info_path):
+            return None
+        os.utime(info_path)
+        return entry
+
+    def __store(self, key: str, graph_data_path: str, write: typ.Callable[[str], None]):
+        """Writes an entry into a temporary directory and moves it into place, then evicts entries if necessary."""
+        tmp_dir = tempfile.mkdtemp(dir=self.__cache_dir, prefix='.tmp-')
+        try:
+            write(tmp_dir)
+            nbytes = sum(os.path.getsize(os.path.join(tmp_dir, name)) for name in os.listdir(tmp_dir))
+            with open(os.path.join(tmp_dir, 'info.json'), 'w') as f:
+                json.dump(dict(source=os.path.abspath(graph_data_path), nbytes=nbytes), f)
+            os.rename(tmp_dir, os.path.join(self.__cache_dir, key))
+        except OSError:
+            # Entry exists already, e.g. written concurrently by another process.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.__evict()
+
+    def __entries(self) -> typ.List[typ.Tuple[str, typ.Dict]]:
+        """Returns all complete entries with their info, ordered from least to most recently used."""
+        entries = list()
+        for name in os.listdir(self.__cache_dir):
+            info_path = os.path.join(self.__cache_dir, name, 'info.json')
+            if name.startswith('.') or not os.path.isfile(info_path):
+                continue
+            with open(info_path) as f:
+                info = json.load(f)
+            entries.append((os.path.getmtime(info_path), os.path.join(self.__cache_dir, name), info))
+        entries.sort(key=lambda e: e[0])
+        return [(entry, info) for _, entry, info in entries]
+
+    def __evict(self):
+        entries = self.__entries()
+        total = sum(info['nbytes'] for _, info in entries)
+        for entry, info in entries:
+            if total <= self.__max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= info['nbytes']
+
+
+def _build_edge_store(edges: dimp.TemporalEdgeArray, granularity: int) -> vtna.edge_store.EdgeStore:
+    return vtna.edge_store.EdgeStore(edges['timestamp'], edges['node1'], edges['node2'], granularity)
+
+
+class MeasureCache(object):
+    # Parameters of measures that change how, but not what is computed.
+    EXECUTION_PARAMETERS = ('n_workers', 'chunk_size')
+
+    def __init__(self, max_entries: int=64, cache_dir: str=None):
+        """
+        Memoizes node measures, so that requesting the same measure of an unchanged graph twice computes it once.
+
+        Args:
+            max_entries: Maximal number of measures kept in memory, and in cache_dir if provided. Least recently used
+                measures are evicted first.
+            cache_dir: If provided, measures are additionally pickled into this directory, so that they survive the
+                process. The directory is created if it does not exist. Like EdgeCache, the modification time of
+                a file marks its last use.
+        """
+        if max_entries < 1:
+            raise ValueError(f'max_entries must be at least 1, received {max_entries}')
+        self.__max_entries = max_entries
+        self.__entries = collections.OrderedDict()  # type: typ.Dict[str, typ.Any]
+        self.__cache_dir = None if cache_dir is None else os.path.abspath(cache_dir)
+        if self.__cache_dir is not None:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        """Returns the number of measures kept in memory."""
+        return len(self.__entries)
+
+    def get(self, measure_class: type, temp_graph: vtna.graph.TemporalGraph, **parameters):
+        """
+        Returns measure_class(temp_graph, **parameters), from the cache if the same measure was computed before for
+        a graph with the same fingerprint, see TemporalGraph.get_fingerprint. The returned measure always refers to
+        temp_graph, so add_to_graph adds its values to temp_graph.
+
+        Args:
+            measure_class: A node measure class, e.g. vtna.node_measure.GlobalBetweennessCentrality.
+            temp_graph: The temporal graph.
+            parameters: Keyword arguments passed on to measure_class. Parameters listed in EXECUTION_PARAMETERS are
+                not part of the key, because they do not change the result. All other parameters must be None,
+                bool, int, float, str, or tuples and lists of these, so that keys are the same in every process.
+        Raises:
+            TypeError: If a parameter that is part of the key has another type, e.g. a callable, whose
+                representation contains a memory address.
+        """
+        key = self.__key(measure_class, temp_graph, parameters)
+        measure = self.__entries.get(key)
+        if measure is not None:
+            self.__entries.move_to_end(key)
+            self.__touch(key)
+        else:
+            measure = self.__load(key, temp_graph)
+            if measure is None:
+                measure = measure_class(temp_graph, **parameters)
+                self.__dump(key, measure)
+            self.__entries[key] = measure
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+        if measure._temporal_graph is not temp_graph:
+            # Same fingerprint, but another graph object
+            measure = copy.copy(measure)
+            _bind_measure(measure, temp_graph)
+        return measure
+
+    def clear(self):
+        """Removes all measures from memory and from the cache directory."""
+        self.__entries.clear()
+        if self.__cache_dir is not None:
+            for name in os.listdir(self.__cache_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.__cache_dir, name))
+
+    def get_max_entries(self) -> int:
+        return self.__max_entries
+
+    def __key(self, measure_class: type, temp_graph: vtna.graph.TemporalGraph, parameters: typ.Dict) -> str:
+        parameters = sorted((name, _key_value(name, value)) for name, value in parameters.items()
+                            if name not in MeasureCache.EXECUTION_PARAMETERS)
+        key = repr((measure_class.__module__, measure_class.__qualname__, parameters, temp_graph.get_fingerprint()))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def __load(self, key: str, temp_graph: vtna.graph.TemporalGraph):
+        if self.__cache_dir is None:
+            return None
+        try:
+            with open(os.path.join(self.__cache_dir, f'{key}.pkl'), 'rb') as f:
+                measure = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        self.__touch(key)
+        _bind_measure(measure, temp_graph)
+        return measure
+
+    def __dump(self, key: str, measure):
+        """Pickles the measure without its graph. Writes into a temporary file first, so readers never see parts."""
+        if self.__cache_dir is None:
+            return
+        measure = copy.copy(measure)
+        measure._temporal_graph = None
+        fd, tmp_path = tempfile.mkstemp(dir=self.__cache_dir, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(measure, f)
+            os.replace(tmp_path, os.path.join(self.__cache_dir, f'{key}.pkl'))
+        except (OSError, pickle.PicklingError, AttributeError, TypeError):
+            os.remove(tmp_path)
+        self.__evict_files()
+
+    def __touch(self, key: str):
+        """Marks the pickled measure as recently used, if there is one."""
+        if self.__cache_dir is None:
+            return
+        try:
+            os.utime(os.path.join(self.__cache_dir, f'{key}.pkl'))
+        except OSError:
+            pass
+
+    def __evict_files(self):
+        """Removes the least recently used pickled measures, until at most max_entries are left."""
+        paths = list()
+        for name in os.listdir(self.__cache_dir):
+            if name.endswith('.pkl') and not name.startswith('.'):
+                path = os.path.join(self.__cache_dir, name)
+                try:
+                    paths.append((os.path.getmtime(path), path))
+                except OSError:
+                    # Removed concurrently by another process.
+                    continue
+        paths.sort()
+        for _, path in paths[:max(0, len(paths) - self.__max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _bind_measure(measure, temp_graph: vtna.graph.TemporalGraph):
+    """
+    Makes a measure refer to temp_graph, which has the same fingerprint as the graph it was computed for. The
+    fingerprint does not depend on the order of the nodes, so rows of local measures are reordered like the nodes of
+    temp_graph, see LocalNodeMeasure.get_node_ids.
+    """
+    measure._temporal_graph = temp_graph
+    if isinstance(measure, vtna.node_measure.LocalNodeMeasure):
+        node_ids = temp_graph.get_node_ids()
+        if not np.array_equal(measure._node_ids, node_ids):
+            measure._node_ids = node_ids
+            measure._measures_matrix = None
+
+
+def _key_value(name: str, value: typ.Any) -> typ.Any:
+    """
+    Returns a parameter value of a measure in a form, whose representation is the same in every process: NumPy
+    scalars become Python scalars and lists become tuples. Raises a TypeError for values of other types.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (tuple, list)):
+        return tuple(_key_value(name, item) for item in value)
+    raise TypeError(f'parameter {name} of type {type(value)} can not be cached, expected None, bool, int, float, '
+                    f'str, or a tuple or list of these')
@@ -1,5 +1,5 @@
-__all__ = ['read_edge_table', 'group_edges_by_granularity', 'get_time_interval_of_edges', 'infer_update_delta',
-           'MetadataTable', 'BadOrderError']
+__all__ = ['read_edge_table', 'read_edge_array', 'iter_edge_blocks', 'as_edge_array', 'group_edges_by_granularity',
+           'get_time_interval_of_edges', 'infer_update_delta', 'MetadataTable', 'BadOrderError', 'EDGE_DTYPE']
 
 import collections
 import typing as typ
@@ -9,11 +9,51 @@ import pandas
 import pandas.api.types
 
 TemporalEdge = typ.Tuple[int, int, int]
+# Structured array with one record (timestamp, node1, node2) per temporal edge, see EDGE_DTYPE.
+TemporalEdgeArray = np.ndarray
+TemporalEdges = typ.Union[typ.List[TemporalEdge], TemporalEdgeArray]
+
+EDGE_DTYPE = np.dtype([('timestamp', np.int64), ('node1', np.int64), ('node2', np.int64)])
 
 
 def read_edge_table(graph_data_path: str, col_sep: str=None) -> typ.List[TemporalEdge]:
     """
     Loads edge table from given file path and returns as list of tuples (timestamp, node, node).
+    Use read_edge_array to avoid creating a Python tuple for every edge.
+
+    Args:
+        graph_data_path: Path to file of temporal graph data in the sociopatterns.org style.
+            File can be raw-text or compressed with .gz/.bz2/.zip/.xz.
+            File extension indicates the used compression.
+            URL as path can be used, if no authentication is required to access resource.
+        col_sep: Column separator. If not specified, any whitespace is recognized as separator.
+    Raises:
+        FileNotFoundError: Error occurs if the file path or URL is invalid.
+    """
+    return read_edge_array(graph_data_path, col_sep).tolist()
+
+
+def read_edge_array(graph_data_path: str, col_sep: str=None) -> TemporalEdgeArray:
+    """
+    Loads edge table from given file path and returns it as structured array with fields timestamp, node1 and node2.
+
+    Args:
+        graph_data_path: Path to file of temporal graph data in the sociopatterns.org style.
+            File can be raw-text or compressed with .gz/.bz2/.zip/.xz.
+            File extension indicates the used compression.
+            URL as path can be used, if no authentication is required to access resource.
+        col_sep: Column separator. If not specified, any whitespace is recognized as separator.
+    Raises:
+        FileNotFoundError: Error occurs if the file path or URL is invalid.
+    """
+    return _table_to_edge_array(_read_edge_csv(graph_data_path, col_sep))
+
+
+def iter_edge_blocks(graph_data_path: str, col_sep: str=None, chunk_size: int=1000000) \
+        -> typ.Iterator[TemporalEdgeArray]:
+    """
+    Reads the edge table from given file path in chunks and yields each chunk as structured edge array, so that
+    files larger than the available memory can be processed, e.g. by TemporalGraph.from_edge_blocks.
 
     Args:
         graph_data_path: Path to file of temporal graph data in the sociopatterns.org style.
@@ -21,22 +61,72 @@ def read_edge_table(graph_data_path: str, col_sep: str=None) -> typ.List[Tempora
             File extension indicates the used compression.
             URL as path can be used, if no authentication is required to access resource.
         col_sep: Column separator. If not specified, any whitespace is recognized as separator.
+        chunk_size: Maximum number of edges per yielded block.
     Raises:
         FileNotFoundError: Error occurs if the file path or URL is invalid.
     """
+    for table in _read_edge_csv(graph_data_path, col_sep, chunksize=chunk_size):
+        yield _table_to_edge_array(table)
+
+
+def _read_edge_csv(graph_data_path: str, col_sep: typ.Optional[str], **kwargs):
     if col_sep is None:
         col_sep = r'\s+'
-    table = pandas.read_csv(graph_data_path,
-                            sep=col_sep,  # Split at any whitespace. Files are either space or tab separated.
-                            header=None,
-                            names=['timestamp', 'node1', 'node2'],
-                            usecols=[0, 1, 2],  # Ignore extra columns.
-                            dtype={'timestamp': np.int, 'node1': np.int, 'node2': np.int}
-                            )
-    return list(map(tuple, table.itertuples(index=False)))
+    return pandas.read_csv(graph_data_path,
+                           sep=col_sep,  # Split at any whitespace. Files are either space or tab separated.
+                           header=None,
+                           names=['timestamp', 'node1', 'node2'],
+                           usecols=[0, 1, 2],  # Ignore extra columns.
+                           dtype={'timestamp': np.int64, 'node1': np.int64, 'node2': np.int64},
+                           **kwargs
+                           )
+
 
+def _table_to_edge_array(table: pandas.DataFrame) -> TemporalEdgeArray:
+    edges = np.empty(len(table), dtype=EDGE_DTYPE)
+    for name in EDGE_DTYPE.names:
+        edges[name] = table[name].values
+    return edges
 
-def group_edges_by_granularity(edges: typ.List[TemporalEdge], granularity: int) -> typ.List[typ.List[TemporalEdge]]:
+
+def as_edge_array(edges: TemporalEdges) -> TemporalEdgeArray:
+    """
+    Converts a list of (timestamp, node1, node2) edges to a structured edge array. Arrays with EDGE_DTYPE are
+    returned as is, other structured arrays with integer fields timestamp, node1 and node2 are cast to it.
+
+    Raises:
+        ValueError: If a structured array has other fields or fields that are not integers, or if the edges are not
+            triples.
+    """
+    if _is_edge_array(edges):
+        if edges.dtype == EDGE_DTYPE:
+            return edges
+        if set(edges.dtype.names) != set(EDGE_DTYPE.names) or \
+                any(edges.dtype[name].kind not in 'iu' for name in EDGE_DTYPE.names):
+            raise ValueError(f'structured edge array must have integer fields {", ".join(EDGE_DTYPE.names)}, '
+                             f'received dtype {edges.dtype}')
+        edge_array = np.empty(len(edges), dtype=EDGE_DTYPE)
+        for name in EDGE_DTYPE.names:
+            edge_array[name] = edges[name]
+        return edge_array
+    columns = np.asarray(edges, dtype=np.int64)
+    if columns.size == 0:
+        columns = columns.reshape(0, 3)
+    if columns.ndim != 2 or columns.shape[1] != 3:
+        raise ValueError(f'edges must be (timestamp, node1, node2) triples, i.e. of shape (n, 3), '
+                         f'received shape {columns.shape}')
+    edge_array = np.empty(columns.shape[0], dtype=EDGE_DTYPE)
+    for idx, name in enumerate(EDGE_DTYPE.names):
+        edge_array[name] = columns[:, idx]
+    return edge_array
+
+
+def _is_edge_array(edges: TemporalEdges) -> bool:
+    return isinstance(edges, np.ndarray) and edges.dtype.names is not None
+
+
+def group_edges_by_granularity(edges: TemporalEdges, granularity: int) \
+        -> typ.List[typ.Union[typ.List[TemporalEdge], TemporalEdgeArray]]:
     """
     Groups edges into buckets of width granularity. Each entry of the returned
     list refers to a list of edges of a timestep that has the length granularity.
@@ -45,12 +135,19 @@ def group_edges_by_granularity(edges: typ.List[TemporalEdge], granularity: int)
 
     Args:
         edges: Temporal edges in the form (timestamp, node1, node2) that will
-            be aggregated.
+            be aggregated. If edges is a structured edge array, buckets are
+            edge arrays as well.
         granularity: Length of a timestep
     """
     earliest, latest = get_time_interval_of_edges(edges)
     n_time_steps = int((latest - earliest) / granularity) + 1
 
+    if _is_edge_array(edges):
+        time_steps = (edges['timestamp'] - earliest) // granularity
+        order = np.argsort(time_steps, kind='stable')
+        bounds = np.cumsum(np.bincount(time_steps, minlength=n_time_steps))
+        return np.split(edges[order], bounds[:-1])
+
     time_steps = [list() for _ in range(n_time_steps)]
     for edge in edges:
         timestamp = edge[0]
@@ -59,18 +156,22 @@ def group_edges_by_granularity(edges: typ.List[TemporalEdge], granularity: int)
     return time_steps
 
 
-def get_time_interval_of_edges(edges: typ.List[TemporalEdge]) -> typ.Tuple[int, int]:
+def get_time_interval_of_edges(edges: TemporalEdges) -> typ.Tuple[int, int]:
     """Returns the earliest and latest timestamp of the given edges"""
     if len(edges) == 0:
         raise ValueError('edges cannot be an empty list')
+    if _is_edge_array(edges):
+        return int(np.min(edges['timestamp'])), int(np.max(edges['timestamp']))
     timestamps = list(map(lambda e: e[0], edges))
     return min(timestamps), max(timestamps)
 
 
-def infer_update_delta(edges: typ.List[TemporalEdge]):
+def infer_update_delta(edges: TemporalEdges):
     """Returns update delta, which is the smallest time difference between two edge observations"""
     if len(edges) == 0:
         raise ValueError('edges cannot be an empty list')
+    if _is_edge_array(edges):
+        return int(np.min(np.diff(np.unique(edges['timestamp']))))
     timestamps = sorted(set(map(lambda e: e[0], edges)))
     update_delta = min(timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1))
     return update_delta
@@ -165,14 +266,52 @@ class MetadataTable(object):
             item = val.to_dict()
         return item
 
+    def as_dicts(self, nodes: typ.Iterable[int]=None) -> typ.Dict[int, typ.Dict[str, str]]:
+        """
+        Returns dictionaries of attribute-value pairs of many nodes at once. Rows are selected with one lookup and
+        converted column by column, which is much faster than indexing the table once per node.
+
+        Args:
+            nodes: Nodes to return, in this order. If None, all nodes of the table are returned.
+        Raises:
+            KeyError: If a node does not exist in metadata table. The first such node is the argument of the error.
+        """
+        table = self.__table if nodes is None else self.__table.iloc[self.__rows(nodes)]
+        names = self.get_attribute_names()
+        columns = [table[name].astype(object).tolist() for name in names]
+        rows = zip(*columns) if len(columns) > 0 else [()] * len(table)
+        return dict((node, dict(zip(names, row))) for node, row in zip(table.index.values.tolist(), rows))
+
+    def as_codes(self, nodes: typ.Iterable[int]=None) -> typ.Dict[str, np.ndarray]:
+        """
+        Returns the attribute values of many nodes as integer codes, one array per attribute. Codes index the list
+        returned by get_categories, -1 marks missing values.
+
+        Args:
+            nodes: Nodes to return, in this order. If None, all nodes of the table are returned.
+        Raises:
+            KeyError: If a node does not exist in metadata table. The first such node is the argument of the error.
+        """
+        rows = slice(None) if nodes is None else self.__rows(nodes)
+        return dict((name, self.__table[name].cat.codes.values[rows].astype(np.int64))
+                    for name in self.get_attribute_names())
+
+    def __rows(self, nodes: typ.Iterable[int]) -> np.ndarray:
+        """Returns the positions of nodes in the table, raises KeyError for the first node that does not exist."""
+        nodes = np.fromiter(nodes, dtype=np.int64)
+        rows = self.__table.index.get_indexer(nodes)
+        if (rows < 0).any():
+            raise KeyError(int(nodes[np.argmax(rows < 0)]))
+        return rows
+
     def keys(self) -> typ.List[int]:
         return self.__table.index.values.tolist()
 
     def values(self) -> typ.List[typ.Dict[str, str]]:
-        return [self[key] for key in self.keys()]
+        return list(self.as_dicts().values())
 
     def items(self) -> typ.List[typ.Tuple[int, typ.Dict[str, str]]]:
-        return [(key, self[key]) for key in self.keys()]
+        return list(self.as_dicts().items())
 
 
 class BadOrderError(Exception):
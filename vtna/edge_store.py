@@ -0,0 +1,946 @@
+"""
+Module vtna.edge_store
+
+Columnar storage for temporal edges. Interactions are kept in sorted int64 arrays instead of Python tuples and lists,
+which allows a TemporalGraph to serve its graphs and edges as lightweight views over array slices.
+"""
+__all__ = ['EdgeStore', 'CumulativeIndex', 'TimePyramid']
+
+import hashlib
+import json
+import os
+import typing as typ
+
+import numpy as np
+
+
+class EdgeStore(object):
+    """
+    Columnar container of temporal edges that are bucketed into time steps of a fixed width (granularity).
+
+    Interactions are sorted by (time step, node1, node2, timestamp), with node1 <= node2. Consecutive interactions
+    between the same pair of nodes in the same time step form one edge, so only the timestamps are stored per
+    interaction, while node ids are stored once per edge:
+
+    * timestamps: int64 array of length n_interactions
+    * edge_node1, edge_node2: int64 arrays of length n_edges
+    * edge_offsets: int64 array of length n_edges + 1, edge i owns timestamps[edge_offsets[i]:edge_offsets[i+1]]
+    * step_offsets: int64 array of length n_timesteps + 1, time step t owns edges step_offsets[t]:step_offsets[t+1]
+
+    All arrays are read-only, slices returned by the getters are views and not copies.
+    """
+    def __init__(self, timestamps: np.ndarray, node1: np.ndarray, node2: np.ndarray, granularity: int,
+                 earliest: int=None):
+        """
+        Sorts and buckets the provided interaction columns.
+
+        Args:
+            timestamps: Timestamps of the interactions.
+            node1: First incident node of each interaction.
+            node2: Second incident node of each interaction.
+            granularity: Length of a time step.
+            earliest: Start of the first time step. If None, the earliest timestamp is used.
+        Raises:
+            ValueError: If no interactions are provided, the columns differ in length or granularity is not positive.
+        """
+        if granularity <= 0:
+            raise ValueError(f'granularity has to be positive, received {granularity}')
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if timestamps.shape[0] == 0:
+            raise ValueError('edges cannot be an empty list')
+        if earliest is None:
+            earliest = int(np.min(timestamps))
+        self.__granularity = int(granularity)
+        self.__earliest = int(earliest)
+        self.__set_runs(*_encode_runs(timestamps, node1, node2, self.__earliest, self.__granularity))
+
+    @classmethod
+    def from_blocks(cls, blocks: typ.Iterable[typ.Tuple[np.ndarray, np.ndarray, np.ndarray]], granularity: int,
+                    earliest: int=None) -> 'EdgeStore':
+        """
+        Builds a store from blocks of interactions, e.g. chunks of a file that is too large to be loaded at once.
+        Each block is bucketed and aggregated into edges as it arrives, after which its node columns are released.
+        Peak memory is therefore proportional to the block size plus the aggregated edges and the timestamps,
+        instead of the raw (timestamp, node1, node2) columns of all interactions.
+
+        Args:
+            blocks: Iterable of (timestamps, node1, node2) column triples.
+            granularity: Length of a time step.
+            earliest: Start of the first time step. If None, the earliest timestamp of the first block is used,
+                which requires that no later block contains an earlier timestamp.
+        Raises:
+            ValueError: If blocks contain no interactions, granularity is not positive or a timestamp is earlier
+                than earliest.
+        """
+        if granularity <= 0:
+            raise ValueError(f'granularity has to be positive, received {granularity}')
+        # As long as blocks arrive in time order, only the last time step of the previous block can overlap with
+        # the next block. That time step is kept as carry and merged into the next block, all earlier time steps
+        # are final. Otherwise all parts are merged at the end.
+        parts = list()  # type: typ.List[EdgeRuns]
+        carry = None  # type: EdgeRuns
+        in_order = True
+        for timestamps, node1, node2 in blocks:
+            timestamps = np.asarray(timestamps, dtype=np.int64)
+            if timestamps.shape[0] == 0:
+                continue
+            if earliest is None:
+                earliest = int(np.min(timestamps))
+            part = _encode_runs(timestamps, node1, node2, earliest, granularity)
+            if carry is not None and in_order and part[1][0] < carry[1][0]:
+                in_order = False
+            if not in_order:
+                parts.append(part)
+                continue
+            if carry is not None:
+                part = _merge_runs([carry, part])
+            n_runs = part[1].shape[0]
+            last_step_start = int(np.searchsorted(part[1], part[1][-1]))
+            if last_step_start > 0:
+                parts.append(_slice_runs(part, 0, last_step_start))
+            carry = _slice_runs(part, last_step_start, n_runs)
+        if carry is not None:
+            parts.append(carry)
+        if len(parts) == 0:
+            raise ValueError('edges cannot be an empty list')
+        runs = _concatenate_runs(parts) if in_order else _merge_runs(parts)
+        store = cls.__new__(cls)
+        store.__granularity = int(granularity)
+        store.__earliest = int(earliest)
+        store.__set_runs(*runs)
+        return store
+
+    def append(self, timestamps: np.ndarray, node1: np.ndarray, node2: np.ndarray) -> int:
+        """
+        Appends interactions to the store. New interactions may extend the last time step or create new time steps,
+        so all timestamps have to be at least the start of the last time step. Only the last time step is merged
+        with the new interactions, runs of earlier time steps are not touched.
+
+        On first append, the arrays are copied into buffers with spare capacity that at least doubles when it is
+        exceeded, so appending costs time proportional to the last time step and the new interactions, amortized.
+        The last time step is overwritten in place, so views of it that were returned before appending may change,
+        views of earlier time steps stay valid.
+
+        Returns:
+            Index of the first time step that was changed or created. Equals the number of time steps before
+            appending, if the last time step was not changed.
+        Raises:
+            ValueError: If a timestamp is earlier than the start of the last time step.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        n_timesteps = len(self)
+        if timestamps.shape[0] == 0:
+            return n_timesteps
+        last_step = n_timesteps - 1
+        last_step_start = self.__earliest + last_step * self.__granularity
+        if int(np.min(timestamps)) < last_step_start:
+            raise ValueError(f'cannot append timestamps earlier than {last_step_start}, the start of the last '
+                             f'time step')
+        new_part = _encode_runs(timestamps, node1, node2, self.__earliest, self.__granularity)
+        # Time steps between the last and the first new time step are created empty.
+        first_changed = min(int(new_part[1][0]), n_timesteps)
+        lo = int(self.__step_offsets[last_step]) if first_changed == last_step else self.get_n_edges()
+        n_edges = self.get_n_edges()
+        last_runs = (self.__timestamps, np.full(n_edges - lo, last_step, dtype=np.int64), self.__edge_node1[lo:],
+                     self.__edge_node2[lo:], self.__edge_offsets[lo:])
+        suffix_timestamps, suffix_steps, suffix_node1, suffix_node2, suffix_offsets = _merge_runs(
+            [_slice_runs(last_runs, 0, n_edges - lo), new_part])
+        buffers, index = self.__buffers, self.__cumulative_index
+        if buffers is None:
+            buffers = dict((name, _Buffer(array)) for name, array in self.__arrays().items())
+        timestamps_lo = int(self.__edge_offsets[lo])
+        for name, size, values in (('timestamps', timestamps_lo, suffix_timestamps),
+                                   ('edge_node1', lo, suffix_node1),
+                                   ('edge_node2', lo, suffix_node2),
+                                   ('edge_offsets', lo, suffix_offsets + timestamps_lo),
+                                   ('step_offsets', first_changed,
+                                    lo + np.searchsorted(suffix_steps, np.arange(first_changed,
+                                                                                 int(suffix_steps[-1]) + 2)))):
+            buffers[name].resize(size)
+            buffers[name].append(values)
+        self.__set_arrays(**dict((name, buffer.get_values()) for name, buffer in buffers.items()))
+        self.__buffers = buffers
+        if index is not None:
+            index._extend(self, first_changed)
+            self.__cumulative_index = index
+        return first_changed
+
+    def regranularize(self, granularity: int) -> 'EdgeStore':
+        """
+        Returns a store of the same interactions with another granularity, starting at the same time. If the new
+        granularity is a multiple of the current one, adjacent time steps are merged by sorting edges only, without
+        touching the order of interactions within edges. Otherwise all interactions are bucketed again.
+
+        Raises:
+            ValueError: If granularity is not positive.
+        """
+        if granularity <= 0:
+            raise ValueError(f'granularity has to be positive, received {granularity}')
+        if granularity % self.__granularity != 0:
+            return EdgeStore(*self.get_columns(), granularity, self.__earliest)
+        factor = granularity // self.__granularity
+        store = EdgeStore.__new__(EdgeStore)
+        store.__granularity = int(granularity)
+        store.__earliest = self.__earliest
+        store.__set_runs(*_sort_runs(self.__timestamps, self.get_edge_steps() // factor, self.__edge_node1,
+                                     self.__edge_node2, self.__edge_offsets[:-1], np.diff(self.__edge_offsets),
+                                     ordered_timestamps=True))
+        return store
+
+    def __set_runs(self, timestamps: np.ndarray, run_steps: np.ndarray, run_node1: np.ndarray,
+                   run_node2: np.ndarray, run_offsets: np.ndarray):
+        """Sets the store to the provided edge runs, which have to be sorted by (time step, node1, node2)."""
+        n_timesteps = int(run_steps[-1]) + 1
+        self.__set_arrays(timestamps=timestamps,
+                          edge_node1=run_node1,
+                          edge_node2=run_node2,
+                          edge_offsets=run_offsets,
+                          step_offsets=np.searchsorted(run_steps, np.arange(n_timesteps + 1)).astype(np.int64))
+
+    def __set_arrays(self, timestamps: np.ndarray, edge_node1: np.ndarray, edge_node2: np.ndarray,
+                     edge_offsets: np.ndarray, step_offsets: np.ndarray):
+        self.__timestamps = timestamps
+        self.__edge_node1 = edge_node1
+        self.__edge_node2 = edge_node2
+        self.__edge_offsets = edge_offsets
+        self.__step_offsets = step_offsets
+        for array in self.__arrays().values():
+            array.flags.writeable = False
+        self.__cumulative_index = None  # type: CumulativeIndex
+        # Buffers with spare capacity behind the arrays, created on first append.
+        self.__buffers = None  # type: typ.Dict[str, _Buffer]
+
+    def __arrays(self) -> typ.Dict[str, np.ndarray]:
+        return dict(timestamps=self.__timestamps, edge_node1=self.__edge_node1, edge_node2=self.__edge_node2,
+                    edge_offsets=self.__edge_offsets, step_offsets=self.__step_offsets)
+
+    def save(self, directory: str):
+        """
+        Writes the store into directory, one .npy file per array plus a small JSON header, so that it can be
+        memory-mapped by EdgeStore.load. The directory is created if it does not exist.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self.__arrays().items():
+            np.save(os.path.join(directory, f'{name}.npy'), array)
+        with open(os.path.join(directory, 'header.json'), 'w') as f:
+            json.dump(dict(granularity=self.__granularity, earliest=self.__earliest), f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str='r') -> 'EdgeStore':
+        """
+        Loads a store that was written by EdgeStore.save.
+
+        Args:
+            directory: Directory the store was saved to.
+            mmap_mode: Memory-map mode passed to numpy.load. With the default 'r', arrays are mapped read-only and
+                only pages that are accessed are read from disk. None reads all arrays into memory.
+        """
+        with open(os.path.join(directory, 'header.json')) as f:
+            header = json.load(f)
+        return cls._from_arrays(header['granularity'], header['earliest'],
+                                **dict((name, np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode))
+                                       for name in ('timestamps', 'edge_node1', 'edge_node2', 'edge_offsets',
+                                                    'step_offsets')))
+
+    @classmethod
+    def _from_arrays(cls, granularity: int, earliest: int, timestamps: np.ndarray, edge_node1: np.ndarray,
+                     edge_node2: np.ndarray, edge_offsets: np.ndarray, step_offsets: np.ndarray) -> 'EdgeStore':
+        """Creates a store from arrays in the layout described above, without checking them."""
+        store = cls.__new__(cls)
+        store.__granularity = int(granularity)
+        store.__earliest = int(earliest)
+        store.__set_arrays(timestamps, edge_node1, edge_node2, edge_offsets, step_offsets)
+        return store
+
+    def __len__(self) -> int:
+        """Returns the number of time steps."""
+        return self.__step_offsets.shape[0] - 1
+
+    def get_granularity(self) -> int:
+        return self.__granularity
+
+    def get_earliest(self) -> int:
+        """Returns the start of the first time step."""
+        return self.__earliest
+
+    def get_n_interactions(self) -> int:
+        """Returns the number of stored interactions, i.e. the number of raw temporal edges."""
+        return self.__timestamps.shape[0]
+
+    def get_n_edges(self) -> int:
+        """Returns the number of edges summed over all time steps."""
+        return self.__edge_node1.shape[0]
+
+    def get_cumulative_index(self) -> 'CumulativeIndex':
+        """
+        Returns the index of accumulated edges of this store. It is built on first access, shared by all callers
+        and extended in place when interactions are appended.
+        """
+        if self.__cumulative_index is None:
+            self.__cumulative_index = CumulativeIndex(self)
+        return self.__cumulative_index
+
+    def get_edge_steps(self) -> np.ndarray:
+        """Returns the time step of every edge."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.__step_offsets))
+
+    def get_edge_range(self, time_step: int) -> typ.Tuple[int, int]:
+        """Returns start (inclusive) and stop (exclusive) index of the edges of the specified time step."""
+        return int(self.__step_offsets[time_step]), int(self.__step_offsets[time_step + 1])
+
+    def get_edge_nodes(self, time_step: typ.Union[int, slice]) -> typ.Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the incident nodes of all edges of the specified time step as two arrays.
+        A slice of time steps returns the edges of all time steps in the slice.
+        """
+        if isinstance(time_step, slice):
+            start, stop, _ = time_step.indices(len(self))
+            lo, hi = int(self.__step_offsets[start]), int(self.__step_offsets[stop])
+        else:
+            lo, hi = self.get_edge_range(time_step)
+        return self.__edge_node1[lo:hi], self.__edge_node2[lo:hi]
+
+    def get_edge_offsets(self) -> np.ndarray:
+        """Returns offsets of all edges into the timestamps, edge i owns timestamps[offsets[i]:offsets[i+1]]."""
+        return self.__edge_offsets
+
+    def get_step_offsets(self) -> np.ndarray:
+        """Returns offsets of all time steps into the edges, time step t owns edges offsets[t]:offsets[t+1]."""
+        return self.__step_offsets
+
+    def get_edge_counts(self, time_step: int) -> np.ndarray:
+        """Returns the number of interactions of each edge of the specified time step."""
+        lo, hi = self.get_edge_range(time_step)
+        return np.diff(self.__edge_offsets[lo:hi + 1])
+
+    def get_step_timestamps(self, time_step: typ.Union[int, slice]) -> np.ndarray:
+        """
+        Returns the timestamps of all edges of the specified time step, ordered by edge, as read-only view.
+        A slice of time steps returns the timestamps of all time steps in the slice.
+        """
+        if isinstance(time_step, slice):
+            start, stop, _ = time_step.indices(len(self))
+            lo, hi = int(self.__step_offsets[start]), int(self.__step_offsets[stop])
+        else:
+            lo, hi = self.get_edge_range(time_step)
+        return self.__timestamps[self.__edge_offsets[lo]:self.__edge_offsets[hi]]
+
+    def get_edge_incident_nodes(self, edge_idx: int) -> typ.Tuple[int, int]:
+        """Returns the incident nodes of the edge with the provided index."""
+        return int(self.__edge_node1[edge_idx]), int(self.__edge_node2[edge_idx])
+
+    def get_edge_timestamps(self, edge_idx: int) -> np.ndarray:
+        """Returns the timestamps of the edge with the provided index as read-only view."""
+        return self.__timestamps[self.__edge_offsets[edge_idx]:self.__edge_offsets[edge_idx + 1]]
+
+    def find_edge(self, time_step: int, node1: int, node2: int) -> int:
+        """
+        Returns the index of the edge between node1 and node2 in the specified time step, or -1 if the edge does
+        not exist. Runs in logarithmic time, because edges of a time step are sorted by their incident nodes.
+        """
+        node1, node2 = sorted((node1, node2))
+        lo, hi = self.get_edge_range(time_step)
+        first = self.__edge_node1[lo:hi]
+        n1_lo = lo + int(np.searchsorted(first, node1, side='left'))
+        n1_hi = lo + int(np.searchsorted(first, node1, side='right'))
+        idx = n1_lo + int(np.searchsorted(self.__edge_node2[n1_lo:n1_hi], node2, side='left'))
+        if idx < n1_hi and self.__edge_node2[idx] == node2:
+            return idx
+        return -1
+
+    def get_node_ids(self) -> np.ndarray:
+        """Returns the sorted ids of all nodes that are incident to at least one edge."""
+        return np.union1d(self.__edge_node1, self.__edge_node2)
+
+    def get_columns(self) -> typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the interactions as sorted columns (timestamps, node1, node2). Timestamps are a view, node columns
+        are decoded from the per-edge node ids.
+        """
+        counts = np.diff(self.__edge_offsets)
+        return (self.__timestamps,
+                np.repeat(self.__edge_node1, counts),
+                np.repeat(self.__edge_node2, counts))
+
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of the granularity, the start and all arrays of the store. Stores with the same fingerprint
+        contain the same time steps and edges, e.g. after saving and loading.
+        """
+        digest = hashlib.sha1(repr((self.__granularity, self.__earliest)).encode('utf-8'))
+        for name, array in sorted(self.__arrays().items()):
+            digest.update(name.encode('utf-8'))
+            digest.update(np.ascontiguousarray(array).data)
+        return digest.hexdigest()
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes occupied by the stored arrays."""
+        return sum(array.nbytes for array in self.__arrays().values())
+
+
+class CumulativeIndex(object):
+    """
+    Accumulated edges of an EdgeStore: the accumulated graph of time step t contains every pair of nodes that
+    interacted in a time step up to t, with all timestamps of these interactions.
+
+    Instead of one copy of all accumulated edges per time step, each pair of nodes is stored once with its
+    timestamps in one contiguous, sorted row. The accumulated edge of a pair at time step t is a prefix of that row,
+    whose length is found by binary search for the end of the time step. Pairs are numbered in order of their
+    first-seen time step, so the pairs of an accumulated graph are a prefix of all pairs. Memory is linear in the
+    number of interactions, independent of the number of time steps.
+
+    Appending interactions to the store extends the index in place instead of rebuilding it: pairs of new time steps
+    get the next ids and rows of existing pairs grow at their end. A full row is moved to the end of the timestamp
+    buffer with twice its capacity, and the buffer is compacted once moved rows leave more than half of it unused,
+    so appending costs time proportional to the appended interactions, plus a copy of the sorted pair lookup if new
+    pairs occur. Prefix views of earlier time steps stay valid, views of the last time step may change when
+    interactions are appended to it.
+    """
+    def __init__(self, store: EdgeStore):
+        self.__granularity = store.get_granularity()
+        self.__earliest = store.get_earliest()
+        self.__timestamps = _Buffer()
+        # Node ids of each pair and the position of its row in the timestamp buffer.
+        self.__pair_node1 = _Buffer()
+        self.__pair_node2 = _Buffer()
+        self.__row_starts = _Buffer()
+        self.__row_lengths = _Buffer()
+        self.__row_capacities = _Buffer()
+        self.__step_n_pairs = _Buffer()
+        # Pair ids sorted by nodes, used to look up pairs.
+        self.__lookup_node1 = np.empty(0, dtype=np.int64)
+        self.__lookup_node2 = np.empty(0, dtype=np.int64)
+        self.__lookup_pairs = np.empty(0, dtype=np.int64)
+        self._extend(store, 0)
+
+    def _extend(self, store: EdgeStore, first_changed: int):
+        """
+        Indexes the time steps of store from first_changed onward, replacing indexed time steps from first_changed
+        onward. Called by EdgeStore.append with the first time step that was changed or created.
+        """
+        n_timesteps = len(store)
+        n_kept = int(self.__step_n_pairs.get_values()[first_changed - 1]) if first_changed > 0 else 0
+        step_offsets = store.get_step_offsets()[first_changed:]
+        node1, node2 = store.get_edge_nodes(slice(first_changed, None))
+        steps = np.repeat(np.arange(first_changed, n_timesteps, dtype=np.int64), np.diff(step_offsets))
+        offsets = store.get_edge_offsets()[step_offsets[0]:]
+        timestamps = store.get_step_timestamps(slice(first_changed, None))
+        # Pairs first seen in a changed time step are numbered again.
+        for buffer in (self.__pair_node1, self.__pair_node2, self.__row_starts, self.__row_lengths,
+                       self.__row_capacities):
+            buffer.resize(n_kept)
+        self.__step_n_pairs.resize(first_changed)
+        if self.__lookup_pairs.shape[0] > n_kept:
+            is_kept = self.__lookup_pairs < n_kept
+            self.__lookup_node1 = self.__lookup_node1[is_kept]
+            self.__lookup_node2 = self.__lookup_node2[is_kept]
+            self.__lookup_pairs = self.__lookup_pairs[is_kept]
+        edge_pairs = self.__find_pairs(node1, node2)
+        # Rows of existing pairs lose their timestamps from the first changed time step onward.
+        old_pairs = np.unique(edge_pairs[edge_pairs >= 0])
+        starts = self.__row_starts.get_values()[old_pairs]
+        ends = starts + self.__row_lengths.get_values()[old_pairs]
+        first_changed_start = self.__earliest + first_changed * self.__granularity
+        self.__row_lengths.set_values(old_pairs, _search_rows(self.__timestamps.get_values(), starts, ends,
+                                                              first_changed_start) - starts)
+        # New pairs get the next ids. Edges are sorted by (time step, node1, node2), so numbering pairs by their first
+        # edge orders them by first-seen time step.
+        new_edges = np.flatnonzero(edge_pairs < 0)
+        order = new_edges[np.lexsort((node2[new_edges], node1[new_edges]))]
+        is_first = np.empty(order.shape[0], dtype=np.bool_)
+        is_first[:1] = True
+        is_first[1:] = (node1[order][1:] != node1[order][:-1]) | (node2[order][1:] != node2[order][:-1])
+        first_edges = order[is_first]
+        ranks = np.empty(first_edges.shape[0], dtype=np.int64)
+        ranks[np.argsort(first_edges)] = np.arange(first_edges.shape[0])
+        # lexsort is stable, so the pair of each new edge is the pair of the preceding first edge in sorted order.
+        edge_pairs[order] = n_kept + ranks[np.cumsum(is_first) - 1]
+        positions = _search_pairs(self.__lookup_node1, self.__lookup_node2, node1[first_edges], node2[first_edges])
+        self.__lookup_node1 = np.insert(self.__lookup_node1, positions, node1[first_edges])
+        self.__lookup_node2 = np.insert(self.__lookup_node2, positions, node2[first_edges])
+        self.__lookup_pairs = np.insert(self.__lookup_pairs, positions, n_kept + ranks)
+        first_edges = np.sort(first_edges)
+        self.__pair_node1.append(node1[first_edges])
+        self.__pair_node2.append(node2[first_edges])
+        for buffer in (self.__row_starts, self.__row_lengths, self.__row_capacities):
+            buffer.append(np.zeros(first_edges.shape[0], dtype=np.int64))
+        self.__step_n_pairs.append(n_kept + np.searchsorted(steps[first_edges], np.arange(first_changed, n_timesteps),
+                                                            side='right'))
+        # Timestamps of the edges of each pair are appended to its row, edges of a pair are in time order.
+        order = np.argsort(edge_pairs, kind='stable')
+        counts = np.diff(offsets)[order]
+        is_first = np.empty(order.shape[0], dtype=np.bool_)
+        is_first[:1] = True
+        is_first[1:] = edge_pairs[order][1:] != edge_pairs[order][:-1]
+        pairs = edge_pairs[order][is_first]
+        added = np.add.reduceat(counts, np.flatnonzero(is_first)) if pairs.shape[0] > 0 else counts
+        self.__reserve(pairs, added)
+        out_starts = np.cumsum(counts) - counts
+        gather = np.arange(timestamps.shape[0], dtype=np.int64) + np.repeat(offsets[:-1][order] - offsets[0] -
+                                                                            out_starts, counts)
+        lengths = self.__row_lengths.get_values()[pairs]
+        out_starts = np.cumsum(added) - added
+        scatter = np.arange(timestamps.shape[0], dtype=np.int64) + np.repeat(
+            self.__row_starts.get_values()[pairs] + lengths - out_starts, added)
+        self.__timestamps.set_values(scatter, timestamps[gather])
+        self.__row_lengths.set_values(pairs, lengths + added)
+        if len(self.__timestamps) > 2 * store.get_n_interactions():
+            self.__compact()
+
+    def __find_pairs(self, node1: np.ndarray, node2: np.ndarray) -> np.ndarray:
+        """Returns the ids of the pairs of node1 and node2, or -1 for pairs that are not indexed."""
+        if self.__lookup_pairs.shape[0] == 0:
+            return np.full(node1.shape[0], -1, dtype=np.int64)
+        positions = _search_pairs(self.__lookup_node1, self.__lookup_node2, node1, node2)
+        clipped = np.minimum(positions, self.__lookup_pairs.shape[0] - 1)
+        found = ((positions < self.__lookup_pairs.shape[0]) & (self.__lookup_node1[clipped] == node1) &
+                 (self.__lookup_node2[clipped] == node2))
+        return np.where(found, self.__lookup_pairs[clipped], -1)
+
+    def __reserve(self, pairs: np.ndarray, added: np.ndarray):
+        """Moves rows of pairs that cannot take added more timestamps to the end of the buffer."""
+        starts = self.__row_starts.get_values()[pairs]
+        lengths = self.__row_lengths.get_values()[pairs]
+        capacities = self.__row_capacities.get_values()[pairs]
+        is_full = lengths + added > capacities
+        pairs, starts, lengths = pairs[is_full], starts[is_full], lengths[is_full]
+        capacities = np.maximum(lengths + added[is_full], 2 * capacities[is_full])
+        new_starts = len(self.__timestamps) + np.cumsum(capacities) - capacities
+        self.__timestamps.resize(len(self.__timestamps) + int(np.sum(capacities)))
+        moved = _row_positions(starts, lengths)
+        self.__timestamps.set_values(_row_positions(new_starts, lengths), self.__timestamps.get_values()[moved])
+        self.__row_starts.set_values(pairs, new_starts)
+        self.__row_capacities.set_values(pairs, capacities)
+
+    def __compact(self):
+        """Copies all rows into a new buffer without gaps."""
+        lengths = self.__row_lengths.get_values()
+        starts = np.cumsum(lengths) - lengths
+        self.__timestamps = _Buffer(self.__timestamps.get_values()[_row_positions(self.__row_starts.get_values(),
+                                                                                   lengths)])
+        self.__row_starts = _Buffer(starts)
+        self.__row_capacities = _Buffer(lengths)
+
+    def __len__(self) -> int:
+        """Returns the number of time steps."""
+        return len(self.__step_n_pairs)
+
+    def get_n_pairs(self, time_step: int) -> int:
+        """Returns the number of accumulated edges at the specified time step."""
+        return int(self.__step_n_pairs.get_values()[time_step])
+
+    def get_pairs(self, time_step: int) -> np.ndarray:
+        """Returns the ids of all pairs accumulated up to the specified time step, ordered by first appearance."""
+        return np.arange(self.get_n_pairs(time_step), dtype=np.int64)
+
+    def get_counts(self, pairs: np.ndarray, time_step: int) -> np.ndarray:
+        """Returns the number of interactions of each of the provided pairs up to the specified time step."""
+        starts = self.__row_starts.get_values()[pairs]
+        ends = starts + self.__row_lengths.get_values()[pairs]
+        step_end = self.__earliest + (time_step + 1) * self.__granularity
+        return _search_rows(self.__timestamps.get_values(), starts, ends, step_end) - starts
+
+    def get_pair_nodes(self, pairs: np.ndarray) -> typ.Tuple[np.ndarray, np.ndarray]:
+        return self.__pair_node1.get_values()[pairs], self.__pair_node2.get_values()[pairs]
+
+    def get_pair_timestamps(self, pair: int, count: int) -> np.ndarray:
+        """Returns the first count timestamps of a pair as read-only view."""
+        start = self.__row_starts.get_values()[pair]
+        return self.__timestamps.get_values()[start:start + count]
+
+    def find_pair(self, time_step: int, node1: int, node2: int) -> int:
+        """Returns the id of the pair of node1 and node2, or -1 if they did not interact up to the time step."""
+        node1, node2 = sorted((node1, node2))
+        pair = int(self.__find_pairs(np.array([node1]), np.array([node2]))[0])
+        if 0 <= pair < self.get_n_pairs(time_step):
+            return pair
+        return -1
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes occupied by the index, including unused capacity."""
+        return (sum(buffer.nbytes() for buffer in (self.__timestamps, self.__pair_node1, self.__pair_node2,
+                                                   self.__row_starts, self.__row_lengths, self.__row_capacities,
+                                                   self.__step_n_pairs)) +
+                sum(array.nbytes for array in (self.__lookup_node1, self.__lookup_node2, self.__lookup_pairs)))
+
+
+class TimePyramid(object):
+    """
+    Edges of an EdgeStore aggregated at several coarser granularities, e.g. minutes, hours and days, so that switching
+    between them does not bucket and sort all interactions again.
+
+    Every level merges the edges of the next finer level: an edge of a level is a segment of a permutation of the
+    edges of the base store, which contains all base edges of the same pair of nodes within its time step in time
+    order. Levels keep this permutation, the incident nodes and the number of interactions of their edges, but no
+    timestamps. Aggregated edge counts of a level can therefore be read without touching interactions, and the store
+    of a level is assembled by gathering the timestamps of the base edges segment by segment, which needs no sorting.
+    """
+    def __init__(self, store: EdgeStore, granularities: typ.Sequence[int]=None):
+        """
+        Args:
+            store: Base store, whose granularity is the finest level.
+            granularities: Granularities of the coarser levels. Each has to be a multiple of the previous one and of
+                the granularity of store. If None, granularities double from level to level until a level has a
+                single time step.
+        Raises:
+            ValueError: If a granularity is not a multiple of the previous granularity.
+        """
+        base_granularity = store.get_granularity()
+        if granularities is None:
+            granularities = list()
+            granularity, n_timesteps = base_granularity, len(store)
+            while n_timesteps > 1:
+                granularity *= 2
+                n_timesteps = (n_timesteps + 1) // 2
+                granularities.append(granularity)
+        self.__store = store
+        self.__granularities = [base_granularity]
+        self.__levels = list()  # type: typ.List[typ.Dict[str, np.ndarray]]
+        # The base level consists of the base edges in store order.
+        n_edges = store.get_n_edges()
+        node1, node2 = store.get_edge_nodes(slice(None))
+        # Pairs of nodes are numbered in (node1, node2) order, so that edges are sorted by a single integer key.
+        node_ids = store.get_node_ids()
+        pair_codes = np.searchsorted(node_ids, node1) * node_ids.shape[0] + np.searchsorted(node_ids, node2)
+        pairs, pair_ids = np.unique(pair_codes, return_inverse=True)
+        previous = dict(edge_order=np.arange(n_edges, dtype=np.int64),
+                        edge_offsets=np.arange(n_edges + 1, dtype=np.int64),
+                        edge_node1=node1, edge_node2=node2,
+                        edge_counts=np.diff(store.get_edge_offsets()),
+                        edge_steps=store.get_edge_steps(),
+                        edge_pairs=pair_ids.astype(np.int64))
+        for granularity in granularities:
+            if granularity <= self.__granularities[-1] or granularity % self.__granularities[-1] != 0:
+                raise ValueError(f'granularity {granularity} is not a multiple of {self.__granularities[-1]}')
+            previous = _merge_level(previous, granularity // self.__granularities[-1], pairs.shape[0])
+            self.__levels.append(previous)
+            self.__granularities.append(int(granularity))
+        for level in self.__levels:
+            del level['edge_steps'], level['edge_pairs']
+            for array in level.values():
+                array.flags.writeable = False
+
+    def save(self, directory: str):
+        """
+        Writes the pyramid into directory: the base store as written by EdgeStore.save in subdirectory base, plus one
+        .npy file per array of each level and a JSON header. The directory is created if it does not exist.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.__store.save(os.path.join(directory, 'base'))
+        for granularity, level in zip(self.__granularities[1:], self.__levels):
+            for name, array in level.items():
+                np.save(os.path.join(directory, f'level_{granularity}_{name}.npy'), array)
+        with open(os.path.join(directory, 'header.json'), 'w') as f:
+            json.dump(dict(granularities=self.__granularities), f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str='r') -> 'TimePyramid':
+        """
+        Loads a pyramid that was written by TimePyramid.save.
+
+        Args:
+            directory: Directory the pyramid was saved to.
+            mmap_mode: Memory-map mode passed to numpy.load, see EdgeStore.load.
+        """
+        with open(os.path.join(directory, 'header.json')) as f:
+            header = json.load(f)
+        pyramid = cls.__new__(cls)
+        pyramid.__store = EdgeStore.load(os.path.join(directory, 'base'), mmap_mode)
+        pyramid.__granularities = header['granularities']
+        pyramid.__levels = [dict((name, np.load(os.path.join(directory, f'level_{granularity}_{name}.npy'),
+                                                mmap_mode=mmap_mode))
+                                 for name in ('edge_order', 'edge_offsets', 'edge_node1', 'edge_node2',
+                                              'edge_counts', 'step_offsets'))
+                            for granularity in header['granularities'][1:]]
+        return pyramid
+
+    def __len__(self) -> int:
+        """Returns the number of levels, including the base store."""
+        return len(self.__granularities)
+
+    def get_granularities(self) -> typ.List[int]:
+        """Returns the granularity of each level, from the base store to the coarsest level."""
+        return list(self.__granularities)
+
+    def get_base_store(self) -> EdgeStore:
+        return self.__store
+
+    def get_n_timesteps(self, granularity: int) -> int:
+        """Returns the number of time steps of the level with the provided granularity."""
+        if granularity == self.__granularities[0]:
+            return len(self.__store)
+        return self.__level(granularity)['step_offsets'].shape[0] - 1
+
+    def get_edge_nodes(self, granularity: int, time_step: int) -> typ.Tuple[np.ndarray, np.ndarray]:
+        """Returns the incident nodes of the edges of a time step of the level with the provided granularity."""
+        if granularity == self.__granularities[0]:
+            return self.__store.get_edge_nodes(time_step)
+        level = self.__level(granularity)
+        lo, hi = level['step_offsets'][time_step], level['step_offsets'][time_step + 1]
+        return level['edge_node1'][lo:hi], level['edge_node2'][lo:hi]
+
+    def get_edge_counts(self, granularity: int, time_step: int) -> np.ndarray:
+        """Returns the number of interactions of each edge of a time step of the level with the provided granularity."""
+        if granularity == self.__granularities[0]:
+            return self.__store.get_edge_counts(time_step)
+        level = self.__level(granularity)
+        lo, hi = level['step_offsets'][time_step], level['step_offsets'][time_step + 1]
+        return level['edge_counts'][lo:hi]
+
+    def get_store(self, granularity: int) -> EdgeStore:
+        """
+        Returns a store of all interactions at the provided granularity. Stores of levels are assembled from the
+        merged edges of the level. Other granularities are re-bucketed from the coarsest level whose granularity
+        divides them, or from the base store.
+
+        Raises:
+            ValueError: If granularity is not positive.
+        """
+        if granularity == self.__granularities[0]:
+            return self.__store
+        if granularity in self.__granularities:
+            return self.__assemble(self.__level(granularity), granularity)
+        divisors = [g for g in self.__granularities if granularity % g == 0]
+        if len(divisors) == 0:
+            return self.__store.regranularize(granularity)
+        return self.get_store(divisors[-1]).regranularize(granularity)
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes occupied by the levels, excluding the base store."""
+        return sum(array.nbytes for level in self.__levels for array in level.values())
+
+    def __level(self, granularity: int) -> typ.Dict[str, np.ndarray]:
+        try:
+            return self.__levels[self.__granularities.index(granularity) - 1]
+        except ValueError:
+            raise KeyError(f'no level with granularity {granularity}')
+
+    def __assemble(self, level: typ.Dict[str, np.ndarray], granularity: int) -> EdgeStore:
+        base_offsets = self.__store.get_edge_offsets()
+        edge_order = level['edge_order']
+        run_counts = np.diff(base_offsets)[edge_order]
+        out_starts = np.cumsum(run_counts) - run_counts
+        n_interactions = int(base_offsets[-1])
+        # Base edges of a segment follow each other in time, so gathered timestamps are sorted within each edge.
+        timestamps = self.__store.get_columns()[0][np.arange(n_interactions, dtype=np.int64) +
+                                                   np.repeat(base_offsets[:-1][edge_order] - out_starts, run_counts)]
+        edge_offsets = np.append(out_starts, n_interactions)[level['edge_offsets']]
+        return EdgeStore._from_arrays(granularity, self.__store.get_earliest(), timestamps,
+                                      np.array(level['edge_node1']), np.array(level['edge_node2']), edge_offsets,
+                                      np.array(level['step_offsets']))
+
+
+class _Buffer(object):
+    """
+    Growable int64 array. Capacity at least doubles when it is exceeded, so appending n values costs O(n) amortized.
+    Values are written in place, so read-only views returned by get_values see later writes unless the buffer was
+    reallocated in between.
+    """
+    def __init__(self, values: np.ndarray=(), capacity: int=None):
+        values = np.asarray(values, dtype=np.int64)
+        self.__size = values.shape[0]
+        self.__data = np.empty(max(self.__size, capacity or 0), dtype=np.int64)
+        self.__data[:self.__size] = values
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def resize(self, size: int):
+        """Changes the number of values, new values are uninitialized."""
+        if size > self.__data.shape[0]:
+            data = np.empty(max(size, 2 * self.__data.shape[0]), dtype=np.int64)
+            data[:self.__size] = self.__data[:self.__size]
+            self.__data = data
+        self.__size = size
+
+    def append(self, values: np.ndarray):
+        size = self.__size
+        self.resize(size + values.shape[0])
+        self.__data[size:self.__size] = values
+
+    def get_values(self) -> np.ndarray:
+        """Returns the values as read-only view."""
+        values = self.__data[:self.__size]
+        values.flags.writeable = False
+        return values
+
+    def set_values(self, positions: typ.Union[np.ndarray, slice], values: np.ndarray):
+        self.__data[positions] = values
+
+    def nbytes(self) -> int:
+        """Returns the number of bytes allocated, including unused capacity."""
+        return self.__data.nbytes
+
+
+def _merge_level(previous: typ.Dict[str, np.ndarray], factor: int, n_pairs: int) -> typ.Dict[str, np.ndarray]:
+    """Merges the edges of factor adjacent time steps of a pyramid level into the edges of the next level."""
+    steps = previous['edge_steps'] // factor
+    # Edges of a new time step consist of factor sorted runs, which a stable sort merges quickly. Stability keeps
+    # edges of the same pair in time order.
+    order = np.argsort(steps * n_pairs + previous['edge_pairs'], kind='stable')
+    steps, pair_ids = steps[order], previous['edge_pairs'][order]
+    node1, node2 = previous['edge_node1'][order], previous['edge_node2'][order]
+    segment_starts = previous['edge_offsets'][:-1][order]
+    segment_lengths = np.diff(previous['edge_offsets'])[order]
+    out_starts = np.cumsum(segment_lengths) - segment_lengths
+    n_base_edges = previous['edge_order'].shape[0]
+    edge_order = previous['edge_order'][np.arange(n_base_edges, dtype=np.int64) +
+                                        np.repeat(segment_starts - out_starts, segment_lengths)]
+    is_new_edge = np.empty(steps.shape[0], dtype=np.bool_)
+    is_new_edge[:1] = True
+    is_new_edge[1:] = (steps[1:] != steps[:-1]) | (pair_ids[1:] != pair_ids[:-1])
+    merged = np.flatnonzero(is_new_edge)
+    n_timesteps = int(steps[-1]) + 1
+    return dict(edge_order=edge_order,
+                edge_offsets=np.append(out_starts[merged], n_base_edges).astype(np.int64),
+                edge_node1=node1[merged],
+                edge_node2=node2[merged],
+                edge_counts=np.add.reduceat(previous['edge_counts'][order], merged),
+                edge_steps=steps[merged],
+                edge_pairs=pair_ids[merged],
+                step_offsets=np.searchsorted(steps[merged], np.arange(n_timesteps + 1)).astype(np.int64))
+
+
+# Edge runs are the intermediate representation used to build stores: interactions sorted by
+# (time step, node1, node2, timestamp), where each run of consecutive interactions between the same nodes in the
+# same time step is one edge. A tuple (timestamps, run_steps, run_node1, run_node2, run_offsets) describes the runs,
+# run i owns timestamps[run_offsets[i]:run_offsets[i+1]].
+EdgeRuns = typ.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _encode_runs(timestamps: np.ndarray, node1: np.ndarray, node2: np.ndarray, earliest: int,
+                 granularity: int) -> EdgeRuns:
+    """Sorts unordered interaction columns, buckets them into time steps and run-length encodes them into edges."""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    node1 = np.asarray(node1, dtype=np.int64)
+    node2 = np.asarray(node2, dtype=np.int64)
+    if not (timestamps.shape == node1.shape == node2.shape):
+        raise ValueError('timestamp, node1 and node2 columns must have the same length')
+    node1, node2 = np.minimum(node1, node2), np.maximum(node1, node2)
+    steps = (timestamps - earliest) // granularity
+    if np.any(steps < 0):
+        raise ValueError(f'timestamps earlier than {earliest} cannot be stored')
+    order = np.lexsort((timestamps, node2, node1, steps))
+    timestamps, node1, node2, steps = timestamps[order], node1[order], node2[order], steps[order]
+    is_new_run = np.empty(timestamps.shape[0], dtype=np.bool_)
+    is_new_run[:1] = True
+    is_new_run[1:] = (steps[1:] != steps[:-1]) | (node1[1:] != node1[:-1]) | (node2[1:] != node2[:-1])
+    run_starts = np.flatnonzero(is_new_run)
+    return (timestamps, steps[run_starts], node1[run_starts], node2[run_starts],
+            np.append(run_starts, timestamps.shape[0]).astype(np.int64))
+
+
+def _merge_runs(parts: typ.List[EdgeRuns]) -> EdgeRuns:
+    """
+    Merges edge runs of multiple parts into one sorted set of runs. Runs of different parts that refer to the same
+    edge are combined. Only runs are sorted, timestamps are gathered in a single pass.
+    """
+    if len(parts) == 1:
+        return parts[0]
+    base = np.cumsum([0] + [part[0].shape[0] for part in parts[:-1]])
+    timestamps = np.concatenate([part[0] for part in parts])
+    run_steps = np.concatenate([part[1] for part in parts])
+    run_node1 = np.concatenate([part[2] for part in parts])
+    run_node2 = np.concatenate([part[3] for part in parts])
+    run_starts = np.concatenate([part[4][:-1] + offset for part, offset in zip(parts, base)])
+    run_counts = np.concatenate([np.diff(part[4]) for part in parts])
+    return _sort_runs(timestamps, run_steps, run_node1, run_node2, run_starts, run_counts)
+
+
+def _sort_runs(timestamps: np.ndarray, run_steps: np.ndarray, run_node1: np.ndarray, run_node2: np.ndarray,
+               run_starts: np.ndarray, run_counts: np.ndarray, ordered_timestamps: bool=False) -> EdgeRuns:
+    """
+    Sorts runs by (time step, node1, node2) and combines runs of the same edge. Run r owns the timestamps
+    timestamps[run_starts[r]:run_starts[r] + run_counts[r]].
+
+    Args:
+        ordered_timestamps: If True, runs of the same edge are known to follow each other in time, so timestamps of
+            combined runs are sorted without sorting them again.
+    """
+    # lexsort is stable, so runs of the same edge keep their order.
+    order = np.lexsort((run_node2, run_node1, run_steps))
+    run_steps, run_node1, run_node2 = run_steps[order], run_node1[order], run_node2[order]
+    run_starts, run_counts = run_starts[order], run_counts[order]
+    # Gather timestamps run by run: position i of run r maps to run_starts[r] + i.
+    out_starts = np.cumsum(run_counts) - run_counts
+    gather = np.arange(timestamps.shape[0], dtype=np.int64) + np.repeat(run_starts - out_starts, run_counts)
+    timestamps = timestamps[gather]
+    del gather
+    # Combine adjacent runs of the same edge.
+    is_new_run = np.empty(run_steps.shape[0], dtype=np.bool_)
+    is_new_run[:1] = True
+    is_new_run[1:] = ((run_steps[1:] != run_steps[:-1]) | (run_node1[1:] != run_node1[:-1]) |
+                      (run_node2[1:] != run_node2[:-1]))
+    merged = np.flatnonzero(is_new_run)
+    run_offsets = np.append(out_starts[merged], timestamps.shape[0]).astype(np.int64)
+    if merged.shape[0] < run_steps.shape[0] and not ordered_timestamps:
+        # Timestamps of combined runs are only sorted within each run, so sort them by (edge, timestamp).
+        edge_ids = np.repeat(np.arange(merged.shape[0]), np.diff(run_offsets))
+        timestamps = timestamps[np.lexsort((timestamps, edge_ids))]
+    return timestamps, run_steps[merged], run_node1[merged], run_node2[merged], run_offsets
+
+
+def _slice_runs(runs: EdgeRuns, lo: int, hi: int) -> EdgeRuns:
+    """Returns runs lo to hi (exclusive) as views."""
+    timestamps, run_steps, run_node1, run_node2, run_offsets = runs
+    return (timestamps[run_offsets[lo]:run_offsets[hi]], run_steps[lo:hi], run_node1[lo:hi], run_node2[lo:hi],
+            run_offsets[lo:hi + 1] - run_offsets[lo])
+
+
+def _concatenate_runs(parts: typ.List[EdgeRuns]) -> EdgeRuns:
+    """
+    Concatenates parts whose runs are sorted and do not overlap, i.e. the last run of a part precedes the first run
+    of the next part. The list is emptied while copying, so that each part is released as soon as it is copied.
+    """
+    n_interactions = sum(part[0].shape[0] for part in parts)
+    n_runs = sum(part[1].shape[0] for part in parts)
+    timestamps = np.empty(n_interactions, dtype=np.int64)
+    run_steps = np.empty(n_runs, dtype=np.int64)
+    run_node1 = np.empty(n_runs, dtype=np.int64)
+    run_node2 = np.empty(n_runs, dtype=np.int64)
+    run_offsets = np.empty(n_runs + 1, dtype=np.int64)
+    ts_pos, run_pos = 0, 0
+    parts.reverse()
+    while len(parts) > 0:
+        part_timestamps, part_steps, part_node1, part_node2, part_offsets = parts.pop()
+        n = part_steps.shape[0]
+        timestamps[ts_pos:ts_pos + part_timestamps.shape[0]] = part_timestamps
+        run_steps[run_pos:run_pos + n] = part_steps
+        run_node1[run_pos:run_pos + n] = part_node1
+        run_node2[run_pos:run_pos + n] = part_node2
+        run_offsets[run_pos:run_pos + n] = part_offsets[:-1] + ts_pos
+        ts_pos += part_timestamps.shape[0]
+        run_pos += n
+    run_offsets[-1] = ts_pos
+    return timestamps, run_steps, run_node1, run_node2, run_offsets
+
+
+def _row_positions(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Returns the positions of all rows, row i covers positions starts[i] to starts[i] + lengths[i] (exclusive)."""
+    out_starts = np.cumsum(lengths) - lengths
+    return np.arange(int(np.sum(lengths)), dtype=np.int64) + np.repeat(starts - out_starts, lengths)
+
+
+def _search_rows(values: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+                 targets: typ.Union[np.ndarray, int]) -> np.ndarray:
+    """
+    Binary search in many sorted rows at once: returns for each row values[lo[i]:hi[i]] the first position whose value
+    is not less than targets[i], or hi[i] if there is none.
+    """
+    lo, hi = np.array(lo, dtype=np.int64), np.array(hi, dtype=np.int64)
+    targets = np.broadcast_to(targets, lo.shape)
+    active = np.flatnonzero(lo < hi)
+    while active.shape[0] > 0:
+        mid = (lo[active] + hi[active]) // 2
+        is_less = values[mid] < targets[active]
+        lo[active[is_less]] = mid[is_less] + 1
+        hi[active[~is_less]] = mid[~is_less]
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def _search_pairs(sorted_node1: np.ndarray, sorted_node2: np.ndarray, node1: np.ndarray,
+                  node2: np.ndarray) -> np.ndarray:
+    """Returns the positions at which pairs (node1, node2) would be inserted into pairs sorted by (node1, node2)."""
+    return _search_rows(sorted_node2, np.searchsorted(sorted_node1, node1, side='left'),
+                        np.searchsorted(sorted_node1, node1, side='right'), node2)
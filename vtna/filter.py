@@ -1,4 +1,7 @@
 import typing as typ
+import weakref
+
+import numpy as np
 
 import vtna.graph as graph
 
@@ -8,44 +11,272 @@ class NodeFilter(object):
     Defines a wrapper for boolean predicates which can be combined for complex
     filter queries.
     Predicates apply to nodes and their properties, and can be provided.
+
+    Combined filters keep the expression tree of their operands. Applied to a temporal graph with mask or apply,
+    the tree is evaluated as boolean array operations, where the predefined predicates compare attribute columns of
+    the graph at once. Other predicates are evaluated node by node.
+
+    Filters with predicates on local attributes, like local_interval_attribute_greater_than, depend on the time
+    step. They are evaluated for all nodes and time steps at once into a matrix, which is cached until the graph or
+    its attributes change, so that the mask of a time step is a column lookup.
     """
     def __init__(self, predicate: typ.Callable[[graph.TemporalNode], bool]):
         self.predicate = predicate
+        self.__operator = None  # type: str
+        self.__operands = tuple()  # type: typ.Tuple[NodeFilter, ...]
+        self.__matrix_cache = None  # type: typ.Tuple[weakref.ref, int, int, np.ndarray]
+
+    @classmethod
+    def __combine(cls, predicate: typ.Callable[[graph.TemporalNode], bool], operator: str,
+                  *operands: 'NodeFilter') -> 'NodeFilter':
+        new_filter = cls(predicate)
+        new_filter.__operator = operator
+        new_filter.__operands = operands
+        return new_filter
 
     def __add__(self, other: 'NodeFilter') -> 'NodeFilter':
         """UNION of two NodeFilter objects"""
         if not isinstance(other, NodeFilter):
             raise TypeError(f'expected type {NodeFilter}, received type {type(other)}')
-        new_filter = NodeFilter(lambda n: self.predicate(n) or other.predicate(n))
+        new_filter = NodeFilter.__combine(lambda n: self.predicate(n) or other.predicate(n), 'or', self, other)
         return new_filter
 
     def __mul__(self, other: 'NodeFilter') -> 'NodeFilter':
         """INTERSECTION of two NodeFilter objects"""
         if not isinstance(other, NodeFilter):
             raise TypeError(f'expected type {NodeFilter}, received type {type(other)}')
-        new_filter = NodeFilter(lambda n: self.predicate(n) and other.predicate(n))
+        new_filter = NodeFilter.__combine(lambda n: self.predicate(n) and other.predicate(n), 'and', self, other)
         return new_filter
 
     def __sub__(self, other: 'NodeFilter') -> 'NodeFilter':
         """DIFFERENCE of two NodeFilter objects"""
         if not isinstance(other, NodeFilter):
             raise TypeError(f'expected type {NodeFilter}, received type {type(other)}')
-        new_filter = NodeFilter(lambda n: self.predicate(n) and not other.predicate(n))
+        new_filter = NodeFilter.__combine(lambda n: self.predicate(n) and not other.predicate(n), 'difference',
+                                          self, other)
         return new_filter
 
     def __neg__(self) -> 'NodeFilter':
         """COMPLEMENT of two NodeFilter objects"""
-        new_filter = NodeFilter(lambda n: not self.predicate(n))
+        new_filter = NodeFilter.__combine(lambda n: not self.predicate(n), 'not', self)
         return new_filter
 
-    def __call__(self, nodes: typ.Iterable[graph.TemporalNode]) -> typ.Iterable[graph.TemporalNode]:
-        """Call NodeFilter object to apply filter to iterable of TemporalNode objects"""
+    def __call__(self, nodes: typ.Iterable[graph.TemporalNode], time_step: int=None) \
+            -> typ.Iterable[graph.TemporalNode]:
+        """
+        Call NodeFilter object to apply filter to iterable of TemporalNode objects
+
+        Raises:
+            ValueError: If the filter depends on local attributes and time_step is None.
+        """
+        predicate = self.predicate
+        if self.is_local():
+            self.__check_time_step(time_step)
+
+            def predicate(n: graph.TemporalNode) -> bool:
+                return self.__evaluate_node(n, time_step)
+
         def __gen():
             for node in nodes:
-                if self.predicate(node):
+                if predicate(node):
                     yield node
         return __gen()
 
+    def is_local(self) -> bool:
+        """Returns whether the filter contains predicates on local attributes, which depend on the time step."""
+        if self.__operator is None:
+            return isinstance(self.predicate, _LocalPredicate)
+        return any(operand.is_local() for operand in self.__operands)
+
+    def mask(self, temp_graph: graph.TemporalGraph, time_step: int=None) -> np.ndarray:
+        """
+        Returns a boolean array that marks the nodes of temp_graph passing the filter, in order of get_nodes.
+
+        Args:
+            temp_graph: Temporal graph, whose nodes are filtered.
+            time_step: Time step of local attributes. Ignored by filters without local predicates.
+        Raises:
+            ValueError: If the filter depends on local attributes and time_step is None.
+        """
+        if self.is_local():
+            self.__check_time_step(time_step)
+            return self.matrix(temp_graph)[:, time_step]
+        return self.__evaluate_tree(lambda predicate: _predicate_mask(predicate, temp_graph))
+
+    def matrix(self, temp_graph: graph.TemporalGraph) -> np.ndarray:
+        """
+        Returns a read-only boolean matrix of shape (nodes, timesteps) that marks the nodes of temp_graph passing the
+        filter at each time step, with nodes in order of get_nodes. The matrix of the last graph is cached until the
+        graph or the attributes of its nodes change. Columns are contiguous, so masks of time steps are cheap views.
+        """
+        if self.__matrix_cache is not None:
+            graph_ref, version, attributes_version, matrix = self.__matrix_cache
+            if graph_ref() is temp_graph and version == temp_graph.get_version() and \
+                    attributes_version == temp_graph.get_attributes_version():
+                return matrix
+        shape = (len(temp_graph.get_nodes()), len(temp_graph))
+
+        def __leaf(predicate: typ.Callable) -> np.ndarray:
+            if isinstance(predicate, _LocalPredicate):
+                return _local_predicate_matrix(predicate, temp_graph)
+            return _predicate_mask(predicate, temp_graph)[:, np.newaxis]
+        matrix = np.asfortranarray(np.broadcast_to(self.__evaluate_tree(__leaf), shape))
+        matrix.flags.writeable = False
+        self.__matrix_cache = (weakref.ref(temp_graph), temp_graph.get_version(),
+                               temp_graph.get_attributes_version(), matrix)
+        return matrix
+
+    def apply(self, temp_graph: graph.TemporalGraph, time_step: int=None) -> typ.List[graph.TemporalNode]:
+        """
+        Returns the nodes of temp_graph that pass the filter, like calling the filter on temp_graph.get_nodes().
+
+        Raises:
+            ValueError: If the filter depends on local attributes and time_step is None.
+        """
+        nodes = temp_graph.get_nodes()
+        return [nodes[idx] for idx in np.flatnonzero(self.mask(temp_graph, time_step)).tolist()]
+
+    def __evaluate_tree(self, leaf: typ.Callable[[typ.Callable], np.ndarray]) -> np.ndarray:
+        """Combines the boolean arrays, which leaf returns for the predicates of the expression tree."""
+        if self.__operator is None:
+            return leaf(self.predicate)
+        arrays = [operand.__evaluate_tree(leaf) for operand in self.__operands]
+        if self.__operator == 'or':
+            return arrays[0] | arrays[1]
+        elif self.__operator == 'and':
+            return arrays[0] & arrays[1]
+        elif self.__operator == 'difference':
+            return arrays[0] & ~arrays[1]
+        return ~arrays[0]
+
+    def __evaluate_node(self, node: graph.TemporalNode, time_step: int) -> bool:
+        if self.__operator is None:
+            if isinstance(self.predicate, _LocalPredicate):
+                return self.predicate(node, time_step)
+            return self.predicate(node)
+        if self.__operator == 'or':
+            return self.__operands[0].__evaluate_node(node, time_step) or \
+                self.__operands[1].__evaluate_node(node, time_step)
+        elif self.__operator == 'and':
+            return self.__operands[0].__evaluate_node(node, time_step) and \
+                self.__operands[1].__evaluate_node(node, time_step)
+        elif self.__operator == 'difference':
+            return self.__operands[0].__evaluate_node(node, time_step) and \
+                not self.__operands[1].__evaluate_node(node, time_step)
+        return not self.__operands[0].__evaluate_node(node, time_step)
+
+    @staticmethod
+    def __check_time_step(time_step: typ.Optional[int]):
+        if time_step is None:
+            raise ValueError('filter depends on local attributes, time_step is required')
+
+
+class _VectorizedPredicate(object):
+    """
+    Predicate on a global attribute, which can be called for single nodes and also evaluated for all nodes of a
+    temporal graph at once, on the attribute column of the graph.
+    """
+    def __init__(self, node_predicate: typ.Callable[[graph.TemporalNode], bool],
+                 graph_mask: typ.Callable[[graph.TemporalGraph], np.ndarray]):
+        self.__node_predicate = node_predicate
+        self.__graph_mask = graph_mask
+
+    def __call__(self, node: graph.TemporalNode) -> bool:
+        return self.__node_predicate(node)
+
+    def mask(self, temp_graph: graph.TemporalGraph) -> np.ndarray:
+        """
+        Returns the result of the predicate for all nodes of temp_graph, in order of get_nodes.
+
+        Raises:
+            KeyError: If the attribute columns of the graph do not suffice, e.g. because a node has no value.
+        """
+        return self.__graph_mask(temp_graph)
+
+
+class _LocalPredicate(object):
+    """
+    Predicate on a local attribute, which can be called for a single node and time step and also evaluated for all
+    nodes and time steps of a temporal graph at once, on the attribute matrix of the graph.
+    """
+    def __init__(self, node_predicate: typ.Callable[[graph.TemporalNode, int], bool],
+                 graph_matrix: typ.Callable[[graph.TemporalGraph], np.ndarray]):
+        self.__node_predicate = node_predicate
+        self.__graph_matrix = graph_matrix
+
+    def __call__(self, node: graph.TemporalNode, time_step: int) -> bool:
+        return self.__node_predicate(node, time_step)
+
+    def matrix(self, temp_graph: graph.TemporalGraph) -> np.ndarray:
+        """
+        Returns the result of the predicate for all nodes of temp_graph, in order of get_nodes, and all time steps.
+
+        Raises:
+            KeyError: If the attribute matrix of the graph does not suffice, e.g. because a node has no values.
+        """
+        return self.__graph_matrix(temp_graph)
+
+
+def _predicate_mask(predicate: typ.Callable[[graph.TemporalNode], bool], temp_graph: graph.TemporalGraph) \
+        -> np.ndarray:
+    """Evaluates a predicate for all nodes of temp_graph, vectorized if possible and node by node otherwise."""
+    if isinstance(predicate, _VectorizedPredicate):
+        try:
+            return predicate.mask(temp_graph)
+        except KeyError:
+            # Evaluating node by node raises the error for the offending node, or handles it like the predicate does.
+            pass
+    nodes = temp_graph.get_nodes()
+    return np.fromiter((bool(predicate(node)) for node in nodes), dtype=bool, count=len(nodes))
+
+
+def _local_predicate_matrix(predicate: _LocalPredicate, temp_graph: graph.TemporalGraph) -> np.ndarray:
+    """Evaluates a local predicate for all nodes and time steps, vectorized if possible and one by one otherwise."""
+    try:
+        return predicate.matrix(temp_graph)
+    except KeyError:
+        pass
+    nodes = temp_graph.get_nodes()
+    n_timesteps = len(temp_graph)
+    return np.fromiter((bool(predicate(node, time_step)) for node in nodes for time_step in range(n_timesteps)),
+                       dtype=bool, count=len(nodes) * n_timesteps).reshape(len(nodes), n_timesteps)
+
+
+def _local_attribute_matrix(temp_graph: graph.TemporalGraph, attribute_name: str) -> np.ndarray:
+    """Returns the matrix of a local attribute. Raises a KeyError if a node has no values."""
+    if not temp_graph.get_local_attribute_set_mask(attribute_name).all():
+        raise KeyError(attribute_name)
+    return temp_graph.get_local_attribute_matrix(attribute_name)
+
+
+def _compare_local_attribute(temp_graph: graph.TemporalGraph, attribute_name: str,
+                             compare: typ.Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """
+    Applies a vectorized comparison to the cells of a local attribute, which have values. Missing cells, e.g. of time
+    steps appended after the attribute was set, and None values are False. Raises a KeyError if a node has no values.
+    """
+    matrix = _local_attribute_matrix(temp_graph, attribute_name)
+    has_value = temp_graph.get_local_attribute_valid_mask(attribute_name)
+    if matrix.dtype.kind == 'O':
+        has_value = has_value & np.not_equal(matrix, None)
+    if has_value.all():
+        return np.asarray(compare(matrix), dtype=bool)
+    result = np.zeros(matrix.shape, dtype=bool)
+    result[has_value] = compare(matrix[has_value])
+    return result
+
+
+def _category_ranks(temp_graph: graph.TemporalGraph, attribute_name: str, att2int: typ.Dict[str, int]) -> np.ndarray:
+    """
+    Returns the rank of the value of a categorical attribute of every node. Raises a KeyError if a node has no value
+    or a category has no rank.
+    """
+    codes = temp_graph.get_global_attribute_codes(attribute_name)
+    if (codes < 0).any():
+        raise KeyError(attribute_name)
+    categories = temp_graph.get_global_attribute_categories(attribute_name)
+    return np.array([att2int[category] for category in categories], dtype=np.int64)[codes]
+
 
 """Some basic predefined predicate functions:"""
 
@@ -57,7 +288,14 @@ def categorical_attribute_equal(attribute_name: str, attribute_value: str) -> ty
     """
     def __pred(n: graph.TemporalNode) -> bool:
         return n.get_global_attribute(attribute_name) == attribute_value
-    return __pred
+
+    def __mask(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        codes = temp_graph.get_global_attribute_codes(attribute_name)
+        if (codes < 0).any():
+            raise KeyError(attribute_name)
+        categories = temp_graph.get_global_attribute_categories(attribute_name)
+        return np.isin(codes, [code for code, category in enumerate(categories) if category == attribute_value])
+    return _VectorizedPredicate(__pred, __mask)
 
 
 def ordinal_attribute_greater_than_equal(attribute_name: str, lower_bound: str, order: typ.List[str]) \
@@ -76,7 +314,10 @@ def ordinal_attribute_greater_than_equal(attribute_name: str, lower_bound: str,
     def __pred(n: graph.TemporalNode) -> bool:
         val = n.get_global_attribute(attribute_name)
         return att2int[lower_bound] <= att2int[val]
-    return __pred
+
+    def __mask(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return att2int[lower_bound] <= _category_ranks(temp_graph, attribute_name, att2int)
+    return _VectorizedPredicate(__pred, __mask)
 
 
 def ordinal_attribute_greater_than(attribute_name: str, lower_bound: str, order: typ.List[str]):
@@ -94,18 +335,120 @@ def ordinal_attribute_greater_than(attribute_name: str, lower_bound: str, order:
     def __pred(n: graph.TemporalNode) -> bool:
         val = n.get_global_attribute(attribute_name)
         return att2int[lower_bound] < att2int[val]
-    return __pred
+
+    def __mask(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return att2int[lower_bound] < _category_ranks(temp_graph, attribute_name, att2int)
+    return _VectorizedPredicate(__pred, __mask)
 
 
 def interval_attribute_greater_than_equal(attribute_name: str, lower_bound: float) -> typ.Callable:
     def __pred(n: graph.TemporalNode) -> bool:
         val = n.get_global_attribute(attribute_name)
         return lower_bound <= val
-    return __pred
+
+    def __mask(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return np.asarray(lower_bound <= temp_graph.get_global_attribute_column(attribute_name), dtype=bool)
+    return _VectorizedPredicate(__pred, __mask)
 
 
 def interval_attribute_greater_than(attribute_name: str, lower_bound: float) -> typ.Callable:
     def __pred(n: graph.TemporalNode) -> bool:
         val = n.get_global_attribute(attribute_name)
         return lower_bound < val
-    return __pred
+
+    def __mask(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return np.asarray(lower_bound < temp_graph.get_global_attribute_column(attribute_name), dtype=bool)
+    return _VectorizedPredicate(__pred, __mask)
+
+
+"""Predicates on local attributes, which are evaluated at a time step:"""
+
+
+def local_categorical_attribute_equal(attribute_name: str, attribute_value: str) \
+        -> typ.Callable[[graph.TemporalNode, int], bool]:
+    """
+    Checks for equality of local attribute named attribute_name of a node at a
+    time step with the provided attribute value.
+    """
+    def __pred(n: graph.TemporalNode, time_step: int) -> bool:
+        val = n.get_local_attribute(attribute_name, time_step)
+        return val is not None and val == attribute_value
+
+    def __matrix(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        matrix = _local_attribute_matrix(temp_graph, attribute_name)
+        if matrix.dtype.kind != 'O' and not isinstance(attribute_value, (int, float, np.number)):
+            # Numbers never equal other values
+            return np.zeros(matrix.shape, dtype=bool)
+        return _compare_local_attribute(temp_graph, attribute_name, lambda values: values == attribute_value)
+    return _LocalPredicate(__pred, __matrix)
+
+
+def local_ordinal_attribute_greater_than_equal(attribute_name: str, lower_bound: str, order: typ.List[str]) \
+        -> typ.Callable[[graph.TemporalNode, int], bool]:
+    """
+    Checks for greater-equal relationship of a local, ordinal attribute at a time step to lower_bound.
+
+    Args:
+        attribute_name: Name of local, ordinal attribute
+        lower_bound: Compared value
+        order: List that defines order of the ordinal attribute
+    """
+    att2int = dict((val, idx) for idx, val in enumerate(order))
+
+    def __pred(n: graph.TemporalNode, time_step: int) -> bool:
+        val = n.get_local_attribute(attribute_name, time_step)
+        return val is not None and att2int[lower_bound] <= att2int[val]
+
+    def __matrix(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return _compare_local_attribute(temp_graph, attribute_name,
+                                        lambda values: att2int[lower_bound] <= _local_ranks(values, att2int))
+    return _LocalPredicate(__pred, __matrix)
+
+
+def local_ordinal_attribute_greater_than(attribute_name: str, lower_bound: str, order: typ.List[str]) \
+        -> typ.Callable[[graph.TemporalNode, int], bool]:
+    """
+    Checks for greater relationship of a local, ordinal attribute at a time step to lower_bound.
+
+    Args:
+        attribute_name: Name of local, ordinal attribute
+        lower_bound: Compared value
+        order: List that defines order of the ordinal attribute
+    """
+    att2int = dict((val, idx) for idx, val in enumerate(order))
+
+    def __pred(n: graph.TemporalNode, time_step: int) -> bool:
+        val = n.get_local_attribute(attribute_name, time_step)
+        return val is not None and att2int[lower_bound] < att2int[val]
+
+    def __matrix(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return _compare_local_attribute(temp_graph, attribute_name,
+                                        lambda values: att2int[lower_bound] < _local_ranks(values, att2int))
+    return _LocalPredicate(__pred, __matrix)
+
+
+def local_interval_attribute_greater_than_equal(attribute_name: str, lower_bound: float) \
+        -> typ.Callable[[graph.TemporalNode, int], bool]:
+    def __pred(n: graph.TemporalNode, time_step: int) -> bool:
+        val = n.get_local_attribute(attribute_name, time_step)
+        return val is not None and lower_bound <= val
+
+    def __matrix(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return _compare_local_attribute(temp_graph, attribute_name, lambda values: lower_bound <= values)
+    return _LocalPredicate(__pred, __matrix)
+
+
+def local_interval_attribute_greater_than(attribute_name: str, lower_bound: float) \
+        -> typ.Callable[[graph.TemporalNode, int], bool]:
+    def __pred(n: graph.TemporalNode, time_step: int) -> bool:
+        val = n.get_local_attribute(attribute_name, time_step)
+        return val is not None and lower_bound < val
+
+    def __matrix(temp_graph: graph.TemporalGraph) -> np.ndarray:
+        return _compare_local_attribute(temp_graph, attribute_name, lambda values: lower_bound < values)
+    return _LocalPredicate(__pred, __matrix)
+
+
+def _local_ranks(values: np.ndarray, att2int: typ.Dict[str, int]) -> np.ndarray:
+    """Returns the ranks of values of a local, ordinal attribute. Raises a KeyError if a value has no rank."""
+    return np.frompyfunc(att2int.__getitem__, 1, 1)(values).astype(np.int64)
@@ -1,76 +1,257 @@
-__all__ = ['TemporalGraph', 'Graph', 'TemporalNode', 'Edge']
+__all__ = ['TemporalGraph', 'Graph', 'TemporalNode', 'Edge', 'first_seen_node_ids']
 
-import collections as col
+import array
+import hashlib
+import math
 import typing as typ
 
+import numpy as np
+
 import vtna.data_import as dimp
+import vtna.edge_store
 
 # Type Alias
 AttributeValue = typ.Union[str, float]
 
 
 class TemporalGraph(object):
-    def __init__(self, edges: typ.List[dimp.TemporalEdge], meta_table: dimp.MetadataTable, granularity: int):
+    def __init__(self, edges: dimp.TemporalEdges, meta_table: dimp.MetadataTable, granularity: int,
+                 columnar: bool=False):
         """
         Creates graphs for all timestamps with a given granularity.
 
         Args:
-            edges: List of temporal edges. Each edge is a triple (timestamp, node, node).
+            edges: List of temporal edges. Each edge is a triple (timestamp, node, node). Structured edge arrays as
+                returned by data_import.read_edge_array are accepted as well.
             meta_table: MetadataTable with static node attributes.
             granularity: Granularity defines the size of time intervals, which will be considered as time steps.
                 Each time step has an associated aggregated graph containing all edges occurring in the time interval.
+            columnar: If True, graphs and edges are lightweight views over the columnar edge store. Otherwise every
+                edge is materialized as Edge object with its own list of timestamps.
+        Raises:
+            MissingNodesInMetadataError: Is raised, when a node occurs in the provided edges but does not appear in the
+                provided metadata. Can never be raised, if metadata is None.
+        """
+        edges = dimp.as_edge_array(edges)
+        store = vtna.edge_store.EdgeStore(edges['timestamp'], edges['node1'], edges['node2'], granularity)
+        self.__init_from_store(store, meta_table, columnar,
+                               _first_seen_nodes(edges['timestamp'], edges['node1'], edges['node2'])[0])
+
+    @classmethod
+    def from_edge_store(cls, store: vtna.edge_store.EdgeStore, meta_table: dimp.MetadataTable,
+                        columnar: bool=False, node_order: np.ndarray=None) -> 'TemporalGraph':
+        """
+        Creates a temporal graph from edges that are already bucketed into an EdgeStore, e.g. one loaded from disk.
+        Granularity is given by the store. The store does not keep the order of the raw edges, so unless node_order
+        is provided, nodes are ordered by their first edge in the store, i.e. by first time step and then by node id.
+
+        Args:
+            store: EdgeStore with the temporal edges.
+            meta_table: MetadataTable with static node attributes.
+            columnar: If True, graphs and edges are lightweight views over the store.
+            node_order: Ids of all nodes with edges in the order of their first interaction, see
+                first_seen_node_ids. With the order of the raw edges, the graph equals one created from them.
+        Raises:
+            MissingNodesInMetadataError: Is raised, when a node occurs in the provided edges but does not appear in the
+                provided metadata. Can never be raised, if metadata is None.
+        """
+        temp_graph = cls.__new__(cls)
+        temp_graph.__init_from_store(store, meta_table, columnar, node_order)
+        return temp_graph
+
+    @classmethod
+    def from_time_pyramid(cls, pyramid: vtna.edge_store.TimePyramid, granularity: int,
+                          meta_table: dimp.MetadataTable, columnar: bool=False) -> 'TemporalGraph':
+        """
+        Creates a temporal graph at one granularity of a TimePyramid. Levels of the pyramid are served from their
+        merged edges, without bucketing all interactions again.
+
+        Args:
+            pyramid: TimePyramid of the temporal edges.
+            granularity: Granularity defines the size of time intervals, which will be considered as time steps.
+            meta_table: MetadataTable with static node attributes.
+            columnar: If True, graphs and edges are lightweight views over the edge store.
+        Raises:
+            MissingNodesInMetadataError: Is raised, when a node occurs in the provided edges but does not appear in the
+                provided metadata. Can never be raised, if metadata is None.
+        """
+        return cls.from_edge_store(pyramid.get_store(granularity), meta_table, columnar)
+
+    @classmethod
+    def from_edge_blocks(cls, blocks: typ.Iterable[dimp.TemporalEdges], meta_table: dimp.MetadataTable,
+                         granularity: int, columnar: bool=False, earliest: int=None) -> 'TemporalGraph':
+        """
+        Creates a temporal graph from blocks of edges, e.g. as yielded by data_import.iter_edge_blocks.
+        Blocks are bucketed by granularity as they arrive, so the raw edges never have to be in memory at once.
+
+        Args:
+            blocks: Iterable of edge lists or structured edge arrays.
+            meta_table: MetadataTable with static node attributes.
+            granularity: Granularity defines the size of time intervals, which will be considered as time steps.
+            columnar: If True, graphs and edges are lightweight views over the columnar edge store.
+            earliest: Start of the first time step. If None, the earliest timestamp of the first block is used,
+                which requires blocks to be ordered by time, as in sociopatterns.org files.
         Raises:
             MissingNodesInMetadataError: Is raised, when a node occurs in the provided edges but does not appear in the
                 provided metadata. Can never be raised, if metadata is None.
+            ValueError: If a block contains a timestamp that is earlier than earliest.
+        """
+        first_seen = list()  # type: typ.List[typ.Tuple[np.ndarray, np.ndarray]]
+
+        def columns():
+            for block in blocks:
+                block = dimp.as_edge_array(block)
+                first_seen.append(_first_seen_nodes(block['timestamp'], block['node1'], block['node2']))
+                yield block['timestamp'], block['node1'], block['node2']
+
+        store = vtna.edge_store.EdgeStore.from_blocks(columns(), granularity, earliest)
+        # Nodes of each block are ordered by first interaction, so a stable sort of all blocks by timestamp orders
+        # them by first interaction across blocks, with ties in block order.
+        node_ids = np.concatenate([block_nodes for block_nodes, _ in first_seen])
+        first_timestamps = np.concatenate([block_timestamps for _, block_timestamps in first_seen])
+        node_ids = node_ids[np.argsort(first_timestamps, kind='stable')]
+        _, first = np.unique(node_ids, return_index=True)
+        temp_graph = cls.__new__(cls)
+        temp_graph.__init_from_store(store, meta_table, columnar, node_ids[np.sort(first)])
+        return temp_graph
+
+    def __init_from_store(self, store: vtna.edge_store.EdgeStore, meta_table: dimp.MetadataTable, columnar: bool,
+                          node_order: np.ndarray=None):
+        """
+        Args:
+            node_order: Ids of all nodes with edges in the order of their first edge. Nodes are created in this
+                order, which is the node order of aggregated networkx graphs. If None, the order of the store is used.
         """
         self.__graphs = list()  # type: typ.List[Graph]
         self.__accumulated_graphs = None  # type: typ.List[Graph]
         self.__nodes = dict()  # type: typ.Dict[int, TemporalNode]
-        self.__granularity = granularity
+        self.__granularity = store.get_granularity()
         self.__attributes_info = dict()  # type: typ.Dict[str, typ.Dict[str, str]]
         self.__metadata = meta_table
         self.__cumulative = False
-
-        buckets = dimp.group_edges_by_granularity(edges, granularity)
-        n_timesteps = len(buckets)
+        self.__columnar = columnar
+        self.__store = store
+        self.__version = 0
+        self.__fingerprint = None  # type: str
+        n_timesteps = len(self.__store)
+        self.__local_attributes = _LocalAttributeTable(n_timesteps)
+        self.__global_attributes = _GlobalAttributeTable()
         # Create graphs
-        for time_step, edges in enumerate(buckets):
-            edge_timestamps = col.defaultdict(list)
-            for timestamp, node1, node2 in edges:
-                node1, node2 = sorted((node1, node2))
-                edge_timestamps[(node1, node2)].append(timestamp)
-            edges = [Edge(edge[0], edge[1], timestamps) for edge, timestamps in edge_timestamps.items()]
-            self.__graphs.append(Graph(edges))
-        # Compute accumulated graph
-        self.__accumulated_graphs = list(self.__accumulate())
+        if columnar:
+            self.__graphs = [_EdgeStoreGraph(self.__store, time_step) for time_step in range(n_timesteps)]
+        else:
+            self.__graphs = [_materialize_graph(self.__store, time_step) for time_step in range(n_timesteps)]
         # Collect all node ids.
-        node_ids = set()  # type: typ.Set[int]
-        for g in self.__graphs:
-            for e in g.get_edges():
-                node_ids.update(e.get_incident_nodes())
+        if node_order is None:
+            node_order = _first_seen_nodes(self.__store.get_edge_steps(), *self.__store.get_edge_nodes(slice(None)))[0]
+        node_ids = node_order.tolist()
         # Create temporal nodes.
-        if meta_table is None:
-            self.__nodes = dict((node_id, TemporalNode(node_id, dict(), n_timesteps))
-                                for node_id in node_ids)
-        else:
+        if meta_table is not None:
             # Add nodes that only exist in metadata
-            node_ids.update(meta_table.keys())
-            for node_id in node_ids:
-                try:
-                    attributes = meta_table[node_id]
-                except KeyError:
-                    raise MissingNodesInMetadataError(node_id)
-                self.__nodes[node_id] = TemporalNode(node_id, attributes, n_timesteps)
+            node_ids.extend(sorted(set(meta_table.keys()).difference(node_ids)))
+        self.__add_nodes(node_ids)
+
+    def __add_nodes(self, node_ids: typ.Iterable[int]):
+        """
+        Creates temporal nodes with their metadata for the provided ids. Their attributes are stored in new rows of
+        the attribute tables of the graph, metadata attributes as categorical codes.
+        """
+        node_ids = list(node_ids)
+        codes = dict()  # type: typ.Dict[str, np.ndarray]
+        if self.__metadata is not None:
+            try:
+                codes = self.__metadata.as_codes(node_ids)
+            except KeyError as e:
+                raise MissingNodesInMetadataError(e.args[0])
+        first_row = self.__local_attributes.add_rows(len(node_ids))
+        self.__global_attributes.add_rows(len(node_ids))
+        rows = np.arange(first_row, first_row + len(node_ids))
+        for name, attribute_codes in codes.items():
+            self.__global_attributes.set_codes(name, rows, attribute_codes, self.__metadata.get_categories(name))
+        for row, node_id in zip(rows.tolist(), node_ids):
+            self.__nodes[node_id] = TemporalNode._in_table(node_id, self.__global_attributes,
+                                                           self.__local_attributes, row)
+
+    def append_edges(self, edges: dimp.TemporalEdges) -> int:
+        """
+        Appends new temporal edges, e.g. from continuously received contact data. New edges may extend the last
+        time step or create new time steps. Only graphs and accumulated graphs from the last time step onward are
+        rebuilt, the cumulative index is extended with the new interactions. Local attributes of existing nodes are
+        missing and read as None from the first changed time step onward, which includes the new time steps, and
+        nodes that occur for the first time are created. Appending no edges changes nothing.
+
+        Args:
+            edges: List of temporal edges or structured edge array. Timestamps must not be earlier than the start of
+                the last time step.
+        Returns:
+            Index of the first time step that was changed or created, or the number of time steps if edges is empty.
+        Raises:
+            ValueError: If an edge is earlier than the start of the last time step.
+            MissingNodesInMetadataError: If a new node does not appear in the metadata.
+        """
+        edges = dimp.as_edge_array(edges)
+        n_old_timesteps = len(self.__graphs)
+        if len(edges) == 0:
+            return n_old_timesteps
+        new_node_ids = [node_id for node_id in
+                        _first_seen_nodes(edges['timestamp'], edges['node1'], edges['node2'])[0].tolist()
+                        if node_id not in self.__nodes]
+        if self.__metadata is not None:
+            missing = set(new_node_ids).difference(self.__metadata.keys())
+            if len(missing) > 0:
+                raise MissingNodesInMetadataError(min(missing))
+        first_changed = self.__store.append(edges['timestamp'], edges['node1'], edges['node2'])
+        n_timesteps = len(self.__store)
+        # Views of unchanged time steps stay valid, because their edges keep their position in the store.
+        if self.__columnar:
+            self.__graphs.extend(_EdgeStoreGraph(self.__store, time_step)
+                                 for time_step in range(n_old_timesteps, n_timesteps))
+        else:
+            self.__graphs[first_changed:] = [_materialize_graph(self.__store, time_step)
+                                             for time_step in range(first_changed, n_timesteps)]
+        if self.__accumulated_graphs is not None:
+            index = self.__store.get_cumulative_index()
+            self.__accumulated_graphs[first_changed:] = [_CumulativeGraph(index, time_step)
+                                                         for time_step in range(first_changed, n_timesteps)]
+        self.__local_attributes.invalidate_timesteps(first_changed)
+        self.__local_attributes.append_timesteps(n_timesteps - n_old_timesteps)
+        self.__add_nodes(new_node_ids)
+        self.__changed()
+        return first_changed
+
+    def regranularize(self, granularity: int):
+        """
+        Changes the granularity of the temporal graph in place. Edges are re-bucketed from the sorted arrays of the
+        edge store, nodes and metadata are kept. If the new granularity is a multiple of the current one, adjacent
+        time steps are merged directly. Local attributes depend on the time steps and are removed.
+
+        Args:
+            granularity: New length of a time step.
+        Raises:
+            ValueError: If granularity is not positive.
+        """
+        self.__store = self.__store.regranularize(granularity)
+        self.__granularity = self.__store.get_granularity()
+        n_timesteps = len(self.__store)
+        if self.__columnar:
+            self.__graphs = [_EdgeStoreGraph(self.__store, time_step) for time_step in range(n_timesteps)]
+        else:
+            self.__graphs = [_materialize_graph(self.__store, time_step) for time_step in range(n_timesteps)]
+        self.__accumulated_graphs = None
+        self.__local_attributes.reset(n_timesteps)
+        self.__attributes_info = {name: info for name, info in self.__attributes_info.items()
+                                  if info['scope'] != 'local'}
+        self.__changed()
 
     def __getitem__(self, time_step: int) -> 'Graph':
         """Returns the graph at the specified timestep"""
         if time_step < 0 or time_step >= len(self.__graphs):
             raise IndexError(f'Index {time_step} out of bounds')
-        return self.__graphs[time_step] if not self.__cumulative else self.__accumulated_graphs[time_step]
+        return self.__graphs[time_step] if not self.__cumulative else self.__get_accumulated_graphs()[time_step]
 
     def __iter__(self) -> typ.Iterable['Graph']:
         def __gen():
-            graphs = self.__graphs if not self.__cumulative else self.__accumulated_graphs
+            graphs = self.__graphs if not self.__cumulative else self.__get_accumulated_graphs()
             for graph in graphs:
                 yield graph
 
@@ -104,11 +285,18 @@ class TemporalGraph(object):
         self.__attributes_info[name] = dict(measurement_type=measurement_type, scope=scope, categories=categories,
                                             range=interval_range)
         if attributes is not None:
-            for node in self.get_nodes():
-                if scope == 'local':
-                    node.update_local_attribute(name, attributes[node.get_id()])
-                elif scope == 'global':
-                    node.update_global_attribute(name, attributes[node.get_id()])
+            if scope == 'local':
+                # All nodes are set at once, as one column of the local attribute table
+                values = [attributes[node_id] for node_id in self.__nodes.keys()]
+                for node_id, node_values in zip(self.__nodes.keys(), values):
+                    if len(node_values) != len(self):
+                        raise InvalidLocalAttributeValuesLength(f'expected values of length {len(self)} for node '
+                                                                f'{node_id}, received length {len(node_values)}')
+                self.__local_attributes.set_rows(name, np.arange(len(values)), values)
+            elif scope == 'global':
+                values = [attributes[node_id] for node_id in self.__nodes.keys()]
+                self.__global_attributes.set_rows(name, np.arange(len(values)), values,
+                                                  categorical=measurement_type in ('N', 'O'), categories=categories)
 
     def get_attributes_info(self) -> typ.Dict[str, typ.Dict[str, typ.Union[str, typ.List[str]]]]:
         attributes = dict()
@@ -127,6 +315,70 @@ class TemporalGraph(object):
         """Returns all nodes with attributes."""
         return list(self.__nodes.values())
 
+    def get_node_ids(self) -> np.ndarray:
+        """Returns the ids of all nodes, ordered like the rows of local attribute matrices."""
+        return np.fromiter(self.__nodes.keys(), dtype=np.int64, count=len(self.__nodes))
+
+    def get_local_attribute_matrix(self, name: str) -> np.ndarray:
+        """
+        Returns the values of a local attribute for all nodes and timesteps as read-only matrix of shape
+        (nodes, timesteps), with rows ordered like get_node_ids. Numeric attributes are stored with a numeric dtype,
+        all others as objects. Rows of nodes without the attribute are undefined. Cells of timesteps that were
+        changed or created by append_edges after the attribute was set are missing, see
+        get_local_attribute_valid_mask.
+        """
+        if not isinstance(name, str):
+            raise TypeError(f'type {str} for name expected, received type {type(name)}')
+        return self.__local_attributes.get_matrix(name)
+
+    def get_local_attribute_set_mask(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only boolean array that marks the nodes, ordered like get_node_ids, which have values of a
+        local attribute.
+        """
+        return self.__local_attributes.get_set_mask(name)
+
+    def get_local_attribute_valid_mask(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only boolean matrix of shape (nodes, timesteps) that marks the cells of a local attribute,
+        which have values. Missing cells hold NaN in float matrices, None in object matrices and 0 otherwise.
+        """
+        return self.__local_attributes.get_valid_mask(name)
+
+    def get_local_attribute_column(self, name: str, time_step: int) -> np.ndarray:
+        """Returns the values of a local attribute for all nodes at the specified timestep as read-only view."""
+        return self.get_local_attribute_matrix(name)[:, time_step]
+
+    def get_global_attribute_codes(self, name: str) -> np.ndarray:
+        """
+        Returns the codes of a categorical global attribute, e.g. a metadata attribute, with one entry per node in
+        the order of get_node_ids, as read-only array. Codes index get_global_attribute_categories, -1 marks nodes
+        without value, including missing values such as NaN, which are no category. Comparing codes is much faster than comparing values node by node.
+
+        Raises:
+            KeyError: If the attribute does not exist or is not categorical.
+        """
+        return self.__global_attributes.get_codes(name)
+
+    def get_global_attribute_categories(self, name: str) -> typ.List[AttributeValue]:
+        """
+        Returns the categories of a categorical global attribute, indexed by its codes.
+
+        Raises:
+            KeyError: If the attribute does not exist or is not categorical.
+        """
+        return self.__global_attributes.get_categories(name)
+
+    def get_global_attribute_column(self, name: str) -> np.ndarray:
+        """
+        Returns the values of a global attribute with one entry per node in the order of get_node_ids, as read-only
+        array with numeric dtype for numeric values and object dtype otherwise.
+
+        Raises:
+            KeyError: If the attribute does not exist or a node has no value.
+        """
+        return self.__global_attributes.get_column(name)
+
     def get_node(self, node_id: int) -> 'TemporalNode':
         """Returns one node defined by node_id."""
         return self.__nodes[node_id]
@@ -134,28 +386,74 @@ class TemporalGraph(object):
     def get_granularity(self) -> int:
         return self.__granularity
 
+    def is_columnar(self) -> bool:
+        return self.__columnar
+
+    def get_edge_store(self) -> vtna.edge_store.EdgeStore:
+        """Returns the columnar store that holds all edges of this temporal graph."""
+        return self.__store
+
     # getter/setter is not pythonic, but the rest of the code behaves the same way.
     def set_cumulative(self, cumulative: bool):
-        self.__cumulative = cumulative
+        if cumulative != self.__cumulative:
+            self.__cumulative = cumulative
+            self.__changed()
 
     def is_cumulative(self) -> bool:
         return self.__cumulative
 
-    def __accumulate(self) -> typ.Iterable['Graph']:
-        def merge(d: typ.Dict[typ.Tuple[int, int], typ.List[int]], l: typ.List[Edge]):
-            for edge in l:
-                if edge.get_incident_nodes() not in d:
-                    d[edge.get_incident_nodes()] = []
-                d[edge.get_incident_nodes()].extend(edge.get_timestamps())
+    def get_edge_arrays(self, time_step: int) -> typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the edges of the graph at the specified timestep as arrays (node1, node2, count) with one entry per
+        edge, read directly from the edge store. Like __getitem__, respects cumulative mode.
+        """
+        if time_step < 0 or time_step >= len(self.__graphs):
+            raise IndexError(f'Index {time_step} out of bounds')
+        if self.__cumulative:
+            index = self.__store.get_cumulative_index()
+            pairs = index.get_pairs(time_step)
+            node1, node2 = index.get_pair_nodes(pairs)
+            return node1, node2, index.get_counts(pairs, time_step)
+        node1, node2 = self.__store.get_edge_nodes(time_step)
+        return node1, node2, self.__store.get_edge_counts(time_step)
+
+    def get_version(self) -> int:
+        """
+        Returns a counter that is incremented whenever the graphs change, i.e. on appending edges, changing the
+        granularity or switching cumulative mode. Changes of node attributes do not count.
+        """
+        return self.__version
 
-        def accumulated_graph():
-            acc_edges = dict()  # type: typ.Dict[typ.Tuple[int, int], typ.List[int]]
-            for graph in self:
-                merge(acc_edges, graph.get_edges())
-                edges = [Edge(n1, n2, timestamps) for (n1, n2), timestamps in acc_edges.items()]
-                yield Graph(edges)
+    def get_attributes_version(self) -> int:
+        """Returns a counter that is incremented whenever global or local attributes of nodes change."""
+        return self.__global_attributes.get_version() + self.__local_attributes.get_version()
 
-        return accumulated_graph()
+    def get_fingerprint(self) -> str:
+        """
+        Returns a hash of everything that node measures depend on: edges, granularity, cumulative mode and nodes.
+        Unlike get_version, equal graphs have equal fingerprints, also across processes. The hash is computed on
+        first access after each change.
+        """
+        if self.__fingerprint is None:
+            digest = hashlib.sha1(self.__store.fingerprint().encode('utf-8'))
+            digest.update(repr(self.__cumulative).encode('utf-8'))
+            digest.update(np.sort(self.get_node_ids()).data)
+            self.__fingerprint = digest.hexdigest()
+        return self.__fingerprint
+
+    def __changed(self):
+        self.__version += 1
+        self.__fingerprint = None
+
+    def __get_accumulated_graphs(self) -> typ.List['Graph']:
+        """
+        Returns accumulated graphs, which are created on first access. They are views over the cumulative index of
+        the edge store, so they cost nothing if cumulative mode is never used and share all edge data otherwise.
+        """
+        if self.__accumulated_graphs is None:
+            index = self.__store.get_cumulative_index()
+            self.__accumulated_graphs = [_CumulativeGraph(index, time_step) for time_step in range(len(index))]
+        return self.__accumulated_graphs
 
 
 class Graph(object):
@@ -168,22 +466,473 @@ class Graph(object):
                    The list contains the timestamps for that the edge occurs in the graph.
         """
         self.__edges = edges
+        self.__edge_index = None  # type: typ.Dict[typ.Tuple[int, int], Edge]
+
+    def __len__(self) -> int:
+        """Returns the number of edges."""
+        return len(self.__edges)
 
     def get_edges(self) -> typ.List['Edge']:
         """Returns edge list of graph."""
         return self.__edges.copy()
 
+    def iter_edges(self) -> typ.Iterator['Edge']:
+        """Iterates over the edges of the graph without copying the edge list."""
+        return iter(self.__edges)
+
     def get_edge(self, node1: int, node2: int) -> 'Edge':
         """Returns one edge of a graph defined by node1 and node2"""
         node1, node2 = sorted((node1, node2))
         try:
-            edge = [edge for edge in self.__edges if edge.get_incident_nodes() == (node1, node2)][0]
-        except IndexError:
+            return self.__get_edge_index()[(node1, node2)]
+        except KeyError:
             raise KeyError(f'Edge of nodes ({node1}, {node2}) does not exist')
-        return edge
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        """Returns whether an edge between node1 and node2 exists."""
+        return tuple(sorted((node1, node2))) in self.__get_edge_index()
+
+    def __get_edge_index(self) -> typ.Dict[typ.Tuple[int, int], 'Edge']:
+        """Maps incident nodes to edges. Is built on first lookup, so that iterating graphs stays cheap."""
+        if self.__edge_index is None:
+            self.__edge_index = dict((edge.get_incident_nodes(), edge) for edge in self.__edges)
+        return self.__edge_index
+
+
+class _EdgeStoreGraph(Graph):
+    def __init__(self, store: vtna.edge_store.EdgeStore, time_step: int):
+        """
+        Graph of one time step that is backed by an EdgeStore. Edges are created on request and their timestamps
+        are views into the store.
+
+        Args:
+            store: EdgeStore containing the edges.
+            time_step: Time step of the graph in the store.
+        """
+        super().__init__([])
+        self.__store = store
+        self.__time_step = time_step
+
+    def __len__(self) -> int:
+        """Returns the number of edges."""
+        lo, hi = self.__store.get_edge_range(self.__time_step)
+        return hi - lo
+
+    def get_edges(self) -> typ.List['Edge']:
+        """Returns edge list of graph."""
+        return list(self.iter_edges())
+
+    def iter_edges(self) -> typ.Iterator['Edge']:
+        """Iterates over the edges of the graph, creating each edge on request."""
+        lo, hi = self.__store.get_edge_range(self.__time_step)
+        return map(self.__edge, range(lo, hi))
+
+    def get_edge(self, node1: int, node2: int) -> 'Edge':
+        """Returns one edge of a graph defined by node1 and node2. Edges are looked up by binary search."""
+        node1, node2 = sorted((node1, node2))
+        idx = self.__store.find_edge(self.__time_step, node1, node2)
+        if idx < 0:
+            raise KeyError(f'Edge of nodes ({node1}, {node2}) does not exist')
+        return self.__edge(idx)
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        """Returns whether an edge between node1 and node2 exists."""
+        return self.__store.find_edge(self.__time_step, node1, node2) >= 0
+
+    def __edge(self, idx: int) -> 'Edge':
+        node1, node2 = self.__store.get_edge_incident_nodes(idx)
+        return Edge(node1, node2, self.__store.get_edge_timestamps(idx))
+
+
+class _CumulativeGraph(Graph):
+    def __init__(self, index: vtna.edge_store.CumulativeIndex, time_step: int):
+        """
+        Accumulated graph of one time step, containing all edges up to and including that time step.
+        Edges are created on request and their timestamps are prefix views into the cumulative index.
+
+        Args:
+            index: CumulativeIndex of the edge store.
+            time_step: Last time step included in the accumulated graph.
+        """
+        super().__init__([])
+        self.__index = index
+        self.__time_step = time_step
+
+    def __len__(self) -> int:
+        """Returns the number of edges."""
+        return self.__index.get_n_pairs(self.__time_step)
+
+    def get_edges(self) -> typ.List['Edge']:
+        """Returns edge list of graph."""
+        return list(self.iter_edges())
+
+    def iter_edges(self) -> typ.Iterator['Edge']:
+        """Iterates over the edges of the graph, creating each edge on request."""
+        pairs = self.__index.get_pairs(self.__time_step)
+        counts = self.__index.get_counts(pairs, self.__time_step)
+        node1, node2 = self.__index.get_pair_nodes(pairs)
+        for n1, n2, pair, count in zip(node1.tolist(), node2.tolist(), pairs.tolist(), counts.tolist()):
+            yield Edge(n1, n2, self.__index.get_pair_timestamps(pair, count))
+
+    def has_edge(self, node1: int, node2: int) -> bool:
+        """Returns whether an edge between node1 and node2 exists."""
+        return self.__index.find_pair(self.__time_step, node1, node2) >= 0
+
+    def get_edge(self, node1: int, node2: int) -> 'Edge':
+        """Returns one edge of a graph defined by node1 and node2"""
+        node1, node2 = sorted((node1, node2))
+        pair = self.__index.find_pair(self.__time_step, node1, node2)
+        if pair < 0:
+            raise KeyError(f'Edge of nodes ({node1}, {node2}) does not exist')
+        count = int(self.__index.get_counts(np.array([pair]), self.__time_step)[0])
+        return Edge(node1, node2, self.__index.get_pair_timestamps(pair, count))
+
+
+def first_seen_node_ids(edges: dimp.TemporalEdges) -> np.ndarray:
+    """
+    Returns the ids of all nodes of the provided edges ordered by their first interaction, which is the node order
+    of a TemporalGraph created from them. Can be stored next to an EdgeStore, see TemporalGraph.from_edge_store.
+    """
+    edges = dimp.as_edge_array(edges)
+    return _first_seen_nodes(edges['timestamp'], edges['node1'], edges['node2'])[0]
+
+
+def _first_seen_nodes(timestamps: np.ndarray, node1: np.ndarray,
+                      node2: np.ndarray) -> typ.Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the ids of all nodes ordered by their first interaction and the timestamp of that interaction. Ties are
+    broken by the order of the edges and the smaller id of an edge comes first, as when aggregating edges into a
+    networkx graph edge by edge.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    order = np.argsort(timestamps, kind='stable')
+    node1, node2 = np.asarray(node1, dtype=np.int64)[order], np.asarray(node2, dtype=np.int64)[order]
+    nodes = np.stack((np.minimum(node1, node2), np.maximum(node1, node2)), axis=1).ravel()
+    _, first = np.unique(nodes, return_index=True)
+    first = np.sort(first)
+    return nodes[first], timestamps[order][first // 2]
+
+
+def _materialize_graph(store: vtna.edge_store.EdgeStore, time_step: int) -> 'Graph':
+    """
+    Creates a Graph of one time step of an EdgeStore. All edges share one copy of the timestamps of the time step,
+    so that the graph does not keep the arrays of the store alive once they are replaced, e.g. by appending.
+    """
+    node1, node2 = store.get_edge_nodes(time_step)
+    timestamps = np.array(store.get_step_timestamps(time_step))
+    timestamps.flags.writeable = False
+    bounds = np.cumsum(store.get_edge_counts(time_step)).tolist()
+    edges = list()
+    start = 0
+    for n1, n2, stop in zip(node1.tolist(), node2.tolist(), bounds):
+        edges.append(Edge(n1, n2, timestamps, start, stop))
+        start = stop
+    return Graph(edges)
+
+
+class _LocalAttributeTable(object):
+    def __init__(self, n_timesteps: int, n_rows: int=0):
+        """
+        Stores local attributes of temporal nodes as one matrix of shape (nodes, timesteps) per attribute, where
+        each node owns one row. Matrices have spare capacity for rows and timesteps, which at least doubles when it
+        is exceeded, so adding nodes and appending timesteps does not copy the matrices each time and keeps their
+        dtype. Each row stores how many timesteps are valid, cells of later timesteps are missing: they hold NaN in
+        float matrices, None in object matrices and 0 otherwise. Rows that were never set store -1 and raise a
+        KeyError on reading, like an unknown attribute.
+        """
+        self.__n_timesteps = n_timesteps
+        self.__n_rows = n_rows
+        self.__matrices = dict()  # type: typ.Dict[str, np.ndarray]
+        self.__row_lengths = dict()  # type: typ.Dict[str, np.ndarray]
+        self.__version = 0
+
+    def __len__(self) -> int:
+        return self.__n_rows
+
+    def get_version(self) -> int:
+        """Returns a counter that is incremented on every change of the table."""
+        return self.__version
+
+    def get_n_timesteps(self) -> int:
+        return self.__n_timesteps
+
+    def add_rows(self, n_rows: int) -> int:
+        """Adds rows for new nodes and returns the index of the first new row."""
+        first_row = self.__n_rows
+        self.__n_rows += n_rows
+        self.__version += 1
+        for name in self.__matrices:
+            self.__reserve(name)
+        return first_row
+
+    def reset(self, n_timesteps: int):
+        """Removes all attributes and changes the number of timesteps. Rows are kept."""
+        self.__n_timesteps = n_timesteps
+        self.__matrices.clear()
+        self.__row_lengths.clear()
+        self.__version += 1
+
+    def invalidate_timesteps(self, first_time_step: int):
+        """Marks the cells of all attributes from first_time_step onward as missing, e.g. after their edges changed."""
+        self.__version += 1
+        for name, matrix in self.__matrices.items():
+            row_lengths = self.__row_lengths[name]
+            np.minimum(row_lengths, first_time_step, out=row_lengths)
+            matrix[:, first_time_step:] = _missing_value(matrix.dtype)
+
+    def append_timesteps(self, n_new_timesteps: int):
+        """Extends all attributes by new timesteps, which are missing until rows are set again."""
+        self.__n_timesteps += n_new_timesteps
+        self.__version += 1
+        for name in self.__matrices:
+            self.__reserve(name)
+
+    def __reserve(self, name: str):
+        """Grows the capacity of an attribute to the current number of rows and timesteps."""
+        matrix, row_lengths = self.__matrices[name], self.__row_lengths[name]
+        capacity = matrix.shape
+        if self.__n_rows > capacity[0] or self.__n_timesteps > capacity[1]:
+            shape = tuple(max(size, 2 * cap) if size > cap else cap
+                          for size, cap in zip((self.__n_rows, self.__n_timesteps), capacity))
+            self.__matrices[name] = np.full(shape, _missing_value(matrix.dtype), dtype=matrix.dtype)
+            self.__matrices[name][:capacity[0], :capacity[1]] = matrix
+        if self.__n_rows > row_lengths.shape[0]:
+            self.__row_lengths[name] = np.full(max(self.__n_rows, 2 * row_lengths.shape[0]), -1, dtype=np.int64)
+            self.__row_lengths[name][:row_lengths.shape[0]] = row_lengths
+
+    def get_value(self, name: str, row: int, time_step: int) -> AttributeValue:
+        """Returns one value, or None if the cell is missing."""
+        values = self.get_row(name, row)
+        if time_step >= self.__row_lengths[name][row]:
+            values[time_step]  # Raises an IndexError for invalid timesteps
+            return None
+        value = values[time_step]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def get_row(self, name: str, row: int) -> np.ndarray:
+        """Returns the values of one node as read-only view."""
+        if self.__row_lengths[name][row] < 0:
+            raise KeyError(name)
+        return self.get_matrix(name)[row]
+
+    def get_set_mask(self, name: str) -> np.ndarray:
+        """Returns a read-only boolean array that marks the rows, which have values of the attribute."""
+        is_set = self.__row_lengths[name][:self.__n_rows] >= 0
+        is_set.flags.writeable = False
+        return is_set
+
+    def get_valid_mask(self, name: str) -> np.ndarray:
+        """Returns a read-only boolean matrix that marks the cells, which are not missing."""
+        is_valid = np.arange(self.__n_timesteps) < self.__row_lengths[name][:self.__n_rows, np.newaxis]
+        is_valid.flags.writeable = False
+        return is_valid
+
+    def get_matrix(self, name: str) -> np.ndarray:
+        matrix = self.__matrices[name][:self.__n_rows, :self.__n_timesteps]
+        matrix.flags.writeable = False
+        return matrix
+
+    def set_rows(self, name: str, rows: np.ndarray, values: typ.Sequence[typ.Sequence[AttributeValue]]):
+        """Sets the values of the provided rows, where values contains one sequence of values per row."""
+        self.__version += 1
+        values = _as_attribute_array(values)
+        if name not in self.__matrices:
+            self.__matrices[name] = np.full((self.__n_rows, self.__n_timesteps), _missing_value(values.dtype),
+                                            dtype=values.dtype)
+            self.__row_lengths[name] = np.full(self.__n_rows, -1, dtype=np.int64)
+        matrix = self.__matrices[name]
+        dtype = values.dtype if matrix.dtype == values.dtype else _common_attribute_dtype(matrix.dtype, values.dtype)
+        if matrix.dtype != dtype:
+            # Missing cells get the missing value of the new dtype.
+            is_valid = np.arange(matrix.shape[1]) < self.__row_lengths[name][:matrix.shape[0], np.newaxis]
+            converted = np.full(matrix.shape, _missing_value(dtype), dtype=dtype)
+            converted[is_valid] = matrix[is_valid]
+            matrix = self.__matrices[name] = converted
+        matrix[rows, :self.__n_timesteps] = values
+        self.__row_lengths[name][rows] = self.__n_timesteps
+
+
+def _missing_value(dtype: np.dtype) -> typ.Any:
+    """Returns the value of missing cells of local attribute matrices with the provided dtype."""
+    if dtype.kind == 'f':
+        return np.nan
+    if dtype.kind == 'O':
+        return None
+    return 0
+
+
+def _as_attribute_array(values: typ.Sequence) -> np.ndarray:
+    """
+    Converts attribute values to an array with numeric dtype, or with object dtype for all other values. Mixed ints
+    and floats become floats.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'biufO':
+        return values
+    array_values = np.asarray(values)
+    if array_values.dtype.kind in 'biuf':
+        return array_values
+    # Keep strings, None and mixed values as python objects
+    object_values = np.empty(array_values.shape, dtype=object)
+    object_values[...] = values
+    return object_values
+
+
+def _common_attribute_dtype(dtype1: np.dtype, dtype2: np.dtype) -> np.dtype:
+    if dtype1.kind in 'biuf' and dtype2.kind in 'biuf':
+        return np.result_type(dtype1, dtype2)
+    return np.dtype(object)
+
+
+class _GlobalAttributeTable(object):
+    def __init__(self, n_rows: int=0):
+        """
+        Stores global attributes of temporal nodes as one array per attribute, where each node owns one entry.
+        Categorical attributes, e.g. all metadata attributes, are stored as integer codes into a list of categories
+        shared by all nodes, -1 marks nodes without value. Missing values, NaN and None, are no category and are
+        stored as -1 as well, but read as NaN like in pandas. Other attributes are stored like local attributes. For
+        all attributes, entries that were never set are tracked.
+        """
+        self.__n_rows = n_rows
+        self.__codes = dict()  # type: typ.Dict[str, np.ndarray]
+        self.__categories = dict()  # type: typ.Dict[str, typ.List[AttributeValue]]
+        self.__category_codes = dict()  # type: typ.Dict[str, typ.Dict[AttributeValue, int]]
+        self.__values = dict()  # type: typ.Dict[str, np.ndarray]
+        self.__is_set = dict()  # type: typ.Dict[str, np.ndarray]
+        self.__version = 0
+
+    def __len__(self) -> int:
+        return self.__n_rows
+
+    def get_version(self) -> int:
+        """Returns a counter that is incremented on every change of the table."""
+        return self.__version
+
+    def add_rows(self, n_rows: int) -> int:
+        """Adds rows for new nodes and returns the index of the first new row."""
+        first_row = self.__n_rows
+        self.__n_rows += n_rows
+        self.__version += 1
+        for name, codes in self.__codes.items():
+            self.__codes[name] = np.concatenate((codes, np.full(n_rows, -1, dtype=np.int64)))
+        for name, values in self.__values.items():
+            self.__values[name] = np.concatenate((values, np.zeros(n_rows, values.dtype)))
+        for name, is_set in self.__is_set.items():
+            self.__is_set[name] = np.concatenate((is_set, np.zeros(n_rows, dtype=bool)))
+        return first_row
+
+    def is_categorical(self, name: str) -> bool:
+        return name in self.__codes
+
+    def get_value(self, name: str, row: int) -> AttributeValue:
+        if not self.__is_set[name][row]:
+            raise KeyError(name)
+        if name in self.__codes:
+            code = self.__codes[name][row]
+            return self.__categories[name][code] if code >= 0 else np.nan
+        value = self.__values[name][row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def get_codes(self, name: str) -> np.ndarray:
+        """Returns the codes of a categorical attribute as read-only view."""
+        codes = self.__codes[name].view()
+        codes.flags.writeable = False
+        return codes
+
+    def get_categories(self, name: str) -> typ.List[AttributeValue]:
+        """Returns the categories of a categorical attribute, indexed by its codes."""
+        return list(self.__categories[name])
+
+    def get_column(self, name: str) -> np.ndarray:
+        """Returns the values of all rows as read-only array. Raises a KeyError if a row has no value."""
+        if name in self.__codes:
+            codes = self.__codes[name]
+            if (codes < 0).any():
+                raise KeyError(name)
+            column = _as_attribute_array(self.__categories[name])[codes]
+        else:
+            if not self.__is_set[name].all():
+                raise KeyError(name)
+            column = self.__values[name].view()
+        column.flags.writeable = False
+        return column
+
+    def set_rows(self, name: str, rows: np.ndarray, values: typ.Sequence[AttributeValue], categorical: bool=None,
+                 categories: typ.List[AttributeValue]=None):
+        """
+        Sets the values of the provided rows. New attributes are categorical if categorical is True, or if it is None
+        and the first value is a string. Values that are no category yet are appended to the categories.
+
+        Args:
+            name: Name of the attribute.
+            rows: Rows to set.
+            values: One value per row.
+            categorical: Whether a new attribute is stored as codes.
+            categories: Initial categories of a new categorical attribute, which define the order of its codes.
+        """
+        self.__version += 1
+        if name not in self.__codes and name not in self.__values:
+            if categorical is None:
+                categorical = len(values) > 0 and isinstance(values[0], str)
+            if categorical:
+                self.__add_categorical(name, categories)
+        if name in self.__codes:
+            self.__codes[name][rows] = [self.__code(name, value) for value in values]
+            self.__is_set[name][rows] = True
+            return
+        values = _as_attribute_array(values)
+        if name not in self.__values:
+            self.__values[name] = np.zeros(self.__n_rows, dtype=values.dtype)
+            self.__is_set[name] = np.zeros(self.__n_rows, dtype=bool)
+        array = self.__values[name]
+        dtype = values.dtype if array.dtype == values.dtype else _common_attribute_dtype(array.dtype, values.dtype)
+        if array.dtype != dtype:
+            array = self.__values[name] = array.astype(dtype)
+        array[rows] = values
+        self.__is_set[name][rows] = True
+
+    def set_codes(self, name: str, rows: np.ndarray, codes: np.ndarray, categories: typ.List[AttributeValue]):
+        """
+        Sets the values of the provided rows of a categorical attribute from codes into categories, e.g. those of a
+        pandas categorical. Codes of -1 and missing categories are missing values.
+        """
+        if name in self.__values:
+            self.set_rows(name, rows, [categories[code] if code >= 0 else np.nan for code in codes.tolist()])
+            return
+        self.__version += 1
+        if name not in self.__codes:
+            self.__add_categorical(name, categories)
+        # Codes of categories that are missing here are appended, the last entry translates the code -1.
+        translation = np.array([self.__code(name, category) for category in categories] + [-1], dtype=np.int64)
+        self.__codes[name][rows] = translation[codes]
+        self.__is_set[name][rows] = True
+
+    def __add_categorical(self, name: str, categories: typ.Optional[typ.List[AttributeValue]]):
+        self.__codes[name] = np.full(self.__n_rows, -1, dtype=np.int64)
+        self.__is_set[name] = np.zeros(self.__n_rows, dtype=bool)
+        self.__categories[name] = list()
+        self.__category_codes[name] = dict()
+        for category in categories or list():
+            self.__code(name, category)
+
+    def __code(self, name: str, value: AttributeValue) -> int:
+        """Returns the code of value, which is added to the categories if necessary, or -1 for missing values."""
+        if _is_missing_value(value):
+            return -1
+        category_codes = self.__category_codes[name]
+        code = category_codes.get(value)
+        if code is None:
+            code = category_codes[value] = len(self.__categories[name])
+            self.__categories[name].append(value)
+        return code
+
+
+def _is_missing_value(value: typ.Any) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
 
 
 class TemporalNode(object):
+    __slots__ = ('__node_id', '__global_attributes', '__local_attributes', '__row')
+
     def __init__(self, node_id: int, meta_attributes: typ.Dict[str, str], n_timesteps: int):
         """
         Specifies the nodes of the graph. A temporal node is specified through an node_id
@@ -192,11 +941,25 @@ class TemporalNode(object):
         Args:
             node_id: ID of the node.
             meta_attributes: Dictionary of attributes for a node.
+            n_timesteps: Number of timesteps of local attributes.
         """
         self.__node_id = node_id  # type: int
-        self.__global_attributes = meta_attributes  # type: typ.Dict[str, AttributeValue]
-        self.__local_attributes = {}  # type: typ.Dict[str, typ.List[AttributeValue]]
-        self.__n_timesteps = n_timesteps
+        self.__global_attributes = _GlobalAttributeTable(n_rows=1)
+        self.__local_attributes = _LocalAttributeTable(n_timesteps, n_rows=1)
+        self.__row = 0
+        for name, value in meta_attributes.items():
+            self.__global_attributes.set_rows(name, np.array([0]), [value])
+
+    @classmethod
+    def _in_table(cls, node_id: int, global_attributes: _GlobalAttributeTable, local_attributes: _LocalAttributeTable,
+                  row: int) -> 'TemporalNode':
+        """Creates a node, whose attributes are views on one row of tables shared with other nodes."""
+        node = cls.__new__(cls)
+        node.__node_id = node_id
+        node.__global_attributes = global_attributes
+        node.__local_attributes = local_attributes
+        node.__row = row
+        return node
 
     def get_id(self) -> int:
         """ID of the temporal node."""
@@ -211,16 +974,24 @@ class TemporalNode(object):
         """
         if not isinstance(name, str):
             raise TypeError(f'type {str} for name expected, received type {type(name)}')
-        return self.__global_attributes[name]
+        return self.__global_attributes.get_value(name, self.__row)
 
     def get_local_attribute(self, name: str, time_step: int) -> AttributeValue:
         """
         Local attributes are attributes that could change per timestep.
         You could get it with a name and a time_step.
+        Values are read from the attribute matrix shared by all nodes, so their type follows its dtype, see
+        update_local_attribute: e.g. an int is returned as float, once any node has float values.
         """
         if not isinstance(name, str):
             raise TypeError(f'type {str} for name expected, received type {type(name)}')
-        return self.__local_attributes[name][time_step]
+        return self.__local_attributes.get_value(name, self.__row, time_step)
+
+    def get_local_attribute_values(self, name: str) -> np.ndarray:
+        """Returns the values of a local attribute over all timesteps as read-only array, without copying them."""
+        if not isinstance(name, str):
+            raise TypeError(f'type {str} for name expected, received type {type(name)}')
+        return self.__local_attributes.get_row(name, self.__row)
 
     def update_global_attribute(self, name: str, value: AttributeValue):
         """
@@ -230,7 +1001,7 @@ class TemporalNode(object):
         """
         if not isinstance(name, str):
             raise TypeError(f'type {str} for name expected, received type {type(name)}')
-        self.__global_attributes[name] = value
+        self.__global_attributes.set_rows(name, np.array([self.__row]), [value])
 
     def update_local_attribute(self, name: str, values: typ.List[AttributeValue]):
         """
@@ -238,27 +1009,42 @@ class TemporalNode(object):
         To add or update a attribute a name must be defined as first argument.
         As the second argument a list with values is required.
         In that list, the first element stands for the first timestep, the second for the second timestep and so on.
+        Values of all nodes are stored in one matrix per attribute with a single dtype. Numbers share the smallest
+        common numeric dtype, so mixing ints and floats, within one list or across nodes, stores all values as
+        floats. Strings, None and other values keep the values as python objects.
         """
         if not isinstance(name, str):
             raise TypeError(f'type {str} for name expected, received type {type(name)}')
-        if len(values) != self.__n_timesteps:
-            n_timesteps = self.__n_timesteps
+        n_timesteps = self.__local_attributes.get_n_timesteps()
+        if len(values) != n_timesteps:
             raise InvalidLocalAttributeValuesLength(f'expected values of length {n_timesteps}, '
                                                     f'received length {len(values)}')
-        self.__local_attributes[name] = values.copy()
+        self.__local_attributes.set_rows(name, np.array([self.__row]), [values])
 
 
 class Edge(object):
-    def __init__(self, node1: int, node2: int, time_stamps: typ.List[int]):
+    __slots__ = ('__node1', '__node2', '__time_stamps', '__start', '__stop')
+
+    def __init__(self, node1: int, node2: int, time_stamps: typ.Sequence[int], start: int=None, stop: int=None):
         """
         Edge defined through two nodes and timestamps in which the edge occurs.
 
         Args:
             node1: The first node that describes the edge.
             node2: The second node that describes the edge.
-            time_stamps: List of timestamps in which the edge occurs in the specified timestep.
+            time_stamps: List of timestamps in which the edge occurs in the specified timestep. Lists are copied
+                into a tuple. Can also be a read-only array view, e.g. into an EdgeStore.
+            start: If provided, time_stamps is a buffer shared by several edges, e.g. an array('q') or a NumPy
+                array, and the edge occurs at time_stamps[start:stop].
+            stop: End of the timestamps of the edge in a shared buffer. Is required if start is provided.
         """
+        if start is not None and stop is None:
+            raise ValueError('stop is required for timestamps in a shared buffer')
+        if isinstance(time_stamps, list):
+            time_stamps = tuple(time_stamps)
         self.__time_stamps = time_stamps
+        self.__start = start
+        self.__stop = stop
         self.__node1, self.__node2 = sorted((node1, node2))
 
     def get_incident_nodes(self) -> typ.Tuple[int, int]:
@@ -267,11 +1053,33 @@ class Edge(object):
 
     def get_count(self) -> int:
         """Counts the occurences of an edge in the specified timestep"""
-        return len(self.__time_stamps)
+        if self.__start is None:
+            return len(self.__time_stamps)
+        return self.__stop - self.__start
 
     def get_timestamps(self) -> typ.List[int]:
         """Returns list of timestamps for an edge in the specified timestep"""
-        return self.__time_stamps.copy()
+        if self.__start is None:
+            time_stamps = self.__time_stamps
+        else:
+            time_stamps = self.__time_stamps[self.__start:self.__stop]
+        if isinstance(time_stamps, (np.ndarray, array.array, memoryview)):
+            return time_stamps.tolist()
+        return list(time_stamps)
+
+    def get_timestamps_view(self) -> typ.Sequence[int]:
+        """
+        Returns the timestamps of the edge without copying them. Depending on how the timestamps are stored, the
+        result is a tuple or a read-only NumPy array, which shares the memory of array.array and memoryview buffers.
+        Use get_timestamps for a list.
+        """
+        time_stamps = self.__time_stamps
+        if isinstance(time_stamps, (np.ndarray, array.array, memoryview)):
+            time_stamps = np.asarray(time_stamps)
+            view = time_stamps.view() if self.__start is None else time_stamps[self.__start:self.__stop]
+            view.flags.writeable = False
+            return view
+        return time_stamps if self.__start is None else time_stamps[self.__start:self.__stop]
 
 
 class InvalidLocalAttributeValuesLength(Exception):
@@ -18,6 +18,14 @@ All spring-based layouts have the following adjustable hyperparameters:
 * n_iterations: int, default: 50, number of iterations the spring layout will take to compute the layout.
     More iterations may improve the quality of the layout, reducing the number of iterations will linearly decrease
     runtime.
+* engine: str, default: None, 'networkx' for networkx.spring_layout, which takes quadratic time per iteration, or
+    'barnes_hut' for a Fruchterman-Reingold engine on numpy arrays, which approximates repulsion between nodes
+    Barnes-Hut style in O(n log n) time per iteration. None is the same as 'networkx', the approximation is only
+    used when 'barnes_hut' is requested. SPRING_ENGINES lists the engines of all spring layouts.
+    Flexible layouts without chaining accept the engines in FLEXIBLE_SPRING_ENGINES, which adds 'batched': it packs
+    the graphs of all time steps into batches of padded adjacency matrices and runs the iterations of
+    networkx.spring_layout for each batch at once. Graphs with more than _BATCHED_SPRING_MAX_NODES nodes are laid out
+    one by one, as for None.
 """
 __all__ = ['flexible_spring_layout', 'static_spring_layout', 'flexible_weighted_spring_layout',
            'static_weighted_spring_layout']
@@ -27,6 +35,7 @@ import typing as typ
 import networkx as nx
 import numpy as np
 import scipy as sp
+import scipy.sparse
 import scipy.spatial
 import sklearn.decomposition as decomposition
 import sklearn.preprocessing as preprocessing
@@ -37,6 +46,19 @@ import vtna.utility as util
 
 Point = typ.Tuple[float, float]
 
+SPRING_ENGINES = ('networkx', 'barnes_hut')
+# Engines of flexible_spring_layout and flexible_weighted_spring_layout.
+FLEXIBLE_SPRING_ENGINES = SPRING_ENGINES + ('batched',)
+# Maximal number of nodes of graphs laid out by the batched engine, and of node pairs of one batch of graphs.
+_BATCHED_SPRING_MAX_NODES = 500
+_BATCHED_SPRING_MAX_PAIRS = 2 ** 22
+# Number of points whose sums are computed at once by __barnes_hut_sum, and the opening angle of its cells.
+_BARNES_HUT_BLOCK_SIZE = 2 ** 12
+_BARNES_HUT_THETA = 0.5
+# Maximal number of points of a leaf of the quadtree, and its maximal depth.
+_QUADTREE_LEAF_SIZE = 8
+_QUADTREE_MAX_DEPTH = 20
+
 
 def is_static(static: bool):
     """Decorator, adds is_static attribute to layout function."""
@@ -67,16 +89,14 @@ def description(d: str):
 @description('Basic Spring layout with one individual layout per time step')
 def flexible_spring_layout(temp_graph: vtna.graph.TemporalGraph,
                            node_distance_scale: float=1.0,
-                           n_iterations: int=50) -> typ.List[typ.Dict[int, Point]]:
-    layouts = list()
-    for graph in map(util.graph2networkx, temp_graph):
-        if len(graph.nodes()) == 0:
-            layout = dict()
-        else:
-            node_distance = node_distance_scale * __default_node_distance(graph)
-            layout = nx.spring_layout(graph, dim=2, weight=None, iterations=n_iterations, k=node_distance)
-        layouts.append(layout)
-    return layouts
+                           n_iterations: int=50,
+                           engine: str=None) -> typ.List[typ.Dict[int, Point]]:
+    __check_engine(engine, FLEXIBLE_SPRING_ENGINES)
+    if engine == 'batched':
+        return __batched_spring_layouts(temp_graph, False, node_distance_scale, n_iterations)
+    return [__spring_layout(temp_graph.get_edge_arrays(time_step), lambda: util.graph2networkx(graph), False,
+                            node_distance_scale, n_iterations, engine)
+            for time_step, graph in enumerate(temp_graph)]
 
 
 @is_static(True)
@@ -84,13 +104,10 @@ def flexible_spring_layout(temp_graph: vtna.graph.TemporalGraph,
 @description('Basic Spring layout which ensures static node position by aggregating all observations')
 def static_spring_layout(temp_graph: vtna.graph.TemporalGraph,
                          node_distance_scale: float=1.0,
-                         n_iterations: int=50) -> typ.List[typ.Dict[int, Point]]:
-    graph = util.temporal_graph2networkx(temp_graph)
-    if (len(graph.nodes())) == 0:
-        layout = dict()
-    else:
-        node_distance = node_distance_scale * __default_node_distance(graph)
-        layout = nx.spring_layout(graph, dim=2, weight=None, k=node_distance, iterations=n_iterations)
+                         n_iterations: int=50,
+                         engine: str=None) -> typ.List[typ.Dict[int, Point]]:
+    layout = __spring_layout(util.temporal_graph2arrays(temp_graph), lambda: util.temporal_graph2networkx(temp_graph),
+                             False, node_distance_scale, n_iterations, engine)
     return [layout.copy() for _ in range(len(temp_graph))]
 
 
@@ -100,16 +117,14 @@ def static_spring_layout(temp_graph: vtna.graph.TemporalGraph,
              'are closer.')
 def flexible_weighted_spring_layout(temp_graph: vtna.graph.TemporalGraph,
                                     node_distance_scale: float=1.0,
-                                    n_iterations: int=50) -> typ.List[typ.Dict[int, Point]]:
-    layouts = list()
-    for graph in map(util.graph2networkx, temp_graph):
-        if len(graph.nodes()) == 0:
-            layout = dict()
-        else:
-            node_distance = node_distance_scale * __default_node_distance(graph)
-            layout = nx.spring_layout(graph, dim=2, weight='count', iterations=n_iterations, k=node_distance)
-        layouts.append(layout)
-    return layouts
+                                    n_iterations: int=50,
+                                    engine: str=None) -> typ.List[typ.Dict[int, Point]]:
+    __check_engine(engine, FLEXIBLE_SPRING_ENGINES)
+    if engine == 'batched':
+        return __batched_spring_layouts(temp_graph, True, node_distance_scale, n_iterations)
+    return [__spring_layout(temp_graph.get_edge_arrays(time_step), lambda: util.graph2networkx(graph), True,
+                            node_distance_scale, n_iterations, engine)
+            for time_step, graph in enumerate(temp_graph)]
 
 
 @is_static(False)
@@ -117,21 +132,17 @@ def flexible_weighted_spring_layout(temp_graph: vtna.graph.TemporalGraph,
 @description('Weighted Spring layout with one individual layout per time step. Nodes with high number of interactions '
              'are closer. Positions of previous layout are reused as initial state.')
 def chained_weighted_spring_layout(temp_graph: vtna.graph.TemporalGraph,
-                                    node_distance_scale: float=1.0,
-                                    n_iterations: int=50) -> typ.List[typ.Dict[int, Point]]:
+                                   node_distance_scale: float=1.0,
+                                   n_iterations: int=50,
+                                   engine: str=None) -> typ.List[typ.Dict[int, Point]]:
+    __check_engine(engine, SPRING_ENGINES)
     layouts = list()
-    for graph in map(util.graph2networkx, temp_graph):
-        if len(graph.nodes()) == 0:
-            layout = dict()
-        else:
-            initial_layout = None
-            if len(layouts) > 0 and len(layouts[-1]) > 0:
-                initial_layout = layouts[-1]
-            node_distance = node_distance_scale * __default_node_distance(graph)
-            layout = nx.spring_layout(graph, dim=2, weight='count',
-                                      iterations=n_iterations,
-                                      k=node_distance, pos=initial_layout)
-        layouts.append(layout)
+    for time_step, graph in enumerate(temp_graph):
+        initial_layout = None
+        if len(layouts) > 0 and len(layouts[-1]) > 0:
+            initial_layout = layouts[-1]
+        layouts.append(__spring_layout(temp_graph.get_edge_arrays(time_step), lambda: util.graph2networkx(graph),
+                                       True, node_distance_scale, n_iterations, engine, initial_layout))
     return layouts
 
 
@@ -141,66 +152,432 @@ def chained_weighted_spring_layout(temp_graph: vtna.graph.TemporalGraph,
              'high number of interactions are closer.')
 def static_weighted_spring_layout(temp_graph: vtna.graph.TemporalGraph,
                                   node_distance_scale: float=1.0,
-                                  n_iterations: int=50) -> typ.List[typ.Dict[int, Point]]:
-    graph = util.temporal_graph2networkx(temp_graph)
-    if (len(graph.nodes())) == 0:
-        layout = dict()
-    else:
-        node_distance = node_distance_scale * __default_node_distance(graph)
-        layout = nx.spring_layout(graph, dim=2, weight='count', k=node_distance, iterations=n_iterations)
+                                  n_iterations: int=50,
+                                  engine: str=None) -> typ.List[typ.Dict[int, Point]]:
+    layout = __spring_layout(util.temporal_graph2arrays(temp_graph), lambda: util.temporal_graph2networkx(temp_graph),
+                             True, node_distance_scale, n_iterations, engine)
     return [layout.copy() for _ in range(len(temp_graph))]
 
 
+def __spring_layout(edge_arrays: typ.Tuple[np.ndarray, np.ndarray, np.ndarray],
+                    to_networkx: typ.Callable[[], nx.Graph], weighted: bool, node_distance_scale: float,
+                    n_iterations: int, engine: typ.Optional[str],
+                    initial_layout: typ.Dict[int, Point]=None) -> typ.Dict[int, Point]:
+    """
+    Computes the spring layout of a graph in array form (node1, node2, count) with the selected engine. The networkx
+    engine lays out the graph returned by to_networkx instead, which is only called for this engine.
+    """
+    __check_engine(engine, SPRING_ENGINES)
+    node1, node2, counts = edge_arrays
+    nodes, edges = np.unique(np.concatenate((node1, node2)), return_inverse=True)
+    if len(nodes) == 0:
+        return dict()
+    node_distance = node_distance_scale / np.sqrt(len(nodes))
+    if engine is None or engine == 'networkx':
+        return nx.spring_layout(to_networkx(), dim=2, weight='count' if weighted else None,
+                                iterations=n_iterations, k=node_distance, pos=initial_layout)
+    first, second = edges[:len(node1)], edges[len(node1):]
+    weights = counts.astype(np.float64) if weighted else np.ones(len(first))
+    initial_positions = None
+    if initial_layout is not None:
+        # Like networkx, nodes without initial position start at random within the bounds of the initial layout.
+        domain_size = max(max(point) for point in initial_layout.values())
+        initial_positions = np.random.rand(len(nodes), 2) * domain_size
+        for idx, node in enumerate(nodes.tolist()):
+            if node in initial_layout:
+                initial_positions[idx] = initial_layout[node]
+    positions = __fruchterman_reingold(len(nodes), first, second, weights, node_distance, n_iterations,
+                                       initial_positions)
+    return dict(zip(nodes.tolist(), map(tuple, positions.tolist())))
+
+
+def __check_engine(engine: typ.Optional[str], engines: typ.Tuple[str, ...]):
+    """Raises ValueError if engine is neither None nor one of the engines supported by a layout."""
+    if engine is not None and engine not in engines:
+        raise ValueError(f'Unsupported spring layout engine {engine!r}, expected None or one of '
+                         f'{", ".join(engines)}')
+
+
+def __batched_spring_layouts(temp_graph: vtna.graph.TemporalGraph, weighted: bool, node_distance_scale: float,
+                             n_iterations: int) -> typ.List[typ.Dict[int, Point]]:
+    """
+    Computes the spring layouts of all time steps with the batched engine. Graphs of up to _BATCHED_SPRING_MAX_NODES
+    nodes are laid out at once, larger graphs are laid out one by one with the default engine.
+    """
+    layouts = [dict() for _ in range(len(temp_graph))]  # type: typ.List[typ.Dict[int, Point]]
+    time_steps, block_nodes, first, second, weights = list(), list(), list(), list(), list()
+    n_nodes = 0
+    for time_step in range(len(temp_graph)):
+        node1, node2, counts = temp_graph.get_edge_arrays(time_step)
+        nodes, edges = np.unique(np.concatenate((node1, node2)), return_inverse=True)
+        if len(nodes) > _BATCHED_SPRING_MAX_NODES:
+            layouts[time_step] = __spring_layout((node1, node2, counts),
+                                                 lambda: util.graph2networkx(temp_graph[time_step]), weighted,
+                                                 node_distance_scale, n_iterations, None)
+        elif len(nodes) > 0:
+            time_steps.append(time_step)
+            block_nodes.append(nodes)
+            first.append(edges[:len(node1)] + n_nodes)
+            second.append(edges[len(node1):] + n_nodes)
+            weights.append(counts.astype(np.float64) if weighted else np.ones(len(counts)))
+            n_nodes += len(nodes)
+    if len(time_steps) == 0:
+        return layouts
+    block_sizes = np.array([len(nodes) for nodes in block_nodes])
+    positions = __batched_fruchterman_reingold(block_sizes, np.concatenate(first), np.concatenate(second),
+                                               np.concatenate(weights), node_distance_scale / np.sqrt(block_sizes),
+                                               n_iterations)
+    for time_step, nodes, start in zip(time_steps, block_nodes, np.cumsum(block_sizes) - block_sizes):
+        layouts[time_step] = dict(zip(nodes.tolist(), map(tuple, positions[start:start + len(nodes)].tolist())))
+    return layouts
+
+
+def __batched_fruchterman_reingold(block_sizes: np.ndarray, first: np.ndarray, second: np.ndarray,
+                                   weights: np.ndarray, k: np.ndarray, n_iterations: int,
+                                   initial_positions: np.ndarray=None) -> np.ndarray:
+    """
+    Fruchterman-Reingold force-directed placement of disjoint graphs at once, with the dense algorithm of
+    networkx.spring_layout. Graph i consists of the block_sizes[i] consecutive nodes after the nodes of graph i-1 and
+    has the optimal distance k[i]. Graphs are padded to a multiple of 8 nodes and laid out in batches of equal
+    padded size, see __dense_fruchterman_reingold.
+    """
+    n_nodes = int(block_sizes.sum())
+    block_starts = np.cumsum(block_sizes) - block_sizes
+    node_blocks = np.repeat(np.arange(len(block_sizes)), block_sizes)
+    local_nodes = np.arange(n_nodes) - block_starts[node_blocks]
+    edge_blocks = node_blocks[first]
+    positions = np.random.rand(n_nodes, 2) if initial_positions is None else initial_positions.astype(np.float64)
+    padded_sizes = -(-block_sizes // 8) * 8
+    batch_rows = np.empty(len(block_sizes), dtype=np.int64)
+    for padded_size in np.unique(padded_sizes).tolist():
+        same_size = np.flatnonzero(padded_sizes == padded_size)
+        batch_size = max(1, _BATCHED_SPRING_MAX_PAIRS // padded_size ** 2)
+        for batch_start in range(0, len(same_size), batch_size):
+            blocks = same_size[batch_start:batch_start + batch_size]
+            batch_rows[blocks] = np.arange(len(blocks))
+            is_valid = np.arange(padded_size)[np.newaxis, :] < block_sizes[blocks, np.newaxis]
+            node_idx = (block_starts[blocks, np.newaxis] + np.arange(padded_size)[np.newaxis, :])[is_valid]
+            batch_positions = np.zeros((len(blocks), padded_size, 2))
+            batch_positions[is_valid] = positions[node_idx]
+            adjacency = np.zeros((len(blocks), padded_size, padded_size))
+            in_batch = np.flatnonzero(np.isin(edge_blocks, blocks))
+            rows = batch_rows[edge_blocks[in_batch]]
+            adjacency[rows, local_nodes[first[in_batch]], local_nodes[second[in_batch]]] = weights[in_batch]
+            adjacency[rows, local_nodes[second[in_batch]], local_nodes[first[in_batch]]] = weights[in_batch]
+            positions[node_idx] = __dense_fruchterman_reingold(batch_positions, is_valid, adjacency, k[blocks],
+                                                               n_iterations)[is_valid]
+    return positions
+
+
+def __dense_fruchterman_reingold(positions: np.ndarray, is_valid: np.ndarray, adjacency: np.ndarray, k: np.ndarray,
+                                 n_iterations: int, threshold: float=1e-4) -> np.ndarray:
+    """
+    Runs the dense algorithm of networkx.spring_layout on a batch of graphs at once, with an additional leading axis
+    on all arrays: positions of shape (graphs, nodes, 2), adjacency matrices of shape (graphs, nodes, nodes) and
+    optimal distances k of shape (graphs,). Nodes where is_valid of shape (graphs, nodes) is False pad smaller graphs
+    and exert no forces. Each graph has its own temperature and convergence test. Positions of each graph are
+    centered and scaled to range [-1, 1] like networkx.rescale_layout.
+    """
+    n_valid = is_valid.sum(axis=1)
+    is_pair = is_valid[:, :, np.newaxis] & is_valid[:, np.newaxis, :]
+    temperature = (np.where(is_valid[..., np.newaxis], positions, -np.inf).max(axis=1) -
+                   np.where(is_valid[..., np.newaxis], positions, np.inf).min(axis=1)).max(axis=1) * 0.1
+    cooling = temperature / (n_iterations + 1)
+    k = k[:, np.newaxis, np.newaxis]
+    is_active = np.ones(len(positions), dtype=np.bool_)
+    for _ in range(n_iterations):
+        delta = positions[:, :, np.newaxis, :] - positions[:, np.newaxis, :, :]
+        distance = np.sqrt(np.einsum('bijk,bijk->bij', delta, delta))
+        np.clip(distance, 0.01, None, out=distance)
+        displacement = np.einsum('bijk,bij->bik', delta, k * k / distance ** 2 * is_pair - adjacency * distance / k)
+        length = np.sqrt(np.einsum('bik,bik->bi', displacement, displacement))
+        length = np.where(length < 0.01, 0.1, length)
+        delta_positions = np.einsum('bij,bi->bij', displacement, temperature[:, np.newaxis] / length)
+        delta_positions[~(is_active[:, np.newaxis] & is_valid)] = 0.0
+        positions += delta_positions
+        temperature -= cooling
+        is_active &= np.linalg.norm(delta_positions, axis=(1, 2)) / n_valid >= threshold
+        if not is_active.any():
+            break
+    positions[~is_valid] = 0.0
+    positions -= positions.sum(axis=1, keepdims=True) / n_valid[:, np.newaxis, np.newaxis]
+    positions[~is_valid] = 0.0
+    limits = np.abs(positions).max(axis=(1, 2))
+    limits[limits == 0] = 1.0
+    return positions / limits[:, np.newaxis, np.newaxis]
+
+
+def __fruchterman_reingold(n_nodes: int, first: np.ndarray, second: np.ndarray, weights: np.ndarray, k: float,
+                           n_iterations: int, initial_positions: np.ndarray=None,
+                           threshold: float=1e-4) -> np.ndarray:
+    """
+    Fruchterman-Reingold force-directed placement of nodes 0..n_nodes-1, following networkx.spring_layout: nodes
+    attract each other along the edges (first[i], second[i]) by weights[i] times their squared distance over k, and
+    repel each other by k squared over their distance. Node moves are limited by a temperature, which cools down
+    linearly. Repulsion is approximated Barnes-Hut style, attraction is summed over edges, so each iteration takes
+    O(n log n + m) time. Positions are centered and scaled to range [-1, 1] like networkx.rescale_layout.
+    """
+    positions = np.random.rand(n_nodes, 2) if initial_positions is None else initial_positions.astype(np.float64)
+    is_loop = first == second
+    first, second, weights = first[~is_loop], second[~is_loop], weights[~is_loop]
+    temperature = np.ptp(positions, axis=0).max() * 0.1
+    cooling = temperature / (n_iterations + 1)
+    for _ in range(n_iterations):
+        displacement = k * k * __barnes_hut_sum(positions, 2, exponent=2, min_distance=0.01)
+        diff = positions[first] - positions[second]
+        distance = np.maximum(np.sqrt(np.einsum('ij,ij->i', diff, diff)), 0.01)
+        attraction = diff * (weights * distance / k)[:, np.newaxis]
+        for axis in range(2):
+            displacement[:, axis] -= np.bincount(first, weights=attraction[:, axis], minlength=n_nodes)
+            displacement[:, axis] += np.bincount(second, weights=attraction[:, axis], minlength=n_nodes)
+        length = np.sqrt(np.einsum('ij,ij->i', displacement, displacement))
+        length[length < 0.01] = 0.1
+        delta = displacement * (temperature / length)[:, np.newaxis]
+        positions += delta
+        temperature -= cooling
+        if np.linalg.norm(delta) / n_nodes < threshold:
+            break
+    positions -= positions.mean(axis=0)
+    limit = np.abs(positions).max()
+    if limit > 0:
+        positions /= limit
+    return positions
+
+
 @is_static(True)
 @name('Random Walk PCA Layout with Repel')
 @description('Random Walk PCA uses the similarity of random walks from each node in the graph to build a '
              '2d representation of nodes via PCA. With an iterative repel mechanism overlapping nodes are separated.')
 def random_walk_pca_layout(temp_graph: vtna.graph.TemporalGraph, n: int=25, repel: float=1.0, p: int=2,
-                           random_state: int=None) -> typ.List[typ.Dict[int, Point]]:
-    # TODO: Documentation
-    # Load temporal graph as aggregated networkx graph ignoring nodes without edges.
-    nxgraph = util.temporal_graph2networkx(temp_graph)
-    n_nodes = len(nxgraph.nodes())
-    # Mappings: node ID -> index, index -> node ID
-    idx2node = list(nxgraph.nodes())
-    node2idx = dict((node_id, idx) for idx, node_id in enumerate(idx2node))
-    adjacency_matrix = np.zeros(shape=(n_nodes, n_nodes), dtype=np.float)
-    for n1, n2, data in nxgraph.edges(data=True):
-        adjacency_matrix[node2idx[n1], node2idx[n2]] = data['count']
-        adjacency_matrix[node2idx[n2], node2idx[n1]] = data['count']
-    # Compute random walk probabilities
-    adj_prob = adjacency_matrix / np.sum(adjacency_matrix, axis=0)
-    walks = np.linalg.matrix_power(adj_prob, n).T
-    # Compute distances between random walks of each node
-    walk_dist = sp.spatial.distance.squareform(sp.spatial.distance.pdist(walks, metric='minkowski', p=p))
-    # Compute PCA on random walk distances
-    walks_dist_x = preprocessing.scale(walk_dist)
-    pca = decomposition.PCA(n_components=2, random_state=random_state)
-    walks_dist_2d = pca.fit_transform(walks_dist_x)
-    # Apply repel on each node iteratively
-    # Iterate over each point once (current point is called idx)
-    for idx in range(walks_dist_2d.shape[0]):
-        # Distance between each point and idx
-        dist_to_n1 = sp.spatial.distance.squareform(
-            sp.spatial.distance.pdist(walks_dist_2d, metric='minkowski', p=p)
-        )[idx]
-        # Difference between each point and idx
-        diff_from_n1 = walks_dist_2d - np.tile(walks_dist_2d[idx], (walks_dist_2d.shape[0], 1))
-        # Repel effect is the inverse of the distance between each point and idx times the input repel factor.
-        repel_effect = np.divide(repel, dist_to_n1, where=dist_to_n1 != 0)
-        # Add the repel_effect times difference to each point.
-        walks_dist_2d = walks_dist_2d + (repel_effect * diff_from_n1.T).T
+                           random_state: int=None, sparse: bool=False, n_projections: int=64,
+                           sequential_repel: bool=None) -> typ.List[typ.Dict[int, Point]]:
+    """
+    Places nodes by the similarity of the distributions of n-step random walks starting at each node, reduced to
+    two dimensions by PCA. Afterwards, nodes repel each other to separate overlapping nodes.
+
+    Args:
+        temp_graph: Temporal graph, whose aggregated edges weighted by their number of interactions are walked.
+        n: Number of random walk steps.
+        repel: Strength of the repel between nodes.
+        p: Order of the Minkowski distance between random walks and between nodes during repel.
+        random_state: Seed of PCA and of random projections.
+        sparse: Whether to compute the layout in sparse mode. The dense mode computes all random walk distributions
+            and their pairwise distances, which needs memory quadratic in the number of nodes. The sparse mode
+            applies the sparse transition matrix n times to a random projection of the walk distributions, which
+            needs memory linear in the number of edges, and reduces the projection by randomized PCA. Random
+            projections only preserve Euclidean distances, so the sparse mode requires p=2.
+        n_projections: Number of random projections of the sparse mode.
+        sequential_repel: Whether nodes repel each other one after another, each from the positions left by the
+            previous ones. This is the original, exactly reproducible algorithm, which takes quadratic time.
+            Otherwise all nodes repel each other at once in O(n log n) time: pushes between nearby nodes are exact,
+            pushes from distant nodes are approximated Barnes-Hut style by the centroids of quadtree cells.
+            If None, nodes repel sequentially in dense mode and at once in sparse mode.
+    Raises:
+        ValueError: If sparse is True and p is not 2.
+    """
+    if sparse:
+        if p != 2:
+            raise ValueError(f'The sparse mode compares random walks by Euclidean distance, received p={p}')
+        idx2node, walks_dist_2d = __sparse_random_walk_pca(temp_graph, n, n_projections, random_state)
+    else:
+        # Load temporal graph as aggregated networkx graph ignoring nodes without edges.
+        nxgraph = util.temporal_graph2networkx(temp_graph)
+        n_nodes = len(nxgraph.nodes())
+        # Mappings: node ID -> index, index -> node ID
+        idx2node = list(nxgraph.nodes())
+        node2idx = dict((node_id, idx) for idx, node_id in enumerate(idx2node))
+        adjacency_matrix = np.zeros(shape=(n_nodes, n_nodes), dtype=np.float64)
+        for n1, n2, data in nxgraph.edges(data=True):
+            adjacency_matrix[node2idx[n1], node2idx[n2]] = data['count']
+            adjacency_matrix[node2idx[n2], node2idx[n1]] = data['count']
+        # Compute random walk probabilities
+        adj_prob = adjacency_matrix / np.sum(adjacency_matrix, axis=0)
+        walks = np.linalg.matrix_power(adj_prob, n).T
+        # Compute distances between random walks of each node
+        walk_dist = sp.spatial.distance.squareform(sp.spatial.distance.pdist(walks, metric='minkowski', p=p))
+        # Compute PCA on random walk distances
+        walks_dist_x = preprocessing.scale(walk_dist)
+        pca = decomposition.PCA(n_components=2, random_state=random_state)
+        walks_dist_2d = pca.fit_transform(walks_dist_x)
+    if sequential_repel is None:
+        sequential_repel = not sparse
+    if sequential_repel:
+        walks_dist_2d = __sequential_repel(walks_dist_2d, repel, p)
+    else:
+        walks_dist_2d = __approximate_repel(walks_dist_2d, repel, p)
     # Scale each x and y to range [-1,1]
     max_2d = np.max(walks_dist_2d, axis=0)
     min_2d = np.min(walks_dist_2d, axis=0)
     walks_dist_2d = np.array([2, 2]) / (max_2d - min_2d) * (walks_dist_2d - max_2d) + np.array([1, 1])
     # Build layout dict from layout matrix
-    layout = dict()
-    for i in range(walks_dist_2d.shape[0]):
-        layout[idx2node[i]] = tuple(walks_dist_2d[i].tolist())
+    layout = dict(zip(idx2node, map(tuple, walks_dist_2d.tolist())))
     layouts = [layout.copy() for _ in range(len(temp_graph))]
     return layouts
 
 
-def __default_node_distance(graph: nx.Graph) -> float:
-    return 1.0/np.sqrt(len(graph.nodes()))
+def __sparse_random_walk_pca(temp_graph: vtna.graph.TemporalGraph, n: int, n_projections: int,
+                             random_state: typ.Optional[int]) -> typ.Tuple[typ.List[int], np.ndarray]:
+    """
+    Returns the ids of all nodes with edges and the 2d PCA of a random projection of their n-step random walk
+    distributions, computed from the sparse adjacency matrix of the aggregated graph.
+    """
+    node1, node2, counts = util.temporal_graph2arrays(temp_graph)
+    idx2node = np.union1d(node1, node2)
+    n_nodes = idx2node.shape[0]
+    rows, cols = np.searchsorted(idx2node, node1), np.searchsorted(idx2node, node2)
+    # Self loops are entered once, like in the dense adjacency matrix
+    off_diagonal = rows != cols
+    adjacency_matrix = sp.sparse.coo_matrix((np.concatenate((counts, counts[off_diagonal])).astype(np.float64),
+                                             (np.concatenate((rows, cols[off_diagonal])),
+                                              np.concatenate((cols, rows[off_diagonal])))),
+                                            shape=(n_nodes, n_nodes)).tocsr()
+    # Row i of the walks (P^n)^T is the distribution of walks from node i, where P = A D^-1 is column-stochastic.
+    # Its projection (P^n)^T R = (D^-1 A)^n R is computed by n sparse-dense products.
+    transition = sp.sparse.diags(1.0 / np.asarray(adjacency_matrix.sum(axis=1)).ravel()) @ adjacency_matrix
+    n_projections = min(n_projections, n_nodes)
+    walks = np.random.RandomState(random_state).standard_normal((n_nodes, n_projections)) / np.sqrt(n_projections)
+    for _ in range(n):
+        walks = transition @ walks
+    pca = decomposition.PCA(n_components=2, svd_solver='randomized', random_state=random_state)
+    return idx2node.tolist(), pca.fit_transform(walks)
+
+
+def __sequential_repel(points: np.ndarray, repel: float, p: int) -> np.ndarray:
+    """
+    Applies repel on each point iteratively. Each point pushes all other points away, by the inverse of their
+    Minkowski distance times the repel factor.
+    """
+    points = points.copy()
+    # Iterate over each point once (current point is called idx)
+    for idx in range(points.shape[0]):
+        # Difference and distance between each point and idx
+        diff_from_idx = points - points[idx]
+        dist_to_idx = np.sum(np.abs(diff_from_idx) ** p, axis=1) ** (1.0 / p)
+        # Repel effect is the inverse of the distance between each point and idx times the input repel factor.
+        repel_effect = np.divide(repel, dist_to_idx, out=np.zeros_like(dist_to_idx), where=dist_to_idx != 0)
+        # Add the repel_effect times difference to each point.
+        points += repel_effect[:, np.newaxis] * diff_from_idx
+    return points
+
+
+def __approximate_repel(points: np.ndarray, repel: float, p: int) -> np.ndarray:
+    """
+    Applies repel on all points at once: each point is pushed away from every other point by the repel factor, in
+    the direction of their difference.
+    """
+    return points + repel * __barnes_hut_sum(points, p)
+
+
+def __barnes_hut_sum(points: np.ndarray, p: int, exponent: int=1, min_distance: float=0.0) -> np.ndarray:
+    """
+    Returns for each point the sum of its differences to all other points, each divided by the exponent-th power of
+    their Minkowski distance, but at least min_distance. Sums are computed Barnes-Hut style, see
+    __barnes_hut_interactions, in O(n log n) time.
+    """
+    sums = np.zeros(points.shape)
+    for targets, sources, masses in __barnes_hut_interactions(points):
+        diff = points[targets] - sources
+        weights = masses * __inverse_norm(diff, p, exponent, min_distance)
+        for axis in range(2):
+            sums[:, axis] += np.bincount(targets, weights=diff[:, axis] * weights, minlength=len(points))
+    return sums
+
+
+def __barnes_hut_interactions(points: np.ndarray) \
+        -> typ.Iterator[typ.Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Traverses the quadtree of the points, see __quadtree, for all points at once and yields their interactions in
+    batches of (target point indices, source positions, source masses). A cell whose width is less than
+    _BARNES_HUT_THETA times its distance to the target interacts by its centroid and number of points, a leaf that
+    is closer interacts by each of its points, including the target itself. The points of oversized leaves lie
+    within a tiny fraction of the extent of all points, so they interact with each other by their centroid only
+    from the outside, and not at all from the inside.
+    """
+    if points.shape[0] < 2 or np.ptp(points, axis=0).max() == 0:
+        return
+    order, starts, ends, widths, children_first, children_count = __quadtree(points)
+    masses = ends - starts
+    cumulative = np.concatenate((np.zeros((1, 2)), np.cumsum(points[order], axis=0)))
+    centroids = (cumulative[ends] - cumulative[starts]) / masses[:, np.newaxis]
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order))
+    for block_start in range(0, points.shape[0], _BARNES_HUT_BLOCK_SIZE):
+        targets = np.arange(block_start, min(block_start + _BARNES_HUT_BLOCK_SIZE, points.shape[0]))
+        cells = np.zeros(len(targets), dtype=np.int64)
+        while len(targets) > 0:
+            diff = points[targets] - centroids[cells]
+            is_far = widths[cells] ** 2 < _BARNES_HUT_THETA ** 2 * np.einsum('ij,ij->i', diff, diff)
+            is_leaf = children_count[cells] == 0
+            is_oversized = is_leaf & (masses[cells] > _QUADTREE_LEAF_SIZE)
+            is_inside = (ranks[targets] >= starts[cells]) & (ranks[targets] < ends[cells])
+            is_far |= is_oversized & ~is_inside
+            yield targets[is_far], centroids[cells[is_far]], masses[cells[is_far]].astype(np.float64)
+            is_exact = is_leaf & ~is_far & ~is_oversized
+            counts = masses[cells[is_exact]]
+            sources = np.repeat(starts[cells[is_exact]] - np.cumsum(counts) + counts, counts)
+            sources = order[sources + np.arange(len(sources))]
+            yield np.repeat(targets[is_exact], counts), points[sources], np.ones(len(sources))
+            is_open = ~is_leaf & ~is_far
+            counts = children_count[cells[is_open]]
+            children = np.repeat(children_first[cells[is_open]] - np.cumsum(counts) + counts, counts)
+            cells = children + np.arange(len(children))
+            targets = np.repeat(targets[is_open], counts)
+
+
+def __quadtree(points: np.ndarray) -> typ.Tuple[np.ndarray, ...]:
+    """
+    Builds a quadtree, which subdivides the square around all points into four quadrants, and those of its
+    quadrants that hold more than _QUADTREE_LEAF_SIZE points recursively, up to _QUADTREE_MAX_DEPTH levels.
+    Points are sorted along a Z-order curve, so that the points of each cell are consecutive.
+    Returns the order of points, and for each cell, in breadth-first order, the range [start, end) of its points in
+    that order, its width, the index of its first child cell and its number of child cells.
+    """
+    extent = np.ptp(points, axis=0).max()
+    side = 2 ** _QUADTREE_MAX_DEPTH
+    grid = np.minimum(((points - points.min(axis=0)) / extent * side).astype(np.int64), side - 1)
+    codes = (__spread_bits(grid[:, 0]) << 1) | __spread_bits(grid[:, 1])
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    levels = list()
+    starts, ends, prefixes = np.array([0]), np.array([len(codes)]), np.array([0])
+    n_cells = 0
+    for depth in range(_QUADTREE_MAX_DEPTH + 1):
+        is_split = ends - starts > _QUADTREE_LEAF_SIZE if depth < _QUADTREE_MAX_DEPTH else np.zeros(len(starts), bool)
+        shift = 2 * (_QUADTREE_MAX_DEPTH - depth - 1)
+        child_prefixes = prefixes[is_split, np.newaxis] * 4 + np.arange(5)[np.newaxis, :]
+        bounds = np.searchsorted(codes, child_prefixes << shift if shift >= 0 else child_prefixes)
+        is_occupied = bounds[:, 1:] > bounds[:, :-1]
+        children_count = np.zeros(len(starts), dtype=np.int64)
+        children_count[is_split] = is_occupied.sum(axis=1)
+        children_first = n_cells + len(starts) + np.cumsum(children_count) - children_count
+        levels.append((starts, ends, np.full(len(starts), extent / 2 ** depth), children_first, children_count))
+        n_cells += len(starts)
+        if not is_split.any():
+            break
+        starts, ends = bounds[:, :-1][is_occupied], bounds[:, 1:][is_occupied]
+        prefixes = child_prefixes[:, :-1][is_occupied]
+    return (order,) + tuple(np.concatenate(arrays) for arrays in zip(*levels))
+
+
+def __spread_bits(values: np.ndarray) -> np.ndarray:
+    """Moves bit i of each value of at most 32 bits to bit 2 * i, to interleave coordinates into Z-order codes."""
+    values = values & 0xFFFFFFFF
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        values = (values | (values << shift)) & mask
+    return values
+
+
+def __inverse_norm(diff: np.ndarray, p: int, exponent: int=1, min_distance: float=0.0) -> np.ndarray:
+    """
+    Returns the inverse exponent-th power of the Minkowski norm of differences along the last axis, with norms of
+    at least min_distance. Zero norms give 0.
+    """
+    if p == 2:
+        norm = np.sqrt(np.einsum('...i,...i', diff, diff))
+    else:
+        norm = np.sum(np.abs(diff) ** p, axis=-1) ** (1.0 / p)
+    if min_distance > 0:
+        norm = np.maximum(norm, min_distance)
+    return np.divide(1.0, norm ** exponent, out=np.zeros_like(norm), where=norm != 0)
+
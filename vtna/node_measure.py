@@ -3,18 +3,30 @@ __all__ = ['LocalDegreeCentrality', 'GlobalDegreeCentrality',
            'LocalClosenessCentrality', 'GlobalClosenessCentrality']
 
 import abc
+import concurrent.futures
+import functools
+import math
+import os
 import typing as typ
 
 import vtna.graph
+import vtna.sparse_centrality as spc
 import vtna.utility as util
 
 import networkx as nx
 import numpy as np
+import scipy.sparse
 
 # Type aliases
 NodeID = int
 MeasureValue = float
 
+# Number of pivots for approximate betweenness, either fixed or a function of the number of nodes of a graph.
+PivotCount = typ.Union[int, typ.Callable[[int], int]]
+
+# Backends that compute centralities, see _backend_func.
+BACKENDS = ('networkx', 'sparse')
+
 
 class NodeMeasure(util.Describable, metaclass=abc.ABCMeta):
     """
@@ -62,6 +74,9 @@ class LocalNodeMeasure(NodeMeasure, metaclass=abc.ABCMeta):
         super().__init__(graph)
         self._temporal_graph: vtna.graph.TemporalGraph = graph
         self._measures_dict: typ.Dict[NodeID, typ.List[MeasureValue]] = {}
+        self._measures_matrix: typ.Optional[np.ndarray] = None
+        # Rows of the measure matrix follow the rows of the local attribute matrices of the graph.
+        self._node_ids: np.ndarray = graph.get_node_ids()
 
     def add_to_graph(self):
         value_range = (min([min(l) for l in self._measures_dict.values()]),
@@ -73,6 +88,24 @@ class LocalNodeMeasure(NodeMeasure, metaclass=abc.ABCMeta):
         super().__getitem__(node_id)
         return self._measures_dict[node_id]
 
+    def get_node_ids(self) -> np.ndarray:
+        """
+        Returns the ids of all nodes, which label the rows of get_measure_matrix. They are ordered like
+        TemporalGraph.get_node_ids, so measure matrices line up with local attribute matrices and filter masks.
+        """
+        return self._node_ids.copy()
+
+    def get_measure_matrix(self) -> np.ndarray:
+        """
+        Returns the measures of all nodes as read-only matrix of shape (nodes, timesteps), with rows ordered like
+        get_node_ids.
+        """
+        if self._measures_matrix is None:
+            matrix = np.array([self._measures_dict[node_id] for node_id in self._node_ids.tolist()])
+            self._measures_matrix = matrix.reshape(len(self._measures_dict), len(self._temporal_graph))
+            self._measures_matrix.flags.writeable = False
+        return self._measures_matrix
+
 
 class GlobalNodeMeasure(NodeMeasure, metaclass=abc.ABCMeta):
     """
@@ -98,41 +131,218 @@ class GlobalNodeMeasure(NodeMeasure, metaclass=abc.ABCMeta):
         return self._measures_dict[node_id]
 
 
-def _networkx_local_centrality(temporal_graph: vtna.graph.TemporalGraph, nx_centrality_func: typ.Callable) \
+def _local_centrality(temporal_graph: vtna.graph.TemporalGraph, centrality_func: typ.Callable,
+                      n_workers: typ.Optional[int]=1, chunk_size: int=None) \
         -> typ.Dict[NodeID, typ.List[MeasureValue]]:
     """
-    Computes local centralities for a temporal graph based on a networkx centrality function.
+    Computes local centralities for a temporal graph based on a centrality function.
 
     Args:
         temporal_graph: The temporal graph which centralities will be computed
-        nx_centrality_func: A wrapper function that takes a networkx graph and
-            returns the computed centralities as dictionary.
+        centrality_func: A function that takes the edges of a local graph as
+            arrays (node1, node2, count) and returns the computed centralities as
+            dictionary, see _backend_func. Must be picklable if n_workers is not 1.
+        n_workers: Number of worker processes. Timesteps are independent of each
+            other and are distributed over the workers. If None, one worker per
+            CPU is used. If 1, centralities are computed in this process.
+        chunk_size: Number of timesteps sent to a worker at once. By default, each
+            worker receives about four chunks.
     """
+    if n_workers is not None and n_workers < 1:
+        raise ValueError(f'n_workers must be at least 1, received {n_workers}')
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, received {chunk_size}')
     centrality_dict: typ.Dict[NodeID, typ.List[MeasureValue]] = dict()
     # Initialize empty lists for every node, because not every node
     # exists in every local graph
     for node in temporal_graph.get_nodes():
         centrality_dict[node.get_id()] = len(temporal_graph) * [0]
+    # Skip empty graphs
+    timesteps = [timestep for timestep, local_graph in enumerate(temporal_graph) if len(local_graph) > 0]
+    if n_workers == 1:
+        results = ((timestep, centrality_func(*temporal_graph.get_edge_arrays(timestep))) for timestep in timesteps)
+    else:
+        results = _parallel_local_centrality(temporal_graph, timesteps, centrality_func, n_workers, chunk_size)
     # We also have to use an index because appending won't work with
     # nodes missing in some local graphs
-    for timestep, local_graph in enumerate(temporal_graph):
-        # Skip empty graphs
-        if not local_graph.get_edges():
-            continue
-        nx_graph = util.graph2networkx(local_graph)
-        for (node_id, bc) in nx_centrality_func(nx_graph).items():
+    for timestep, centralities in results:
+        for (node_id, bc) in centralities.items():
             centrality_dict[node_id][timestep] = bc
     return centrality_dict
 
 
-class LocalDegreeCentrality(LocalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
-        super().__init__(graph)
+def _parallel_local_centrality(temporal_graph: vtna.graph.TemporalGraph, timesteps: typ.List[int],
+                               centrality_func: typ.Callable, n_workers: typ.Optional[int], chunk_size: int) \
+        -> typ.Iterator[typ.Tuple[int, typ.Dict[NodeID, MeasureValue]]]:
+    """
+    Distributes chunks of timesteps over a process pool. Graphs are sent to the workers in their array form,
+    see TemporalGraph.get_edge_arrays, which pickles much smaller and faster than networkx graphs.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(timesteps) / (4 * n_workers)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = list()
+        for start in range(0, len(timesteps), chunk_size):
+            chunk = timesteps[start:start + chunk_size]
+            graphs = [temporal_graph.get_edge_arrays(timestep) for timestep in chunk]
+            futures.append(executor.submit(_local_centrality_chunk, centrality_func, chunk, graphs))
+        for future in futures:
+            yield from future.result()
+
+
+def _local_centrality_chunk(centrality_func: typ.Callable, timesteps: typ.List[int],
+                            graphs: typ.List[typ.Tuple[np.ndarray, np.ndarray, np.ndarray]]) \
+        -> typ.List[typ.Tuple[int, typ.Dict[NodeID, MeasureValue]]]:
+    """Computes the centralities of a chunk of timesteps in a worker process."""
+    return [(timestep, centrality_func(*graph)) for timestep, graph in zip(timesteps, graphs)]
+
+
+def _local_degree_matrix(temporal_graph: vtna.graph.TemporalGraph) -> typ.Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the degrees of all nodes for all timesteps with a single bincount over the edge endpoints.
+    Like networkx, a self loop adds two to the degree of its node.
+
+    Returns:
+        Tuple of the node ids, ordered like TemporalGraph.get_node_ids, and the read-only degree matrix of shape
+        (nodes, timesteps).
+    """
+    node_ids = temporal_graph.get_node_ids()
+    sorter = np.argsort(node_ids)
+    n_timesteps = len(temporal_graph)
+    graphs = [temporal_graph.get_edge_arrays(timestep) for timestep in range(n_timesteps)]
+    endpoints = np.concatenate([np.empty(0, dtype=np.int64)] + [np.concatenate((node1, node2))
+                                                                 for node1, node2, _ in graphs])
+    # Each timestep contributes its first endpoints, then its second endpoints
+    endpoint_steps = np.repeat(np.arange(n_timesteps), [2 * len(node1) for node1, _, _ in graphs])
+    rows = sorter[np.searchsorted(node_ids, endpoints, sorter=sorter)]
+    degrees = np.bincount(rows * n_timesteps + endpoint_steps, minlength=len(node_ids) * n_timesteps)
+    degrees = degrees.reshape(len(node_ids), n_timesteps)
+    degrees.flags.writeable = False
+    return node_ids, degrees
+
+
+def _global_centrality(temporal_graph: vtna.graph.TemporalGraph, backend: str, nx_centrality_func: typ.Callable,
+                       sparse_centrality_func: typ.Callable) -> typ.Dict[NodeID, MeasureValue]:
+    """Computes centralities of the graph aggregated over all timesteps with the selected backend."""
+    if backend == 'networkx':
+        # The aggregated networkx graph keeps the node order of the temporal graph.
+        return nx_centrality_func(util.temporal_graph2networkx(temporal_graph))
+    centrality_func = _backend_func(backend, nx_centrality_func, sparse_centrality_func)
+    return centrality_func(*util.temporal_graph2arrays(temporal_graph))
+
+
+def _backend_func(backend: str, nx_centrality_func: typ.Callable, sparse_centrality_func: typ.Callable) \
+        -> typ.Callable:
+    """
+    Returns a centrality function for graphs in array form (node1, node2, count), which computes centralities with
+    the selected backend. The function is picklable, so that it can be sent to worker processes.
+
+    Args:
+        backend: 'networkx' builds a networkx graph and applies nx_centrality_func to it.
+            'sparse' builds a sparse adjacency matrix and applies sparse_centrality_func,
+            see vtna.sparse_centrality, which avoids networkx entirely.
+        nx_centrality_func: Takes a networkx graph and returns centralities as dictionary.
+        sparse_centrality_func: Takes an adjacency matrix and returns centralities as array.
+    """
+    if backend == 'networkx':
+        return functools.partial(_networkx_centrality, nx_centrality_func)
+    elif backend == 'sparse':
+        return functools.partial(_sparse_centrality, sparse_centrality_func)
+    raise ValueError(f'backend must be one of {BACKENDS}, received {backend!r}')
+
+
+def _networkx_centrality(nx_centrality_func: typ.Callable, node1: np.ndarray, node2: np.ndarray,
+                         counts: np.ndarray) -> typ.Dict[NodeID, MeasureValue]:
+    return nx_centrality_func(util.arrays2networkx(node1, node2, counts))
+
+
+def _sparse_centrality(sparse_centrality_func: typ.Callable, node1: np.ndarray, node2: np.ndarray,
+                       counts: np.ndarray) -> typ.Dict[NodeID, MeasureValue]:
+    node_ids, adjacency = spc.adjacency_matrix(node1, node2)
+    return dict(zip(node_ids.tolist(), sparse_centrality_func(adjacency).tolist()))
+
+
+def _nx_degree(nx_graph: nx.Graph) -> typ.Dict[NodeID, MeasureValue]:
+    return dict(nx.degree(nx_graph))
+
+
+def _nx_betweenness(nx_graph: nx.Graph, k: PivotCount=None, seed: int=None) -> typ.Dict[NodeID, MeasureValue]:
+    return nx.betweenness_centrality(nx_graph, k=_n_pivots(k, len(nx_graph)), normalized=True, weight=None, seed=seed)
+
+
+def _sparse_betweenness(adjacency: scipy.sparse.csr_matrix, k: PivotCount=None, seed: int=None) -> np.ndarray:
+    return spc.betweenness_centrality(adjacency, _n_pivots(k, adjacency.shape[0]), seed)
 
-        def nx_degree(nx_graph):
-            return dict(nx.degree(nx_graph))
 
-        self._measures_dict = _networkx_local_centrality(graph, nx_degree)
+def _betweenness_funcs(k: typ.Optional[PivotCount], seed: typ.Optional[int]) -> typ.Tuple[typ.Callable, typ.Callable]:
+    """Returns networkx and sparse betweenness functions, which sample pivots if k is provided."""
+    return functools.partial(_nx_betweenness, k=k, seed=seed), functools.partial(_sparse_betweenness, k=k, seed=seed)
+
+
+def _n_pivots(k: typ.Optional[PivotCount], n_nodes: int) -> typ.Optional[int]:
+    """Returns the number of pivots for a graph with n_nodes nodes, or None if betweenness is computed exactly."""
+    if k is None or (callable(k) and n_nodes <= 2):
+        # Betweenness of graphs with at most two nodes is 0, pivots are not sampled.
+        return None
+    n_pivots = k(n_nodes) if callable(k) else k
+    if n_pivots < 1:
+        raise ValueError(f'number of pivots must be at least 1, received {n_pivots}')
+    return None if n_pivots >= n_nodes else int(n_pivots)
+
+
+def _betweenness_error_bound(n_nodes: int, k: typ.Optional[PivotCount], confidence: float) -> float:
+    """
+    Returns a bound on the absolute error of normalized betweenness of a graph with n_nodes nodes, when it is
+    estimated from sampled pivots. By Hoeffding's inequality, the bound holds for each node with the provided
+    confidence. Exact betweenness has no error.
+    """
+    if n_nodes <= 2:
+        return 0.0
+    n_pivots = _n_pivots(k, n_nodes)
+    if n_pivots is None:
+        return 0.0
+    # The contribution of one pivot to the scaled estimate lies in [0, n / (n - 1)].
+    return n_nodes / (n_nodes - 1) * math.sqrt(math.log(2 / (1 - confidence)) / (2 * n_pivots))
+
+
+def _check_confidence(confidence: float):
+    if not 0 < confidence < 1:
+        raise ValueError(f'confidence must be between 0 and 1, received {confidence}')
+
+
+def _n_nodes(node1: np.ndarray, node2: np.ndarray) -> int:
+    return len(np.unique(np.concatenate((node1, node2))))
+
+
+def _nx_closeness(nx_graph: nx.Graph) -> typ.Dict[NodeID, MeasureValue]:
+    return nx.closeness_centrality(nx_graph, distance=None)
+
+
+class LocalDegreeCentrality(LocalNodeMeasure):
+    def __init__(self, graph: vtna.graph.TemporalGraph, n_workers: typ.Optional[int]=1, chunk_size: int=None,
+                 backend: str='networkx'):
+        """
+        Args:
+            graph: The temporal graph.
+            n_workers: Number of worker processes, see _local_centrality. Only supported by the networkx backend.
+            chunk_size: Number of timesteps sent to a worker at once. Only supported by the networkx backend.
+            backend: 'networkx' or 'sparse'. The sparse backend counts the degrees of all nodes and timesteps at
+                once in this process, see _local_degree_matrix.
+        Raises:
+            ValueError: If the sparse backend is combined with n_workers other than 1 or with chunk_size.
+        """
+        super().__init__(graph)
+        if backend == 'sparse':
+            if n_workers != 1 or chunk_size is not None:
+                raise ValueError('n_workers and chunk_size are not supported by the sparse backend, which computes '
+                                 'all timesteps at once')
+            node_ids, self._measures_matrix = _local_degree_matrix(graph)
+            self._measures_dict = dict(zip(node_ids.tolist(), self._measures_matrix.tolist()))
+        else:
+            self._measures_dict = _local_centrality(graph, _backend_func(backend, _nx_degree, spc.degree),
+                                                    n_workers, chunk_size)
 
     @staticmethod
     def get_name() -> str:
@@ -144,10 +354,15 @@ class LocalDegreeCentrality(LocalNodeMeasure):
 
 
 class GlobalDegreeCentrality(GlobalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
+    def __init__(self, graph: vtna.graph.TemporalGraph, backend: str='networkx'):
+        """
+        Args:
+            graph: The temporal graph.
+            backend: 'networkx' or 'sparse', see _backend_func.
+        """
         super().__init__(graph)
-        nx_graph = util.temporal_graph2networkx(self._temporal_graph)
-        self._measures_dict.update(nx.degree_centrality(nx_graph))
+        self._measures_dict.update(_global_centrality(self._temporal_graph, backend,
+                                                      nx.degree_centrality, spc.degree_centrality))
         # Denormalize degrees
         for node_id, degree in self._measures_dict.items():
             self._measures_dict[node_id] = int(degree * (len(graph.get_nodes()) - 1))
@@ -163,13 +378,38 @@ class GlobalDegreeCentrality(GlobalNodeMeasure):
 
 
 class LocalBetweennessCentrality(LocalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
+    def __init__(self, graph: vtna.graph.TemporalGraph, n_workers: typ.Optional[int]=1, chunk_size: int=None,
+                 backend: str='networkx', k: PivotCount=None, seed: int=None, confidence: float=0.95):
+        """
+        Args:
+            graph: The temporal graph.
+            n_workers: Number of worker processes, see _local_centrality.
+            chunk_size: Number of timesteps sent to a worker at once.
+            backend: 'networkx' or 'sparse', see _backend_func.
+            k: If provided, betweenness is approximated from shortest paths starting at k sampled pivots instead
+                of all nodes. Can also be a function that returns the number of pivots for the number of nodes of
+                each local graph. Local graphs with at most k nodes are computed exactly.
+            seed: Seed for sampling pivots. Each timestep uses the same seed.
+            confidence: Confidence of the error bounds of approximated betweenness, see get_error_bounds.
+        """
         super().__init__(graph)
-
-        def nx_betweenness(nx_graph):
-            return nx.betweenness_centrality(nx_graph, normalized=True, weight=None)
-
-        self._measures_dict.update(_networkx_local_centrality(graph, nx_betweenness))
+        _check_confidence(confidence)
+        self._measures_dict.update(_local_centrality(
+            graph, _backend_func(backend, *_betweenness_funcs(k, seed)), n_workers, chunk_size))
+        self.__error_bounds = len(graph) * [0.0]
+        if k is not None:
+            for timestep in range(len(graph)):
+                n_nodes = _n_nodes(*graph.get_edge_arrays(timestep)[:2])
+                if n_nodes > 2:
+                    # Empty and tiny timesteps are exact
+                    self.__error_bounds[timestep] = _betweenness_error_bound(n_nodes, k, confidence)
+
+    def get_error_bounds(self) -> typ.List[float]:
+        """
+        Returns a bound on the absolute error of the betweenness of each node for every timestep, which holds with
+        the confidence provided on creation. Bounds are 0 for timesteps computed exactly.
+        """
+        return self.__error_bounds.copy()
 
     @staticmethod
     def get_name() -> str:
@@ -183,10 +423,31 @@ class LocalBetweennessCentrality(LocalNodeMeasure):
 
 
 class GlobalBetweennessCentrality(GlobalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
+    def __init__(self, graph: vtna.graph.TemporalGraph, backend: str='networkx', k: PivotCount=None,
+                 seed: int=None, confidence: float=0.95):
+        """
+        Args:
+            graph: The temporal graph.
+            backend: 'networkx' or 'sparse', see _backend_func.
+            k: If provided, betweenness is approximated from shortest paths starting at k sampled pivots instead
+                of all nodes. Can also be a function that returns the number of pivots for the number of nodes.
+            seed: Seed for sampling pivots.
+            confidence: Confidence of the error bound of approximated betweenness, see get_error_bound.
+        """
         super().__init__(graph)
-        nx_graph = util.temporal_graph2networkx(self._temporal_graph)
-        self._measures_dict.update(nx.betweenness_centrality(nx_graph, normalized=True, weight=None))
+        _check_confidence(confidence)
+        self._measures_dict.update(_global_centrality(self._temporal_graph, backend, *_betweenness_funcs(k, seed)))
+        self.__error_bound = 0.0
+        if k is not None:
+            n_nodes = _n_nodes(*util.temporal_graph2arrays(graph)[:2])
+            self.__error_bound = _betweenness_error_bound(n_nodes, k, confidence)
+
+    def get_error_bound(self) -> float:
+        """
+        Returns a bound on the absolute error of the betweenness of each node, which holds with the confidence
+        provided on creation. The bound is 0 if betweenness was computed exactly.
+        """
+        return self.__error_bound
 
     @staticmethod
     def get_name() -> str:
@@ -200,13 +461,18 @@ class GlobalBetweennessCentrality(GlobalNodeMeasure):
 
 
 class LocalClosenessCentrality(LocalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
+    def __init__(self, graph: vtna.graph.TemporalGraph, n_workers: typ.Optional[int]=1, chunk_size: int=None,
+                 backend: str='networkx'):
+        """
+        Args:
+            graph: The temporal graph.
+            n_workers: Number of worker processes, see _local_centrality.
+            chunk_size: Number of timesteps sent to a worker at once.
+            backend: 'networkx' or 'sparse', see _backend_func.
+        """
         super().__init__(graph)
-
-        def nx_closeness(nx_graph):
-            return nx.closeness_centrality(nx_graph, distance=None)
-
-        self._measures_dict.update(_networkx_local_centrality(graph, nx_closeness))
+        self._measures_dict.update(_local_centrality(
+            graph, _backend_func(backend, _nx_closeness, spc.closeness_centrality), n_workers, chunk_size))
 
     @staticmethod
     def get_name() -> str:
@@ -220,10 +486,15 @@ class LocalClosenessCentrality(LocalNodeMeasure):
 
 
 class GlobalClosenessCentrality(GlobalNodeMeasure):
-    def __init__(self, graph: vtna.graph.TemporalGraph):
+    def __init__(self, graph: vtna.graph.TemporalGraph, backend: str='networkx'):
+        """
+        Args:
+            graph: The temporal graph.
+            backend: 'networkx' or 'sparse', see _backend_func.
+        """
         super().__init__(graph)
-        nx_graph = util.temporal_graph2networkx(self._temporal_graph)
-        self._measures_dict.update(nx.closeness_centrality(nx_graph, distance=None))
+        self._measures_dict.update(_global_centrality(self._temporal_graph, backend,
+                                                      _nx_closeness, spc.closeness_centrality))
 
     @staticmethod
     def get_name() -> str:
@@ -0,0 +1,169 @@
+"""
+Module vtna.sparse_centrality
+
+Centrality measures computed directly on a sparse adjacency matrix in CSR format, without building networkx graphs.
+Shortest path lengths come from scipy.sparse.csgraph, betweenness uses Brandes' algorithm, vectorized over blocks of
+source nodes. Results are the same as those of the networkx functions used in vtna.node_measure, including their
+normalization.
+
+All functions take the adjacency matrix of an undirected graph as returned by adjacency_matrix and return one value
+per row.
+"""
+__all__ = ['adjacency_matrix', 'degree', 'degree_centrality', 'closeness_centrality', 'betweenness_centrality']
+
+import typing as typ
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+
+# Upper bound for the number of entries of the dense (sources x nodes) blocks of breadth-first searches.
+_BLOCK_ENTRIES = 2 ** 22
+
+
+def adjacency_matrix(node1: np.ndarray, node2: np.ndarray) -> typ.Tuple[np.ndarray, scipy.sparse.csr_matrix]:
+    """
+    Creates the symmetric adjacency matrix of an undirected graph from its edges.
+
+    Args:
+        node1: First incident node of each edge.
+        node2: Second incident node of each edge. Duplicate edges are merged.
+    Returns:
+        Tuple of the sorted node ids, which label the rows and columns, and the adjacency matrix with ones for
+        adjacent nodes. Self loops are kept on the diagonal.
+    """
+    node_ids = np.unique(np.concatenate((node1, node2)))
+    rows = np.searchsorted(node_ids, node1)
+    cols = np.searchsorted(node_ids, node2)
+    n = len(node_ids)
+    adjacency = scipy.sparse.coo_matrix((np.ones(2 * len(rows)), (np.concatenate((rows, cols)),
+                                                                   np.concatenate((cols, rows)))),
+                                        shape=(n, n)).tocsr()
+    adjacency.sum_duplicates()
+    adjacency.data.fill(1.0)
+    return node_ids, adjacency
+
+
+def degree(adjacency: scipy.sparse.csr_matrix) -> np.ndarray:
+    """Returns the degree of each node. Like in networkx, a self loop adds two to the degree of its node."""
+    return np.diff(adjacency.indptr) + (adjacency.diagonal() != 0)
+
+
+def degree_centrality(adjacency: scipy.sparse.csr_matrix) -> np.ndarray:
+    """Returns the degree of each node normalized by the maximal degree n - 1, like networkx.degree_centrality."""
+    n = adjacency.shape[0]
+    if n <= 1:
+        return np.ones(n)
+    return degree(adjacency) * (1.0 / (n - 1.0))
+
+
+def closeness_centrality(adjacency: scipy.sparse.csr_matrix) -> np.ndarray:
+    """
+    Returns the closeness centrality of each node, like networkx.closeness_centrality with the default Wasserman
+    and Faust improvement for graphs with multiple components.
+    """
+    n = adjacency.shape[0]
+    closeness = np.zeros(n)
+    if n <= 1:
+        return closeness
+    adjacency = _without_loops(adjacency)
+    for sources in _source_blocks(np.arange(n), n):
+        distances = scipy.sparse.csgraph.shortest_path(adjacency, directed=False, unweighted=True, indices=sources)
+        reachable = np.isfinite(distances)
+        n_reachable = reachable.sum(axis=1) - 1.0
+        total_distance = np.where(reachable, distances, 0.0).sum(axis=1)
+        connected = total_distance > 0
+        closeness[sources[connected]] = (n_reachable[connected] / total_distance[connected]) * \
+                                        (n_reachable[connected] / (n - 1))
+    return closeness
+
+
+def betweenness_centrality(adjacency: scipy.sparse.csr_matrix, k: int=None, seed: int=None) -> np.ndarray:
+    """
+    Returns the betweenness centrality of each node, normalized by 1 / ((n - 1) * (n - 2)) for graphs with more
+    than two nodes, like networkx.betweenness_centrality(normalized=True).
+
+    Args:
+        adjacency: Adjacency matrix of the graph.
+        k: If provided and smaller than the number of nodes, betweenness is approximated from shortest paths
+            starting at k pivots, which are sampled uniformly without replacement. Like in networkx, the result
+            is scaled by n / k.
+        seed: Seed for sampling the pivots.
+    """
+    n = adjacency.shape[0]
+    betweenness = np.zeros(n)
+    adjacency = _without_loops(adjacency)
+    sampled = k is not None and k < n
+    if sampled:
+        is_pivot = np.zeros(n, dtype=bool)
+        is_pivot[np.random.RandomState(seed).choice(n, k, replace=False)] = True
+    # Shortest paths never leave a component, so components are processed separately, which keeps the dense
+    # blocks small for fragmented graphs. Components of up to two nodes have no inner nodes on shortest paths.
+    for nodes in _components(adjacency):
+        if len(nodes) <= 2:
+            continue
+        component = adjacency[nodes][:, nodes]
+        pivots = np.flatnonzero(is_pivot[nodes]) if sampled else np.arange(len(nodes))
+        for sources in _source_blocks(pivots, len(nodes)):
+            betweenness[nodes] += _brandes_dependencies(component, sources)
+    if n > 2:
+        betweenness *= 1 / ((n - 1) * (n - 2))
+        if sampled:
+            betweenness *= n / k
+    return betweenness
+
+
+def _brandes_dependencies(adjacency: scipy.sparse.csr_matrix, sources: np.ndarray) -> np.ndarray:
+    """
+    Returns the sum of the dependencies of the provided sources on each node. Each row of the dense blocks belongs
+    to one source, so that one sparse matrix product advances the breadth-first searches of all sources by one level.
+    """
+    rows = np.arange(len(sources))
+    n_paths = np.zeros((len(sources), adjacency.shape[0]))
+    n_paths[rows, sources] = 1.0
+    distances = np.full(n_paths.shape, -1, dtype=np.int64)
+    distances[rows, sources] = 0
+    # Forward pass: count shortest paths level by level.
+    frontier = n_paths.copy()
+    level = 0
+    while True:
+        reached = adjacency.dot(frontier.T).T
+        new = (reached > 0) & (distances < 0)
+        if not new.any():
+            break
+        level += 1
+        distances[new] = level
+        frontier = np.where(new, reached, 0.0)
+        n_paths += frontier
+    # Backward pass: accumulate dependencies from the farthest level towards the sources.
+    dependencies = np.zeros(n_paths.shape)
+    for level in range(level, 0, -1):
+        on_level = distances == level
+        coefficients = np.divide(1.0 + dependencies, n_paths, out=np.zeros(n_paths.shape), where=on_level)
+        predecessors = distances == level - 1
+        dependencies[predecessors] += (n_paths * adjacency.dot(coefficients.T).T)[predecessors]
+    return np.where(distances > 0, dependencies, 0.0).sum(axis=0)
+
+
+def _components(adjacency: scipy.sparse.csr_matrix) -> typ.List[np.ndarray]:
+    """Returns the nodes of each connected component."""
+    _, labels = scipy.sparse.csgraph.connected_components(adjacency, directed=False)
+    order = np.argsort(labels, kind='stable')
+    return np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)
+
+
+def _source_blocks(sources: np.ndarray, n: int) -> typ.Iterator[np.ndarray]:
+    """Splits sources into blocks, such that a (block x n) matrix stays below _BLOCK_ENTRIES entries."""
+    block_size = max(1, _BLOCK_ENTRIES // max(n, 1))
+    for start in range(0, len(sources), block_size):
+        yield sources[start:start + block_size]
+
+
+def _without_loops(adjacency: scipy.sparse.csr_matrix) -> scipy.sparse.csr_matrix:
+    if not adjacency.diagonal().any():
+        return adjacency
+    adjacency = adjacency.tolil()
+    adjacency.setdiag(0)
+    adjacency = adjacency.tocsr()
+    adjacency.eliminate_zeros()
+    return adjacency
@@ -22,16 +22,17 @@ def total_edges_per_time_step(graphs: typ.Iterable[vtna.graph.Graph]) -> typ.Lis
     Note that an edge of a local graph usually represents multiple, aggregated
     edges/interactions.
     """
-    return [sum(edge.get_count() for edge in graph.get_edges()) for graph in graphs]
+    return [sum(edge.get_count() for edge in graph.iter_edges()) for graph in graphs]
 
 
-def histogram_edges(edges: typ.List[typ.Tuple[int, int, int]], granularity: int=None) -> typ.List[int]:
+def histogram_edges(edges: vtna.data_import.TemporalEdges, granularity: int=None) -> typ.List[int]:
     """
     Returns the amount of singular edges as a list over timesteps defined through
     the provided granularity parameter.
 
     Args:
-        edges: A list of edge tuples, consisting of (timestamp, node1, node2)
+        edges: A list of edge tuples, consisting of (timestamp, node1, node2), or
+            a structured edge array
         granularity: The length of a timestep. If None, the smallest update
             delta will be inferred and used.
     """
@@ -45,7 +46,7 @@ def histogram_edges(edges: typ.List[typ.Tuple[int, int, int]], granularity: int=
 
 def nodes_per_time_step(graphs: typ.Iterable[vtna.graph.Graph]) -> typ.List[int]:
     """Returns amount of nodes per timestep in a list over all timesteps."""
-    return [len(set(node for edge in graph.get_edges() for node in edge.get_incident_nodes())) for graph in graphs]
+    return [len(set(node for edge in graph.iter_edges() for node in edge.get_incident_nodes())) for graph in graphs]
 
 
 def multi_step_interactions(graphs: typ.Iterable[vtna.graph.Graph], update_delta: int) \
@@ -61,17 +62,15 @@ def multi_step_interactions(graphs: typ.Iterable[vtna.graph.Graph], update_delta
     """
     timestamps = collections.defaultdict(list)
     for graph in graphs:
-        for edge in graph.get_edges():
-            node1, node2 = sorted(edge.get_incident_nodes())
-            timestamps[(node1, node2)].extend(edge.get_timestamps())
+        for edge in graph.iter_edges():
+            timestamps[edge.get_incident_nodes()].append(edge.get_timestamps_view())
     interactions = dict()
-    for edge in timestamps.keys():
-        interactions[edge] = [(timestamps[edge][0], timestamps[edge][0])]
-        for timestamp in timestamps[edge][1:]:
-            if interactions[edge][-1][1] == (timestamp - update_delta):
-                interactions[edge][-1] = (interactions[edge][-1][0], timestamp)
-            else:
-                interactions[edge].append((timestamp, timestamp))
+    for edge, views in timestamps.items():
+        edge_timestamps = np.concatenate(views)
+        # A new interval starts at every timestamp that does not directly follow its predecessor.
+        starts = np.flatnonzero(np.diff(edge_timestamps) != update_delta) + 1
+        interactions[edge] = list(zip(edge_timestamps[np.concatenate(([0], starts))].tolist(),
+                                      edge_timestamps[np.concatenate((starts - 1, [-1]))].tolist()))
     return interactions
 
 
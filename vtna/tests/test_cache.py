@@ -0,0 +1,216 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import vtna.cache
+import vtna.data_import as dimp
+import vtna.edge_store
+import vtna.graph
+import vtna.node_measure as nome
+
+
+class TestEdgeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.edge_path = os.path.join(self.tmp_dir, 'highschool_edges.ssv.gz')
+        shutil.copy('vtna/tests/data/highschool_edges.ssv.gz', self.edge_path)
+        self.cache = vtna.cache.EdgeCache(os.path.join(self.tmp_dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_load_edge_array(self):
+        cold = self.cache.load_edge_array(self.edge_path)
+        warm = self.cache.load_edge_array(self.edge_path)
+        self.assertIsInstance(warm, np.memmap, 'warm load is memory-mapped')
+        self.assertEqual(cold.tolist(), warm.tolist())
+        self.assertEqual(warm.dtype, dimp.EDGE_DTYPE)
+
+    def test_load_edge_store(self):
+        cold = self.cache.load_edge_store(self.edge_path, 20)
+        warm = self.cache.load_edge_store(self.edge_path, 20)
+        self.assertEqual(len(cold), 13)
+        self.assertEqual(len(warm), 13)
+        self.assertEqual(warm.get_step_timestamps(3).tolist(), cold.get_step_timestamps(3).tolist())
+        self.assertEqual(len(self.cache.load_edge_store(self.edge_path, 60)), 5, 'granularity is part of key')
+
+    def test_load_temporal_graph(self):
+        temp_graph = self.cache.load_temporal_graph(self.edge_path, None, 20)
+        temp_graph = self.cache.load_temporal_graph(self.edge_path, None, 20)
+        self.assertEqual(len(temp_graph), 13)
+        self.assertEqual(temp_graph[1].get_edge(122, 255).get_timestamps(), [1385982040])
+
+    def test_cached_graph_keeps_node_order(self):
+        expected = vtna.graph.TemporalGraph(dimp.read_edge_array(self.edge_path), None, 20).get_node_ids()
+        for _ in range(2):
+            temp_graph = self.cache.load_temporal_graph(self.edge_path, None, 20)
+            self.assertEqual(temp_graph.get_node_ids().tolist(), expected.tolist())
+        store_order = vtna.graph.TemporalGraph.from_edge_store(temp_graph.get_edge_store(), None).get_node_ids()
+        self.assertNotEqual(store_order.tolist(), expected.tolist())
+
+    def test_entry_without_node_order_is_rebuilt(self):
+        expected = self.cache.load_temporal_graph(self.edge_path, None, 20).get_node_ids()
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        for name in os.listdir(cache_dir):
+            if os.path.isfile(os.path.join(cache_dir, name, 'nodes.npy')):
+                os.remove(os.path.join(cache_dir, name, 'nodes.npy'))
+        temp_graph = self.cache.load_temporal_graph(self.edge_path, None, 20)
+        self.assertEqual(temp_graph.get_node_ids().tolist(), expected.tolist())
+        self.assertTrue(any(os.path.isfile(os.path.join(cache_dir, name, 'nodes.npy'))
+                            for name in os.listdir(cache_dir)), 'entry was written again')
+
+    def test_modified_source_is_reparsed(self):
+        edge_path = os.path.join(self.tmp_dir, 'highschool_edges.ssv')
+        shutil.copy('vtna/tests/data/highschool_edges.ssv', edge_path)
+        n_edges = len(self.cache.load_edge_array(edge_path))
+        with open(edge_path, 'a') as f:
+            f.write('\n1385982280 122 255\n')
+        edges = self.cache.load_edge_array(edge_path)
+        self.assertNotIsInstance(edges, np.memmap)
+        self.assertEqual(len(edges), n_edges + 1)
+
+    def test_invalidate(self):
+        self.cache.load_edge_store(self.edge_path, 20)
+        self.assertGreater(self.cache.get_size(), 0)
+        self.cache.invalidate(self.edge_path)
+        self.assertEqual(self.cache.get_size(), 0)
+        self.assertNotIsInstance(self.cache.load_edge_array(self.edge_path), np.memmap)
+
+    def test_eviction(self):
+        self.cache.load_edge_array(self.edge_path)
+        max_bytes = self.cache.get_size()
+        cache = vtna.cache.EdgeCache(os.path.join(self.tmp_dir, 'cache'), max_bytes=max_bytes)
+        cache.load_edge_store(self.edge_path, 20)
+        self.assertLessEqual(cache.get_size(), max_bytes)
+        self.assertNotIsInstance(cache.load_edge_array(self.edge_path), np.memmap, 'oldest entry was evicted')
+
+
+class TestEdgeStorePersistence(unittest.TestCase):
+    def test_save_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            store = vtna.edge_store.EdgeStore([40, 60, 100, 180], [1, 1, 3, 3], [2, 2, 4, 4], 40)
+            store.save(tmp_dir)
+            loaded = vtna.edge_store.EdgeStore.load(tmp_dir)
+            self.assertEqual(len(loaded), 4)
+            self.assertEqual(loaded.get_granularity(), 40)
+            self.assertEqual(loaded.get_earliest(), 40)
+            self.assertEqual([c.tolist() for c in loaded.get_columns()], [c.tolist() for c in store.get_columns()])
+            temp_graph = vtna.graph.TemporalGraph.from_edge_store(loaded, None)
+            self.assertEqual(temp_graph[0].get_edge(1, 2).get_count(), 2)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+class TestMeasureCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        self.temp_graph = vtna.graph.TemporalGraph(self.edges, None, 20)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_memoized(self):
+        cache = vtna.cache.MeasureCache()
+        measure = cache.get(nome.GlobalBetweennessCentrality, self.temp_graph)
+        self.assertIs(cache.get(nome.GlobalBetweennessCentrality, self.temp_graph), measure)
+        self.assertIsNot(cache.get(nome.GlobalBetweennessCentrality, self.temp_graph, backend='sparse'), measure)
+        self.assertIs(cache.get(nome.LocalDegreeCentrality, self.temp_graph, n_workers=1),
+                      cache.get(nome.LocalDegreeCentrality, self.temp_graph), 'n_workers is not part of key')
+        self.assertEqual(len(cache), 3)
+
+    def test_parameter_types(self):
+        cache = vtna.cache.MeasureCache()
+        measure = cache.get(nome.GlobalBetweennessCentrality, self.temp_graph, backend='sparse')
+        self.assertIs(cache.get(nome.GlobalBetweennessCentrality, self.temp_graph, backend=np.str_('sparse')), measure)
+        with self.assertRaises(TypeError):
+            cache.get(nome.GlobalBetweennessCentrality, self.temp_graph, backend=lambda graph: graph)
+        self.assertIs(cache.get(nome.LocalDegreeCentrality, self.temp_graph, n_workers=np.int64(2)),
+                      cache.get(nome.LocalDegreeCentrality, self.temp_graph), 'execution parameters are not checked')
+
+    def test_invalidated_on_change(self):
+        cache = vtna.cache.MeasureCache()
+        version = self.temp_graph.get_version()
+        measure = cache.get(nome.LocalDegreeCentrality, self.temp_graph)
+        self.temp_graph.set_cumulative(True)
+        self.assertGreater(self.temp_graph.get_version(), version)
+        cumulative = cache.get(nome.LocalDegreeCentrality, self.temp_graph)
+        self.assertIsNot(cumulative, measure)
+        self.temp_graph.set_cumulative(False)
+        self.assertIs(cache.get(nome.LocalDegreeCentrality, self.temp_graph), measure, 'same fingerprint again')
+        self.temp_graph.append_edges([(1386000000, 122, 255)])
+        appended = cache.get(nome.LocalDegreeCentrality, self.temp_graph)
+        self.assertEqual(len(appended[122]), len(self.temp_graph))
+
+    def test_equal_graph(self):
+        cache = vtna.cache.MeasureCache()
+        measure = cache.get(nome.GlobalDegreeCentrality, self.temp_graph)
+        other_graph = vtna.graph.TemporalGraph(self.edges, None, 20, columnar=True)
+        other = cache.get(nome.GlobalDegreeCentrality, other_graph)
+        self.assertEqual(other[122], measure[122])
+        other.add_to_graph()
+        self.assertEqual(other_graph.get_node(122).get_global_attribute(other.get_name()), measure[122])
+        with self.assertRaises(KeyError):
+            self.temp_graph.get_node(122).get_global_attribute(other.get_name())
+
+    def test_equal_graph_with_other_node_order(self):
+        cache_dir = os.path.join(self.tmp_dir, 'measures')
+        first = vtna.graph.TemporalGraph([(0, 9, 8), (0, 1, 2)], None, 20)
+        second = vtna.graph.TemporalGraph([(0, 1, 2), (0, 9, 8)], None, 20)
+        self.assertEqual(first.get_fingerprint(), second.get_fingerprint())
+        measure = vtna.cache.MeasureCache(cache_dir=cache_dir).get(nome.LocalDegreeCentrality, first,
+                                                                   backend='sparse')
+        self.assertEqual(measure.get_node_ids().tolist(), [8, 9, 1, 2])
+        self.assertEqual(measure.get_measure_matrix().shape, (4, 1))
+        memory_cache = vtna.cache.MeasureCache()
+        memory_cache.get(nome.LocalDegreeCentrality, first, backend='sparse')
+        # Loaded from disk and copied in memory
+        for cache in (vtna.cache.MeasureCache(cache_dir=cache_dir), memory_cache):
+            other = cache.get(nome.LocalDegreeCentrality, second, backend='sparse')
+            self.assertEqual(other.get_node_ids().tolist(), second.get_node_ids().tolist())
+            for row, node_id in enumerate(second.get_node_ids().tolist()):
+                self.assertEqual(other.get_measure_matrix()[row].tolist(), other[node_id])
+        self.assertEqual(measure.get_node_ids().tolist(), [8, 9, 1, 2], 'cached measure is not changed')
+
+    def test_lru_eviction(self):
+        cache = vtna.cache.MeasureCache(max_entries=1)
+        measure = cache.get(nome.GlobalDegreeCentrality, self.temp_graph)
+        cache.get(nome.GlobalClosenessCentrality, self.temp_graph)
+        self.assertEqual(len(cache), 1)
+        self.assertIsNot(cache.get(nome.GlobalDegreeCentrality, self.temp_graph), measure)
+
+    def test_disk_store(self):
+        cache_dir = os.path.join(self.tmp_dir, 'measures')
+        measure = vtna.cache.MeasureCache(cache_dir=cache_dir).get(nome.LocalBetweennessCentrality, self.temp_graph,
+                                                                   backend='sparse')
+        cache = vtna.cache.MeasureCache(cache_dir=cache_dir)
+        loaded = cache.get(nome.LocalBetweennessCentrality, self.temp_graph, backend='sparse')
+        self.assertIsNot(loaded, measure)
+        self.assertEqual(loaded[122], measure[122])
+        self.assertEqual(loaded.get_error_bounds(), measure.get_error_bounds())
+        loaded.add_to_graph()
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_disk_store_eviction(self):
+        cache_dir = os.path.join(self.tmp_dir, 'measures')
+        cache = vtna.cache.MeasureCache(max_entries=2, cache_dir=cache_dir)
+        files = dict()
+        for mtime, measure in enumerate((nome.GlobalDegreeCentrality, nome.GlobalClosenessCentrality), start=1):
+            before = set(os.listdir(cache_dir))
+            cache.get(measure, self.temp_graph)
+            files[measure], = set(os.listdir(cache_dir)).difference(before)
+            # Distinct modification times, independent of the resolution of the file system
+            os.utime(os.path.join(cache_dir, files[measure]), (mtime, mtime))
+        # Loading from disk marks the degree as recently used, so the closeness is evicted.
+        vtna.cache.MeasureCache(max_entries=2, cache_dir=cache_dir).get(nome.GlobalDegreeCentrality, self.temp_graph)
+        cache.get(nome.GlobalBetweennessCentrality, self.temp_graph)
+        remaining = os.listdir(cache_dir)
+        self.assertEqual(len(remaining), 2)
+        self.assertIn(files[nome.GlobalDegreeCentrality], remaining)
+        self.assertNotIn(files[nome.GlobalClosenessCentrality], remaining)
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 import vtna.data_import as dimp
 
 
@@ -11,6 +13,26 @@ class TestEdgeListUtilities(unittest.TestCase):
         super(TestEdgeListUtilities, cls).setUpClass()
         cls.edges = [(40, 1, 2), (60, 1, 2), (100, 3, 4), (100, 1, 2), (180, 3, 4)]
 
+    def test_as_edge_array_with_invalid_shape(self):
+        self.assertEqual(len(dimp.as_edge_array([])), 0)
+        with self.assertRaises(ValueError):
+            dimp.as_edge_array([0, 1, 2, 3, 4, 5])
+        with self.assertRaises(ValueError):
+            dimp.as_edge_array([(0, 1), (20, 2)])
+        with self.assertRaises(ValueError):
+            dimp.as_edge_array([(0, 1, 2, 3)])
+
+    def test_as_edge_array_with_other_dtype(self):
+        edges = np.array([(1, 2, 40), (3, 4, 60)], dtype=[('node1', np.int32), ('node2', np.int32),
+                                                           ('timestamp', np.uint32)])
+        self.assertEqual(dimp.as_edge_array(edges).tolist(), [(40, 1, 2), (60, 3, 4)])
+        self.assertEqual(dimp.as_edge_array(edges).dtype, dimp.EDGE_DTYPE)
+        with self.assertRaises(ValueError):
+            dimp.as_edge_array(np.zeros(2, dtype=[('time', np.int64), ('node1', np.int64), ('node2', np.int64)]))
+        with self.assertRaises(ValueError):
+            dimp.as_edge_array(np.zeros(2, dtype=[('timestamp', np.float64), ('node1', np.int64),
+                                                  ('node2', np.int64)]))
+
     def test_get_time_interval_of_edges(self):
         earliest, latest = dimp.get_time_interval_of_edges(TestEdgeListUtilities.edges)
         self.assertEqual(earliest, 40)
@@ -37,6 +59,37 @@ class TestEdgeListUtilities(unittest.TestCase):
         self.assertEqual(len(buckets[3]), 1)
 
 
+class TestEdgeArrayUtilities(unittest.TestCase):
+    edges = None
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestEdgeArrayUtilities, cls).setUpClass()
+        cls.edges = dimp.as_edge_array([(40, 1, 2), (60, 1, 2), (100, 3, 4), (100, 1, 2), (180, 3, 4)])
+
+    def test_as_edge_array(self):
+        self.assertEqual(TestEdgeArrayUtilities.edges.dtype, dimp.EDGE_DTYPE)
+        self.assertEqual(TestEdgeArrayUtilities.edges.tolist()[2], (100, 3, 4))
+        self.assertIs(dimp.as_edge_array(TestEdgeArrayUtilities.edges), TestEdgeArrayUtilities.edges)
+
+    def test_get_time_interval_of_edges(self):
+        earliest, latest = dimp.get_time_interval_of_edges(TestEdgeArrayUtilities.edges)
+        self.assertEqual(earliest, 40)
+        self.assertEqual(latest, 180)
+
+    def test_get_time_interval_of_edges_empty_parameter(self):
+        with self.assertRaises(ValueError):
+            dimp.get_time_interval_of_edges(dimp.as_edge_array([]))
+
+    def test_infer_update_delta(self):
+        self.assertEqual(dimp.infer_update_delta(TestEdgeArrayUtilities.edges), 20)
+
+    def test_group_edges_by_granularity(self):
+        buckets = dimp.group_edges_by_granularity(TestEdgeArrayUtilities.edges, 40)
+        self.assertEqual([len(bucket) for bucket in buckets], [2, 2, 0, 1])
+        self.assertEqual(buckets[1].tolist(), [(100, 3, 4), (100, 1, 2)], 'keeps order of edges')
+
+
 class TestImportFromDifferentSources(unittest.TestCase):
     def test_import_metadata_from_raw_text(self):
         meta = dimp.MetadataTable('vtna/tests/data/highschool_meta.tsv')
@@ -56,6 +109,18 @@ class TestImportFromDifferentSources(unittest.TestCase):
         edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv.gz')
         self.__test_imported_edge_data(edges)
 
+    def test_import_edge_array_from_gz(self):
+        edges = dimp.read_edge_array('vtna/tests/data/highschool_edges.ssv.gz')
+        self.assertEqual(edges.dtype, dimp.EDGE_DTYPE)
+        self.assertEqual(edges.tolist(), dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv'))
+        self.__test_imported_edge_data(edges)
+
+    def test_iter_edge_blocks(self):
+        blocks = list(dimp.iter_edge_blocks('vtna/tests/data/highschool_edges.ssv.bz2', chunk_size=128))
+        self.assertEqual([len(block) for block in blocks], [128, 128, 128, 116])
+        self.assertEqual([edge for block in blocks for edge in block.tolist()],
+                         dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv'))
+
     def __test_imported_edge_data(self, edges):
         earliest, latest = dimp.get_time_interval_of_edges(edges)
         update_delta = dimp.infer_update_delta(edges)
@@ -150,3 +215,21 @@ class TestMetadataTableFunctionality(unittest.TestCase):
 
     def test_items(self):
         self.assertEqual(len(TestMetadataTableFunctionality.meta.items()), 114)
+
+    def test_as_dicts(self):
+        meta = TestMetadataTableFunctionality.meta
+        self.assertEqual(meta.as_dicts(), dict((key, meta[key]) for key in meta.keys()))
+        self.assertEqual(list(meta.as_dicts([72, 487]).items()), [(72, meta[72]), (487, meta[487])])
+
+    def test_as_dicts_with_not_existing_key(self):
+        with self.assertRaises(KeyError) as context:
+            TestMetadataTableFunctionality.meta.as_dicts([72, 73])
+        self.assertEqual(context.exception.args[0], 73)
+
+    def test_as_codes(self):
+        meta = TestMetadataTableFunctionality.meta
+        codes = meta.as_codes([72, 487])
+        self.assertEqual(sorted(codes.keys()), ['1', '2'])
+        categories = meta.get_categories('1')
+        self.assertEqual([categories[code] for code in codes['1'].tolist()], [meta[72]['1'], meta[487]['1']])
+        self.assertEqual(len(meta.as_codes()['2']), 114)
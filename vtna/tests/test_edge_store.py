@@ -0,0 +1,270 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+import vtna.edge_store
+
+
+class TestEdgeStore(unittest.TestCase):
+    store = None
+
+    @classmethod
+    def setUpClass(cls):
+        # time steps of width 40, starting at 40:
+        # 0: (1, 2) at 40, 60
+        # 1: (3, 4) at 100, (1, 2) at 100
+        # 2: -
+        # 3: (3, 4) at 180
+        timestamps = [40, 60, 100, 100, 180]
+        node1 = [1, 2, 4, 1, 3]
+        node2 = [2, 1, 3, 2, 4]
+        cls.store = vtna.edge_store.EdgeStore(timestamps, node1, node2, 40)
+
+    def test_number_of_time_steps(self):
+        self.assertEqual(len(TestEdgeStore.store), 4)
+        self.assertEqual(TestEdgeStore.store.get_n_interactions(), 5)
+        self.assertEqual(TestEdgeStore.store.get_n_edges(), 4)
+
+    def test_edges_are_sorted_by_incident_nodes(self):
+        node1, node2 = TestEdgeStore.store.get_edge_nodes(1)
+        self.assertEqual(node1.tolist(), [1, 3])
+        self.assertEqual(node2.tolist(), [2, 4])
+        self.assertEqual(TestEdgeStore.store.get_edge_counts(0).tolist(), [2])
+
+    def test_empty_time_step(self):
+        lo, hi = TestEdgeStore.store.get_edge_range(2)
+        self.assertEqual(lo, hi)
+        self.assertEqual(len(TestEdgeStore.store.get_step_timestamps(2)), 0)
+
+    def test_find_edge(self):
+        store = TestEdgeStore.store
+        idx = store.find_edge(0, 2, 1)
+        self.assertEqual(store.get_edge_incident_nodes(idx), (1, 2))
+        self.assertEqual(store.get_edge_timestamps(idx).tolist(), [40, 60])
+        self.assertEqual(store.find_edge(0, 3, 4), -1)
+        self.assertEqual(store.find_edge(2, 1, 2), -1)
+
+    def test_timestamps_are_read_only_views(self):
+        timestamps = TestEdgeStore.store.get_edge_timestamps(0)
+        with self.assertRaises(ValueError):
+            timestamps[0] = 0
+
+    def test_get_columns(self):
+        timestamps, node1, node2 = TestEdgeStore.store.get_columns()
+        self.assertEqual(timestamps.tolist(), [40, 60, 100, 100, 180])
+        self.assertEqual(node1.tolist(), [1, 1, 1, 3, 3])
+        self.assertEqual(node2.tolist(), [2, 2, 2, 4, 4])
+        self.assertEqual(TestEdgeStore.store.get_node_ids().tolist(), [1, 2, 3, 4])
+
+    def test_append(self):
+        store = vtna.edge_store.EdgeStore([40, 60, 100, 180], [1, 1, 3, 3], [2, 2, 4, 4], 40)
+        self.assertEqual(store.append([190, 200, 250], [3, 1, 5], [4, 2, 6]), 3)
+        expected = vtna.edge_store.EdgeStore([40, 60, 100, 180, 190, 200, 250], [1, 1, 3, 3, 3, 1, 5],
+                                             [2, 2, 4, 4, 4, 2, 6], 40)
+        self.assertEqual(len(store), 6)
+        self.assertEqual([c.tolist() for c in store.get_columns()], [c.tolist() for c in expected.get_columns()])
+        self.assertEqual(store.get_edge_counts(3).tolist(), [2])
+        with self.assertRaises(ValueError):
+            store.append([180], [1], [2])
+
+    def test_append_reuses_capacity(self):
+        store = vtna.edge_store.EdgeStore([0, 10], [1, 1], [2, 3], 20)
+        earlier = store.get_step_timestamps(0)
+        buffers = list()
+        for timestamp in range(20, 2020, 10):
+            store.append([timestamp], [timestamp % 7], [8])
+            buffers.append(store.get_columns()[0].base)
+        self.assertLessEqual(len(set(id(buffer) for buffer in buffers)), 9, 'capacity grows geometrically')
+        self.assertEqual(earlier.tolist(), [0, 10])
+        self.assertEqual(store.get_n_interactions(), 202)
+        expected = vtna.edge_store.EdgeStore(np.arange(0, 2020, 10), [1, 1] + [t % 7 for t in range(20, 2020, 10)],
+                                             [2, 3] + [8] * 200, 20)
+        self.assertEqual(store.fingerprint(), expected.fingerprint())
+
+    def test_empty_columns(self):
+        with self.assertRaises(ValueError):
+            vtna.edge_store.EdgeStore(np.array([]), np.array([]), np.array([]), 20)
+
+
+class TestCumulativeIndex(unittest.TestCase):
+    def test_prefix_views(self):
+        # (1, 2) at steps 0, 1, 3 and (3, 4) at steps 1, 3
+        store = vtna.edge_store.EdgeStore([40, 60, 100, 100, 180, 190], [1, 2, 4, 1, 3, 1], [2, 1, 3, 2, 4, 2], 40)
+        index = store.get_cumulative_index()
+        self.assertIs(index, store.get_cumulative_index(), 'index is shared')
+        self.assertEqual([index.get_n_pairs(t) for t in range(4)], [1, 2, 2, 2])
+        pairs = index.get_pairs(2)
+        self.assertEqual([n.tolist() for n in index.get_pair_nodes(pairs)], [[1, 3], [2, 4]])
+        self.assertEqual(index.get_counts(pairs, 2).tolist(), [3, 1])
+        self.assertEqual(index.get_counts(pairs, 3).tolist(), [4, 2])
+        pair = index.find_pair(1, 2, 1)
+        self.assertEqual(index.get_pair_timestamps(pair, 3).tolist(), [40, 60, 100])
+        self.assertEqual(index.find_pair(0, 3, 4), -1)
+
+    def test_index_is_extended_after_append(self):
+        store = vtna.edge_store.EdgeStore([40, 60], [1, 1], [2, 2], 40)
+        index = store.get_cumulative_index()
+        timestamps = index.get_pair_timestamps(0, 2)
+        store.append([100, 90], [1, 3], [2, 4])
+        self.assertIs(store.get_cumulative_index(), index)
+        self.assertEqual(index.get_counts(np.array([0]), 1).tolist(), [3])
+        self.assertEqual([n.tolist() for n in index.get_pair_nodes(index.get_pairs(1))], [[1, 3], [2, 4]])
+        self.assertEqual(timestamps.tolist(), [40, 60], 'views of earlier time steps stay valid')
+
+    def test_appending_matches_building(self):
+        rng = np.random.RandomState(11)
+        timestamps = np.sort(rng.randint(0, 300, size=3000)) * 10
+        node1, node2 = rng.randint(0, 30, size=3000), rng.randint(0, 30, size=3000)
+        store = vtna.edge_store.EdgeStore(timestamps[:100], node1[:100], node2[:100], 60, earliest=0)
+        index = store.get_cumulative_index()
+        # Blocks split time steps, so that appending changes the last time step.
+        for lo, hi in zip(range(100, 3000, 290), range(390, 3290, 290)):
+            store.append(timestamps[lo:hi], node1[lo:hi], node2[lo:hi])
+        expected = vtna.edge_store.CumulativeIndex(store)
+        self.assertIs(store.get_cumulative_index(), index)
+        self.assertEqual(len(index), len(expected))
+        for time_step in range(len(expected)):
+            pairs = expected.get_pairs(time_step)
+            self.assertEqual(index.get_pairs(time_step).tolist(), pairs.tolist())
+            self.assertEqual([n.tolist() for n in index.get_pair_nodes(pairs)],
+                             [n.tolist() for n in expected.get_pair_nodes(pairs)])
+            self.assertEqual(index.get_counts(pairs, time_step).tolist(),
+                             expected.get_counts(pairs, time_step).tolist())
+        for pair, count in enumerate(expected.get_counts(expected.get_pairs(len(expected) - 1),
+                                                         len(expected) - 1).tolist()):
+            self.assertEqual(index.get_pair_timestamps(pair, count).tolist(),
+                             expected.get_pair_timestamps(pair, count).tolist())
+        self.assertLess(index.nbytes(), 4 * expected.nbytes())
+
+
+class TestEdgeStoreFromBlocks(unittest.TestCase):
+    columns = None
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.RandomState(42)
+        timestamps = np.sort(rng.randint(0, 50, size=500)) * 20
+        node1 = rng.randint(0, 10, size=500)
+        node2 = rng.randint(0, 10, size=500)
+        cls.columns = (timestamps, node1, node2)
+
+    def assertSameStore(self, store1: vtna.edge_store.EdgeStore, store2: vtna.edge_store.EdgeStore):
+        self.assertEqual(len(store1), len(store2))
+        self.assertEqual(store1.get_n_edges(), store2.get_n_edges())
+        for column1, column2 in zip(store1.get_columns(), store2.get_columns()):
+            self.assertEqual(column1.tolist(), column2.tolist())
+
+    def test_blocks_in_time_order(self):
+        timestamps, node1, node2 = TestEdgeStoreFromBlocks.columns
+        store = vtna.edge_store.EdgeStore(timestamps, node1, node2, 60)
+        blocks = [(timestamps[i:i + 64], node1[i:i + 64], node2[i:i + 64]) for i in range(0, 500, 64)]
+        self.assertSameStore(vtna.edge_store.EdgeStore.from_blocks(blocks, 60), store)
+
+    def test_shuffled_blocks_with_earliest(self):
+        timestamps, node1, node2 = TestEdgeStoreFromBlocks.columns
+        store = vtna.edge_store.EdgeStore(timestamps, node1, node2, 60)
+        order = np.random.RandomState(0).permutation(500)
+        blocks = [(timestamps[order[i:i + 100]], node1[order[i:i + 100]], node2[order[i:i + 100]])
+                  for i in range(0, 500, 100)]
+        self.assertSameStore(vtna.edge_store.EdgeStore.from_blocks(blocks, 60, earliest=0), store)
+
+    def test_block_earlier_than_first_block(self):
+        blocks = [([100, 120], [1, 2], [2, 3]), ([80], [1], [2])]
+        with self.assertRaises(ValueError):
+            vtna.edge_store.EdgeStore.from_blocks(blocks, 20)
+
+    def test_no_blocks(self):
+        with self.assertRaises(ValueError):
+            vtna.edge_store.EdgeStore.from_blocks([], 20)
+
+
+class TestRegranularize(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.timestamps = np.sort(rng.randint(0, 200, size=1000)) * 20
+        self.node1 = rng.randint(0, 15, size=1000)
+        self.node2 = rng.randint(0, 15, size=1000)
+        self.store = vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, 60)
+
+    def assertRegranularized(self, granularity: int):
+        expected = vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, granularity)
+        store = self.store.regranularize(granularity)
+        self.assertEqual(store.get_granularity(), granularity)
+        self.assertEqual(len(store), len(expected))
+        self.assertEqual(store.get_edge_steps().tolist(), expected.get_edge_steps().tolist())
+        for column1, column2 in zip(store.get_columns(), expected.get_columns()):
+            self.assertEqual(column1.tolist(), column2.tolist())
+        self.assertEqual(store.fingerprint(), expected.fingerprint())
+
+    def test_multiple_granularity(self):
+        self.assertRegranularized(180)
+
+    def test_other_granularity(self):
+        self.assertRegranularized(100)
+        self.assertRegranularized(20)
+
+    def test_original_is_unchanged(self):
+        columns = [column.tolist() for column in self.store.get_columns()]
+        self.store.regranularize(120)
+        self.assertEqual(len(self.store), len(vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, 60)))
+        self.assertEqual([column.tolist() for column in self.store.get_columns()], columns)
+
+    def test_invalid_granularity(self):
+        with self.assertRaises(ValueError):
+            self.store.regranularize(0)
+
+
+class TestTimePyramid(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.timestamps = np.sort(rng.randint(0, 400, size=2000)) * 20
+        self.node1 = rng.randint(0, 15, size=2000)
+        self.node2 = rng.randint(0, 15, size=2000)
+        self.store = vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, 20)
+
+    def assertSameStore(self, store: vtna.edge_store.EdgeStore, granularity: int):
+        expected = vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, granularity)
+        self.assertEqual(store.get_granularity(), granularity)
+        self.assertEqual(store.fingerprint(), expected.fingerprint())
+
+    def test_power_of_two_levels(self):
+        pyramid = vtna.edge_store.TimePyramid(self.store)
+        granularities = pyramid.get_granularities()
+        self.assertEqual(granularities[:3], [20, 40, 80])
+        self.assertEqual(pyramid.get_n_timesteps(granularities[-1]), 1)
+        for granularity in granularities:
+            self.assertSameStore(pyramid.get_store(granularity), granularity)
+
+    def test_edge_counts(self):
+        pyramid = vtna.edge_store.TimePyramid(self.store, [60, 600, 3000])
+        expected = vtna.edge_store.EdgeStore(self.timestamps, self.node1, self.node2, 600)
+        self.assertEqual(pyramid.get_n_timesteps(600), len(expected))
+        for time_step in range(len(expected)):
+            for array1, array2 in zip(pyramid.get_edge_nodes(600, time_step), expected.get_edge_nodes(time_step)):
+                self.assertEqual(array1.tolist(), array2.tolist())
+            self.assertEqual(pyramid.get_edge_counts(600, time_step).tolist(),
+                             expected.get_edge_counts(time_step).tolist())
+
+    def test_other_granularities(self):
+        pyramid = vtna.edge_store.TimePyramid(self.store, [60, 600])
+        for granularity in (1200, 180, 50):
+            self.assertSameStore(pyramid.get_store(granularity), granularity)
+        with self.assertRaises(KeyError):
+            pyramid.get_edge_counts(1200, 0)
+
+    def test_invalid_granularities(self):
+        with self.assertRaises(ValueError):
+            vtna.edge_store.TimePyramid(self.store, [60, 100])
+        with self.assertRaises(ValueError):
+            vtna.edge_store.TimePyramid(self.store, [30])
+
+    def test_save_load(self):
+        pyramid = vtna.edge_store.TimePyramid(self.store, [40, 200])
+        with tempfile.TemporaryDirectory() as directory:
+            pyramid.save(directory)
+            loaded = vtna.edge_store.TimePyramid.load(directory)
+            self.assertEqual(loaded.get_granularities(), [20, 40, 200])
+            for granularity in (20, 40, 200):
+                self.assertSameStore(loaded.get_store(granularity), granularity)
+            del loaded
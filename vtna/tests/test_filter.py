@@ -1,7 +1,9 @@
 import unittest
 
+import vtna.data_import
 import vtna.graph
 import vtna.filter
+import vtna.node_measure
 
 
 class TestFilterCreation(unittest.TestCase):
@@ -98,3 +100,133 @@ class TestFilterCreation(unittest.TestCase):
         def test_node_filter_subtract_bad_type(self):
             with self.assertRaises(TypeError):
                 vtna.filter.NodeFilter(lambda n: True) - 'false type'
+
+
+class TestFilterOnGraph(unittest.TestCase):
+    temp_graph = None
+    class_order = None
+
+    @classmethod
+    def setUpClass(cls):
+        meta = vtna.data_import.MetadataTable('vtna/tests/data/highschool_meta.tsv')
+        edges = vtna.data_import.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.temp_graph = vtna.graph.TemporalGraph(edges, meta, 20)
+        cls.temp_graph.add_measure_attribute('x', 'I', 'global', dict(
+            (node.get_id(), float(node.get_id() % 7)) for node in cls.temp_graph.get_nodes()))
+        cls.class_order = sorted(meta.get_categories('1'))
+
+    def assertSameNodes(self, node_filter: vtna.filter.NodeFilter):
+        nodes = TestFilterOnGraph.temp_graph.get_nodes()
+        expected = [node.get_id() for node in node_filter(nodes)]
+        self.assertEqual(node_filter.mask(TestFilterOnGraph.temp_graph).tolist(),
+                         [node.get_id() in expected for node in nodes])
+        self.assertEqual([node.get_id() for node in node_filter.apply(TestFilterOnGraph.temp_graph)], expected)
+        self.assertTrue(0 < len(expected) < len(nodes))
+
+    def test_predicates(self):
+        order = TestFilterOnGraph.class_order
+        for pred in (vtna.filter.categorical_attribute_equal('2', 'F'),
+                     vtna.filter.ordinal_attribute_greater_than_equal('1', order[3], order),
+                     vtna.filter.ordinal_attribute_greater_than('1', order[3], order),
+                     vtna.filter.interval_attribute_greater_than_equal('x', 3.0),
+                     vtna.filter.interval_attribute_greater_than('x', 3.0)):
+            self.assertSameNodes(vtna.filter.NodeFilter(pred))
+
+    def test_expression_tree(self):
+        order = TestFilterOnGraph.class_order
+        female = vtna.filter.NodeFilter(vtna.filter.categorical_attribute_equal('2', 'F'))
+        senior = vtna.filter.NodeFilter(vtna.filter.ordinal_attribute_greater_than('1', order[4], order))
+        large_x = vtna.filter.NodeFilter(vtna.filter.interval_attribute_greater_than_equal('x', 5.0))
+        self.assertSameNodes((female * senior) + large_x)
+        self.assertSameNodes(-(female - large_x) * senior)
+
+    def test_callable_fallback(self):
+        even = vtna.filter.NodeFilter(lambda n: n.get_id() % 2 == 0)
+        female = vtna.filter.NodeFilter(vtna.filter.categorical_attribute_equal('2', 'F'))
+        self.assertSameNodes(even * female)
+
+    def test_missing_attribute(self):
+        node_filter = vtna.filter.NodeFilter(vtna.filter.categorical_attribute_equal('club', 'chess'))
+        with self.assertRaises(KeyError):
+            node_filter.mask(TestFilterOnGraph.temp_graph)
+
+
+class TestLocalFilter(unittest.TestCase):
+    def setUp(self):
+        edges = vtna.data_import.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        self.temp_graph = vtna.graph.TemporalGraph(edges, None, 20)
+        node_ids = self.temp_graph.get_node_ids().tolist()
+        n_timesteps = len(self.temp_graph)
+        self.temp_graph.add_measure_attribute('x', 'I', 'local', dict(
+            (node_id, [(node_id * (t + 1)) % 10 / 10 for t in range(n_timesteps)]) for node_id in node_ids))
+        self.temp_graph.add_measure_attribute('level', 'O', 'local', dict(
+            (node_id, [['low', 'mid', 'high'][(node_id + t) % 3] for t in range(n_timesteps)])
+            for node_id in node_ids))
+        self.order = ['low', 'mid', 'high']
+
+    def assertSameNodes(self, node_filter: vtna.filter.NodeFilter):
+        nodes = self.temp_graph.get_nodes()
+        matrix = node_filter.matrix(self.temp_graph)
+        self.assertEqual(matrix.shape, (len(nodes), len(self.temp_graph)))
+        for time_step in range(len(self.temp_graph)):
+            expected = [node.get_id() for node in node_filter(nodes, time_step)]
+            self.assertEqual(node_filter.mask(self.temp_graph, time_step).tolist(),
+                             [node.get_id() in expected for node in nodes])
+            self.assertEqual([node.get_id() for node in node_filter.apply(self.temp_graph, time_step)], expected)
+
+    def test_local_predicates(self):
+        for pred in (vtna.filter.local_interval_attribute_greater_than('x', 0.2),
+                     vtna.filter.local_interval_attribute_greater_than_equal('x', 0.2),
+                     vtna.filter.local_categorical_attribute_equal('level', 'mid'),
+                     vtna.filter.local_ordinal_attribute_greater_than('level', 'low', self.order),
+                     vtna.filter.local_ordinal_attribute_greater_than_equal('level', 'mid', self.order)):
+            self.assertSameNodes(vtna.filter.NodeFilter(pred))
+
+    def test_combined_with_global_predicates(self):
+        large_x = vtna.filter.NodeFilter(vtna.filter.local_interval_attribute_greater_than('x', 0.2))
+        high = vtna.filter.NodeFilter(vtna.filter.local_categorical_attribute_equal('level', 'high'))
+        even = vtna.filter.NodeFilter(lambda n: n.get_id() % 2 == 0)
+        self.assertSameNodes((large_x - high) + even)
+        self.assertSameNodes(-(large_x * even))
+
+    def test_matrix_is_cached(self):
+        node_filter = vtna.filter.NodeFilter(vtna.filter.local_interval_attribute_greater_than('x', 0.2))
+        matrix = node_filter.matrix(self.temp_graph)
+        self.assertIs(node_filter.matrix(self.temp_graph), matrix)
+        node = self.temp_graph.get_nodes()[0]
+        node.update_local_attribute('x', [1.0] * len(self.temp_graph))
+        self.assertTrue(node_filter.mask(self.temp_graph, 0)[0])
+        self.temp_graph.append_edges([(1385984000, 122, 255)])
+        self.assertEqual(node_filter.matrix(self.temp_graph).shape[1], len(self.temp_graph))
+
+    def test_missing_values_after_append(self):
+        n_timesteps = len(self.temp_graph)
+        self.temp_graph.append_edges([(1385984000, 122, 255), (1385985000, 122, 255)])
+        self.temp_graph.get_nodes()[0].update_local_attribute('level', ['high'] * len(self.temp_graph))
+        for pred in (vtna.filter.local_interval_attribute_greater_than('x', 0.2),
+                     vtna.filter.local_interval_attribute_greater_than_equal('x', 0.2),
+                     vtna.filter.local_categorical_attribute_equal('level', 'high'),
+                     vtna.filter.local_ordinal_attribute_greater_than('level', 'low', self.order),
+                     vtna.filter.local_ordinal_attribute_greater_than_equal('level', 'mid', self.order)):
+            node_filter = vtna.filter.NodeFilter(pred)
+            self.assertSameNodes(node_filter)
+            matrix = node_filter.matrix(self.temp_graph)
+            self.assertTrue(matrix[:, :n_timesteps].any())
+            self.assertEqual(matrix[1:, n_timesteps:].sum(), 0)
+
+    def test_local_degree_after_append(self):
+        vtna.node_measure.LocalDegreeCentrality(self.temp_graph).add_to_graph()
+        self.temp_graph.append_edges([(1385984000, 122, 255)])
+        node_filter = vtna.filter.NodeFilter(
+            vtna.filter.local_interval_attribute_greater_than('Local Degree Centrality', 1))
+        self.assertTrue(node_filter.mask(self.temp_graph, 0).any())
+        self.assertFalse(node_filter.mask(self.temp_graph, len(self.temp_graph) - 1).any())
+
+    def test_time_step_required(self):
+        node_filter = vtna.filter.NodeFilter(vtna.filter.local_interval_attribute_greater_than('x', 0.2))
+        self.assertTrue(node_filter.is_local())
+        self.assertFalse(vtna.filter.NodeFilter(lambda n: True).is_local())
+        with self.assertRaises(ValueError):
+            node_filter.mask(self.temp_graph)
+        with self.assertRaises(ValueError):
+            list(node_filter(self.temp_graph.get_nodes()))
@@ -1,7 +1,13 @@
+import array
+import io
 import unittest
 
+import numpy as np
+
 import vtna.data_import as dimp
+import vtna.edge_store
 import vtna.graph as graph
+import vtna.utility
 
 
 class TestGraphCreation(unittest.TestCase):
@@ -36,6 +42,16 @@ class TestGraphCreation(unittest.TestCase):
                              'Check timestamps of edge')
             self.assertEqual(TestGraphCreation.temp_graph[1].get_edge(122, 255).get_incident_nodes(), (122, 255),
                              'Check incident nodes of edge')
+            with self.assertRaises(KeyError):
+                TestGraphCreation.temp_graph[1].get_edge(122, 122)
+
+        def test_edge_index(self):
+            g = TestGraphCreation.temp_graph[1]
+            self.assertEqual(len(g), 37)
+            self.assertEqual(list(g.iter_edges()), g.get_edges())
+            self.assertTrue(g.has_edge(255, 122))
+            self.assertFalse(g.has_edge(122, 122))
+            self.assertIs(g.get_edge(255, 122), g.get_edge(122, 255))
 
         def test_number_of_nodes(self):
             self.assertEqual(len(TestGraphCreation.temp_graph.get_nodes()), 114, 'Correct node number')
@@ -56,6 +72,10 @@ class TestGraphCreation(unittest.TestCase):
                              'Check get_local_attribute with type string')
             self.assertEqual(TestGraphCreation.temp_graph.get_node(871).get_local_attribute('1', 2), '2',
                              'Check get_local_attribute with type int')
+            values = TestGraphCreation.temp_graph.get_node(871).get_local_attribute_values('1')
+            self.assertEqual(values.tolist(), [str(i) for i in range(13)])
+            with self.assertRaises(KeyError):
+                TestGraphCreation.temp_graph.get_node(122).get_local_attribute('1', 0)
 
         def test_with_higher_granularity(self):
             graphs_high_granularity = graph.TemporalGraph(TestGraphCreation.edges, TestGraphCreation.meta, 60)
@@ -68,6 +88,14 @@ class TestGraphCreation(unittest.TestCase):
             with self.assertRaises(KeyError):
                 temp_graph.get_node(454).get_global_attribute('1')
 
+        def test_create_graph_from_edge_blocks(self):
+            blocks = dimp.iter_edge_blocks('vtna/tests/data/highschool_edges.ssv', chunk_size=100)
+            temp_graph = graph.TemporalGraph.from_edge_blocks(blocks, TestGraphCreation.meta, 20)
+            self.assertEqual(len(temp_graph), 13)
+            self.assertEqual(len(temp_graph.get_nodes()), 114)
+            self.assertEqual(len(temp_graph[1].get_edges()), 37)
+            self.assertEqual(temp_graph[1].get_edge(122, 255).get_timestamps(), [1385982040])
+
         def test_create_graph_with_invalid_metadata(self):
             invalid_meta = dimp.MetadataTable('vtna/tests/data/invalid_metadata.csv')
             with self.assertRaises(graph.MissingNodesInMetadataError):
@@ -123,6 +151,33 @@ class TestAccumulatedGraph(unittest.TestCase):
         self.assertEqual(len(graphs[4].get_edges()), 3)
         self.assertEqual(len(graphs[5].get_edges()), 4)
 
+    def test_accumulated_timestamps(self):
+        edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        temp_graph = graph.TemporalGraph(edges, None, 20)
+        expected = dict()
+        accumulated = list()
+        for g in temp_graph:
+            for edge in g.get_edges():
+                expected[edge.get_incident_nodes()] = expected.get(edge.get_incident_nodes(), []) + \
+                                                      edge.get_timestamps()
+            accumulated.append(dict((k, sorted(v)) for k, v in expected.items()))
+        temp_graph.set_cumulative(True)
+        for time_step, g in enumerate(temp_graph):
+            self.assertEqual(dict((e.get_incident_nodes(), e.get_timestamps()) for e in g.get_edges()),
+                             accumulated[time_step])
+        self.assertEqual(temp_graph[3].get_edge(255, 122).get_timestamps(), accumulated[3][(122, 255)])
+        with self.assertRaises(KeyError):
+            temp_graph[0].get_edge(1, 2)
+
+    def test_aggregated_arrays_of_cumulative_graph(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 1, 2), (40, 1, 3), (60, 1, 2)], None, 20)
+        temp_graph.set_cumulative(True)
+        node1, node2, counts = vtna.utility.temporal_graph2arrays(temp_graph)
+        nx_graph = vtna.utility.temporal_graph2networkx(temp_graph)
+        self.assertEqual(counts.tolist(), [8, 2])
+        self.assertEqual(dict(zip(zip(node1.tolist(), node2.tolist()), counts.tolist())),
+                         dict(((n1, n2), count) for n1, n2, count in nx_graph.edges(data='count')))
+
     def test_switch_on_off_cumulative_graph_with_cont_example(self):
         # Multiple on-offs to control for the fact that the cumulative graph is only computed on activation via set
         temp_graph = graph.TemporalGraph(TestAccumulatedGraph.edges1, None, 20)
@@ -149,3 +204,395 @@ class TestAccumulatedGraph(unittest.TestCase):
         self.assertEqual(len(graphs[1].get_edges()), 2)
         self.assertEqual(len(graphs[2].get_edges()), 2)
         self.assertEqual(len(graphs[3].get_edges()), 3)
+
+
+class TestColumnarGraph(unittest.TestCase):
+    edges = None
+    temp_graph = None
+    columnar_graph = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.temp_graph = graph.TemporalGraph(cls.edges, None, 20)
+        cls.columnar_graph = graph.TemporalGraph(cls.edges, None, 20, columnar=True)
+
+    def test_same_edges_as_materialized_graph(self):
+        self.assertTrue(TestColumnarGraph.columnar_graph.is_columnar())
+        self.assertEqual(len(TestColumnarGraph.columnar_graph), len(TestColumnarGraph.temp_graph))
+        for g1, g2 in zip(TestColumnarGraph.temp_graph, TestColumnarGraph.columnar_graph):
+            edges1 = sorted((e.get_incident_nodes(), e.get_timestamps()) for e in g1.get_edges())
+            edges2 = sorted((e.get_incident_nodes(), e.get_timestamps()) for e in g2.get_edges())
+            self.assertEqual(edges1, edges2)
+
+    def test_get_edge(self):
+        edge = TestColumnarGraph.columnar_graph[1].get_edge(255, 122)
+        self.assertEqual(edge.get_incident_nodes(), (122, 255))
+        self.assertEqual(edge.get_timestamps(), [1385982040])
+        with self.assertRaises(KeyError):
+            TestColumnarGraph.columnar_graph[1].get_edge(122, 122)
+
+    def test_edge_index(self):
+        for g1, g2 in zip(TestColumnarGraph.temp_graph, TestColumnarGraph.columnar_graph):
+            self.assertEqual(len(g1), len(g2))
+            self.assertEqual(len(list(g2.iter_edges())), len(g2))
+        self.assertTrue(TestColumnarGraph.columnar_graph[1].has_edge(255, 122))
+        self.assertFalse(TestColumnarGraph.columnar_graph[1].has_edge(122, 122))
+
+    def test_nodes(self):
+        self.assertEqual(set(n.get_id() for n in TestColumnarGraph.columnar_graph.get_nodes()),
+                         set(n.get_id() for n in TestColumnarGraph.temp_graph.get_nodes()))
+
+    def test_accumulated_graphs(self):
+        temp_graph = graph.TemporalGraph(TestColumnarGraph.edges, None, 20, columnar=True)
+        temp_graph.set_cumulative(True)
+        self.assertEqual(len(temp_graph[len(temp_graph) - 1].get_edges()), 92)
+        self.assertEqual(len(temp_graph[len(temp_graph) - 1]), 92)
+        self.assertTrue(temp_graph[len(temp_graph) - 1].has_edge(255, 122))
+        self.assertFalse(temp_graph[0].has_edge(122, 122))
+
+
+class SameGraphsMixin(object):
+    """Compares temporal graphs by the edges and timestamps of every time step."""
+    def assertSameGraphs(self, temp_graph1: graph.TemporalGraph, temp_graph2: graph.TemporalGraph):
+        self.assertEqual(len(temp_graph1), len(temp_graph2))
+        for g1, g2 in zip(temp_graph1, temp_graph2):
+            edges1 = sorted((e.get_incident_nodes(), sorted(e.get_timestamps())) for e in g1.get_edges())
+            edges2 = sorted((e.get_incident_nodes(), sorted(e.get_timestamps())) for e in g2.get_edges())
+            self.assertEqual(edges1, edges2)
+
+
+class TestAppendEdges(SameGraphsMixin, unittest.TestCase):
+    edges = None
+    meta = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.meta = dimp.MetadataTable('vtna/tests/data/highschool_meta.tsv')
+
+    def test_append_matches_full_construction(self):
+        edges = TestAppendEdges.edges
+        for columnar in (False, True):
+            expected = graph.TemporalGraph(edges, TestAppendEdges.meta, 20, columnar=columnar)
+            # Split in the middle of a time step, so that the last time step is extended.
+            temp_graph = graph.TemporalGraph(edges[:250], TestAppendEdges.meta, 20, columnar=columnar)
+            n_timesteps = len(temp_graph)
+            temp_graph.set_cumulative(True)
+            list(temp_graph)
+            first_changed = temp_graph.append_edges(edges[250:])
+            self.assertEqual(first_changed, n_timesteps - 1)
+            expected.set_cumulative(True)
+            self.assertSameGraphs(temp_graph, expected)
+            temp_graph.set_cumulative(False)
+            expected.set_cumulative(False)
+            self.assertSameGraphs(temp_graph, expected)
+
+    def test_accumulated_counts(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 1, 2)], None, 20)
+        temp_graph.set_cumulative(True)
+        self.assertEqual([g.get_edge(1, 2).get_count() for g in temp_graph], [1, 2])
+        temp_graph.append_edges([(40, 1, 2), (60, 2, 3)])
+        self.assertEqual([g.get_edge(1, 2).get_count() for g in temp_graph], [1, 2, 3, 3])
+        self.assertEqual(temp_graph[3].get_edge(2, 3).get_count(), 1)
+
+    def test_earlier_accumulated_graphs_are_kept(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 1, 2), (25, 2, 3)], None, 20)
+        temp_graph.set_cumulative(True)
+        graphs = list(temp_graph)
+        self.assertEqual(temp_graph.append_edges([(30, 1, 2), (60, 3, 4)]), 1)
+        self.assertIs(temp_graph[0], graphs[0])
+        self.assertIsNot(temp_graph[1], graphs[1])
+        self.assertEqual(temp_graph[1].get_edge(1, 2).get_count(), 3)
+        self.assertEqual([len(g) for g in temp_graph], [1, 2, 2, 3])
+
+    def test_nodes_are_extended(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 2, 3)], None, 20)
+        temp_graph.get_node(1).update_local_attribute('x', [1.0, 2.0])
+        temp_graph.append_edges([(60, 3, 4)])
+        self.assertEqual(len(temp_graph), 4)
+        self.assertIsNone(temp_graph.get_node(1).get_local_attribute('x', 3))
+        temp_graph.get_node(4).update_local_attribute('x', [0, 0, 0, 1])
+        temp_graph.get_node(2).update_local_attribute('x', [0, 0, 0, 1])
+
+    def test_changed_timestep_invalidates_local_attributes(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 1, 3)], None, 20)
+        temp_graph.get_node(1).update_local_attribute('x', [1, 1])
+        temp_graph.append_edges([(20, 1, 4)])
+        self.assertEqual(temp_graph.get_node(1).get_local_attribute('x', 0), 1)
+        self.assertIsNone(temp_graph.get_node(1).get_local_attribute('x', 1))
+        self.assertEqual(temp_graph.get_local_attribute_valid_mask('x')[:3].tolist(),
+                         [[True, False], [False, False], [False, False]])
+        # Attribute stays set, even if no timestep is valid anymore
+        single = graph.TemporalGraph([(0, 1, 2)], None, 20)
+        single.get_node(1).update_local_attribute('x', [1])
+        single.append_edges([(10, 1, 3)])
+        self.assertIsNone(single.get_node(1).get_local_attribute('x', 0))
+        self.assertTrue(single.get_local_attribute_set_mask('x')[0])
+
+    def test_append_no_edges(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 1, 3)], None, 20)
+        temp_graph.get_node(1).update_local_attribute('x', [1, 1])
+        version, attributes_version = temp_graph.get_version(), temp_graph.get_attributes_version()
+        self.assertEqual(temp_graph.append_edges([]), 2)
+        self.assertEqual(temp_graph.get_version(), version)
+        self.assertEqual(temp_graph.get_attributes_version(), attributes_version)
+        self.assertEqual(temp_graph.get_node(1).get_local_attribute('x', 1), 1)
+
+    def test_append_too_early(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (40, 2, 3)], None, 20)
+        with self.assertRaises(ValueError):
+            temp_graph.append_edges([(20, 1, 2)])
+        self.assertEqual(len(temp_graph), 3)
+
+    def test_append_node_missing_in_metadata(self):
+        temp_graph = graph.TemporalGraph(TestAppendEdges.edges, TestAppendEdges.meta, 20)
+        with self.assertRaises(graph.MissingNodesInMetadataError):
+            temp_graph.append_edges([(1385982280, 122, 73)])
+
+
+class TestRegranularize(SameGraphsMixin, unittest.TestCase):
+    edges = None
+    meta = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.meta = dimp.MetadataTable('vtna/tests/data/highschool_meta.tsv')
+
+    def test_matches_full_construction(self):
+        edges = TestRegranularize.edges
+        for columnar in (False, True):
+            for granularity in (60, 50):
+                expected = graph.TemporalGraph(edges, TestRegranularize.meta, granularity, columnar=columnar)
+                temp_graph = graph.TemporalGraph(edges, TestRegranularize.meta, 20, columnar=columnar)
+                temp_graph.set_cumulative(True)
+                list(temp_graph)
+                temp_graph.regranularize(granularity)
+                self.assertEqual(temp_graph.get_granularity(), granularity)
+                expected.set_cumulative(True)
+                self.assertSameGraphs(temp_graph, expected)
+                temp_graph.set_cumulative(False)
+                expected.set_cumulative(False)
+                self.assertSameGraphs(temp_graph, expected)
+                self.assertEqual(temp_graph.get_fingerprint(), expected.get_fingerprint())
+
+    def test_from_time_pyramid(self):
+        temp_graph = graph.TemporalGraph(TestRegranularize.edges, TestRegranularize.meta, 20)
+        pyramid = vtna.edge_store.TimePyramid(temp_graph.get_edge_store(), [60, 300])
+        for granularity in (60, 300):
+            expected = graph.TemporalGraph(TestRegranularize.edges, TestRegranularize.meta, granularity)
+            self.assertSameGraphs(graph.TemporalGraph.from_time_pyramid(pyramid, granularity, TestRegranularize.meta),
+                                  expected)
+
+    def test_nodes_are_kept(self):
+        temp_graph = graph.TemporalGraph(TestRegranularize.edges, TestRegranularize.meta, 20)
+        node = temp_graph.get_node(1)
+        node_ids = temp_graph.get_node_ids().tolist()
+        temp_graph.add_measure_attribute('x', 'O', 'local', {node_id: [0] * len(temp_graph) for node_id in node_ids})
+        temp_graph.add_measure_attribute('y', 'O', 'global', {node_id: 1 for node_id in node_ids})
+        version = temp_graph.get_version()
+        temp_graph.regranularize(40)
+        self.assertGreater(temp_graph.get_version(), version)
+        self.assertIs(temp_graph.get_node(1), node)
+        self.assertEqual(node.get_global_attribute('y'), 1)
+        self.assertNotIn('x', temp_graph.get_attributes_info())
+        self.assertIn('y', temp_graph.get_attributes_info())
+        with self.assertRaises(KeyError):
+            node.get_local_attribute('x', 0)
+        node.update_local_attribute('x', list(range(len(temp_graph))))
+        self.assertEqual(node.get_local_attribute('x', 1), 1)
+
+    def test_invalid_granularity(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 2, 3)], None, 20)
+        with self.assertRaises(ValueError):
+            temp_graph.regranularize(-20)
+        self.assertEqual(len(temp_graph), 2)
+
+
+class TestEdge(unittest.TestCase):
+    def test_edge_with_list(self):
+        edge = graph.Edge(3, 1, [20, 40])
+        self.assertEqual(edge.get_incident_nodes(), (1, 3))
+        self.assertEqual(edge.get_count(), 2)
+        self.assertEqual(edge.get_timestamps(), [20, 40])
+
+    def test_edges_with_shared_buffer(self):
+        for buffer in (array.array('q', [20, 40, 60]), np.array([20, 40, 60])):
+            edge1 = graph.Edge(1, 2, buffer, 0, 2)
+            edge2 = graph.Edge(2, 3, buffer, 2, 3)
+            self.assertEqual(edge1.get_count(), 2)
+            self.assertEqual(edge1.get_timestamps(), [20, 40])
+            self.assertEqual(edge2.get_timestamps(), [60])
+            self.assertIsInstance(edge2.get_timestamps()[0], int)
+
+    def test_timestamps_view(self):
+        timestamps = [20, 40, 60]
+        edge = graph.Edge(1, 2, timestamps)
+        timestamps.append(80)
+        self.assertEqual(edge.get_timestamps_view(), (20, 40, 60))
+        for buffer in (array.array('q', [20, 40, 60]), np.array([20, 40, 60])):
+            view = graph.Edge(1, 2, buffer, 1, 3).get_timestamps_view()
+            self.assertIsInstance(view, np.ndarray)
+            self.assertEqual(list(view), [40, 60])
+            with self.assertRaises((TypeError, ValueError)):
+                view[0] = 0
+            self.assertEqual(buffer[1], 40)
+        buffer = np.array([20, 40])
+        graph.Edge(1, 2, buffer).get_timestamps_view()
+        self.assertTrue(buffer.flags.writeable)
+
+    def test_shared_buffer_without_stop(self):
+        with self.assertRaises(ValueError):
+            graph.Edge(1, 2, [20, 40], 0)
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            graph.Edge(1, 2, [20]).weight = 1
+        with self.assertRaises(AttributeError):
+            graph.TemporalNode(1, {}, 1).weight = 1
+
+
+class TestLocalAttributeMatrix(unittest.TestCase):
+    def setUp(self):
+        self.temp_graph = graph.TemporalGraph([(0, 1, 2), (20, 2, 3), (40, 1, 3)], None, 20)
+        self.values = {1: [1, 0, 1], 2: [1, 1, 0], 3: [0, 1, 1]}
+        self.temp_graph.add_measure_attribute('degree', 'I', 'local', self.values)
+
+    def test_matrix(self):
+        matrix = self.temp_graph.get_local_attribute_matrix('degree')
+        node_ids = self.temp_graph.get_node_ids().tolist()
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertEqual(matrix.dtype.kind, 'i')
+        self.assertEqual(matrix.tolist(), [self.values[node_id] for node_id in node_ids])
+        self.assertEqual(self.temp_graph.get_local_attribute_column('degree', 1).tolist(),
+                         [self.values[node_id][1] for node_id in node_ids])
+        with self.assertRaises(ValueError):
+            matrix[0, 0] = 5
+
+    def test_nodes_are_views(self):
+        node = self.temp_graph.get_node(2)
+        self.assertEqual(node.get_local_attribute('degree', 1), 1)
+        self.assertIsInstance(node.get_local_attribute('degree', 1), int)
+        node.update_local_attribute('degree', [0.5, 0.5, 0.5])
+        row = self.temp_graph.get_node_ids().tolist().index(2)
+        self.assertEqual(self.temp_graph.get_local_attribute_matrix('degree')[row].tolist(), [0.5, 0.5, 0.5])
+        self.assertEqual(self.temp_graph.get_node(1).get_local_attribute('degree', 0), 1)
+
+    def test_mixed_numbers_are_stored_as_floats(self):
+        node = self.temp_graph.get_node(1)
+        node.update_local_attribute('x', [1, 2.5, 3])
+        self.assertIsInstance(node.get_local_attribute('x', 0), float)
+        self.assertEqual(node.get_local_attribute('x', 0), 1.0)
+        # Ints of other nodes are converted as well, once an attribute holds floats
+        self.assertIsInstance(self.temp_graph.get_node(2).get_local_attribute('degree', 1), int)
+        self.temp_graph.get_node(3).update_local_attribute('degree', [0.5, 0.5, 0.5])
+        self.assertIsInstance(self.temp_graph.get_node(2).get_local_attribute('degree', 1), float)
+
+    def test_categorical_values(self):
+        self.temp_graph.get_node(3).update_local_attribute('mood', ['good', 'bad', None])
+        self.assertEqual(self.temp_graph.get_node(3).get_local_attribute('mood', 1), 'bad')
+        self.assertIsNone(self.temp_graph.get_node(3).get_local_attribute('mood', 2))
+        with self.assertRaises(KeyError):
+            self.temp_graph.get_node(1).get_local_attribute('mood', 0)
+
+    def test_invalid_length(self):
+        with self.assertRaises(graph.InvalidLocalAttributeValuesLength):
+            self.temp_graph.add_measure_attribute('x', 'I', 'local', {1: [1], 2: [1], 3: [1]})
+        with self.assertRaises(graph.InvalidLocalAttributeValuesLength):
+            self.temp_graph.get_node(1).update_local_attribute('x', [1])
+
+    def test_append_edges(self):
+        self.temp_graph.append_edges([(60, 3, 4)])
+        matrix = self.temp_graph.get_local_attribute_matrix('degree')
+        self.assertEqual(matrix.shape, (4, 4))
+        self.assertIsNone(self.temp_graph.get_node(1).get_local_attribute('degree', 3))
+        self.assertEqual(self.temp_graph.get_node(1).get_local_attribute('degree', 2), 1)
+        with self.assertRaises(KeyError):
+            self.temp_graph.get_node(4).get_local_attribute('degree', 3)
+        self.assertEqual(matrix.dtype.kind, 'i')
+        row = self.temp_graph.get_node_ids().tolist().index(1)
+        self.assertEqual(self.temp_graph.get_local_attribute_valid_mask('degree')[row].tolist(),
+                         [True, True, True, False])
+
+    def test_missing_values_after_append(self):
+        self.temp_graph.append_edges([(60, 3, 4), (80, 3, 4)])
+        self.temp_graph.get_node(2).update_local_attribute('degree', [0.5] * 5)
+        matrix = self.temp_graph.get_local_attribute_matrix('degree')
+        row = self.temp_graph.get_node_ids().tolist().index(1)
+        self.assertEqual(matrix.dtype.kind, 'f')
+        self.assertEqual(matrix[row, :3].tolist(), [1, 0, 1])
+        self.assertTrue(np.isnan(matrix[row, 3:]).all())
+        self.assertIsNone(self.temp_graph.get_node(1).get_local_attribute('degree', 4))
+        self.assertEqual(self.temp_graph.get_node(2).get_local_attribute('degree', 4), 0.5)
+
+
+class TestGlobalAttributeCodes(unittest.TestCase):
+    meta = None
+    edges = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.meta = dimp.MetadataTable('vtna/tests/data/highschool_meta.tsv')
+        cls.edges = dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+
+    def setUp(self):
+        self.temp_graph = graph.TemporalGraph(TestGlobalAttributeCodes.edges, TestGlobalAttributeCodes.meta, 20)
+
+    def test_metadata_codes(self):
+        meta = TestGlobalAttributeCodes.meta
+        codes = self.temp_graph.get_global_attribute_codes('2')
+        categories = self.temp_graph.get_global_attribute_categories('2')
+        self.assertEqual(categories, meta.get_categories('2'))
+        node_ids = self.temp_graph.get_node_ids().tolist()
+        self.assertEqual([categories[code] for code in codes.tolist()], [meta[node_id]['2'] for node_id in node_ids])
+        with self.assertRaises(ValueError):
+            codes[0] = 1
+
+    def test_update_with_new_category(self):
+        node = self.temp_graph.get_node(871)
+        node.update_global_attribute('1', 'test')
+        self.assertEqual(node.get_global_attribute('1'), 'test')
+        row = self.temp_graph.get_node_ids().tolist().index(871)
+        code = self.temp_graph.get_global_attribute_codes('1')[row]
+        self.assertEqual(self.temp_graph.get_global_attribute_categories('1')[code], 'test')
+
+    def test_nodes_without_value(self):
+        self.temp_graph.get_node(871).update_global_attribute('club', 'chess')
+        codes = self.temp_graph.get_global_attribute_codes('club')
+        self.assertEqual(int((codes >= 0).sum()), 1)
+        with self.assertRaises(KeyError):
+            self.temp_graph.get_node(122).get_global_attribute('club')
+
+    def test_missing_values_are_no_category(self):
+        self.temp_graph.get_node(871).update_global_attribute('1', np.nan)
+        self.temp_graph.get_node(122).update_global_attribute('1', None)
+        codes = self.temp_graph.get_global_attribute_codes('1')
+        node_ids = self.temp_graph.get_node_ids().tolist()
+        self.assertEqual(codes[node_ids.index(871)], -1)
+        self.assertEqual(codes[node_ids.index(122)], -1)
+        self.assertEqual(self.temp_graph.get_global_attribute_categories('1'),
+                         TestGlobalAttributeCodes.meta.get_categories('1'))
+        self.assertTrue(np.isnan(self.temp_graph.get_node(871).get_global_attribute('1')))
+        # Missing metadata values, i.e. codes of -1 of a pandas categorical
+        meta = dimp.MetadataTable(io.StringIO('1\tchess\n2\t\n3\tchess\n'), col_sep='\t')
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (0, 2, 3)], meta, 20)
+        self.assertEqual(temp_graph.get_global_attribute_codes('1').tolist(), [0, -1, 0])
+        self.assertEqual(temp_graph.get_global_attribute_categories('1'), ['chess'])
+        self.assertTrue(np.isnan(temp_graph.get_node(2).get_global_attribute('1')))
+        with self.assertRaises(KeyError):
+            temp_graph.get_node(2).get_global_attribute('club')
+
+    def test_appended_nodes(self):
+        temp_graph = graph.TemporalGraph(TestGlobalAttributeCodes.edges[:100], TestGlobalAttributeCodes.meta, 20)
+        temp_graph.get_node(temp_graph.get_node_ids()[0]).update_global_attribute('2', 'X')
+        temp_graph.append_edges(TestGlobalAttributeCodes.edges[100:])
+        for node in temp_graph.get_nodes()[1:]:
+            self.assertEqual(node.get_global_attribute('2'), TestGlobalAttributeCodes.meta[node.get_id()]['2'])
+
+    def test_numeric_attributes_are_not_categorical(self):
+        node_ids = self.temp_graph.get_node_ids().tolist()
+        self.temp_graph.add_measure_attribute('x', 'I', 'global', dict((node_id, 0.5) for node_id in node_ids))
+        self.assertEqual(self.temp_graph.get_node(122).get_global_attribute('x'), 0.5)
+        with self.assertRaises(KeyError):
+            self.temp_graph.get_global_attribute_codes('x')
@@ -0,0 +1,209 @@
+import unittest
+
+import networkx
+import numpy as np
+import scipy.spatial
+
+import vtna.data_import
+import vtna.graph
+import vtna.layout
+import vtna.utility
+
+
+class TestRandomWalkPCALayout(unittest.TestCase):
+    temp_graph = None
+
+    @classmethod
+    def setUpClass(cls):
+        edges = vtna.data_import.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.temp_graph = vtna.graph.TemporalGraph(edges, None, 20)
+
+    def test_dense_and_sparse_mode(self):
+        n_nodes = len(TestRandomWalkPCALayout.temp_graph.get_edge_store().get_node_ids())
+        for sparse in (False, True):
+            layouts = vtna.layout.random_walk_pca_layout(TestRandomWalkPCALayout.temp_graph, random_state=0,
+                                                         sparse=sparse)
+            self.assertEqual(len(layouts), len(TestRandomWalkPCALayout.temp_graph))
+            points = np.array(list(layouts[0].values()))
+            self.assertEqual(points.shape, (n_nodes, 2))
+            self.assertTrue(np.allclose(points.min(axis=0), -1) and np.allclose(points.max(axis=0), 1))
+
+    def test_dense_mode_keeps_first_seen_node_order(self):
+        temp_graph = TestRandomWalkPCALayout.temp_graph
+        # The sequential repel depends on the node order, which follows the first edges of the file.
+        nodes = list(vtna.utility.temporal_graph2networkx(temp_graph).nodes())
+        self.assertEqual(nodes[:6], [454, 640, 1, 939, 185, 258])
+        # The dense mode is the default.
+        layout = vtna.layout.random_walk_pca_layout(temp_graph, random_state=42)[0]
+        # Positions computed by the dict-based graphs before the edge store was introduced. The sign of each PCA
+        # axis depends on the linear algebra backend, so axes are compared up to a sign flip.
+        expected = {454: (-0.5795616505998487, -0.5588245148276794), 640: (-0.896000298418824, -0.6743070781525038),
+                    1: (0.4668870633874118, -0.312316328418083)}
+        expected_points = np.array(list(expected.values()))
+        points = np.array([layout[node] for node in expected])
+        for axis in range(2):
+            self.assertTrue(any(np.allclose(sign * points[:, axis], expected_points[:, axis], rtol=0, atol=1e-9)
+                                for sign in (1, -1)))
+
+    def test_sparse_mode_separates_components(self):
+        # Two cliques of ten nodes without edges between them
+        edges = [(t * 20, i + offset, j + offset) for t in range(3) for offset in (0, 100)
+                 for i in range(10) for j in range(i + 1, 10)]
+        temp_graph = vtna.graph.TemporalGraph(edges, None, 20)
+        layout = vtna.layout.random_walk_pca_layout(temp_graph, repel=0.0, random_state=0, sparse=True)[0]
+        first = np.array([layout[node] for node in range(10)])
+        second = np.array([layout[node] for node in range(100, 110)])
+        # Components are separated along one of the axes.
+        self.assertTrue(any(first[:, axis].max() < second[:, axis].min() or second[:, axis].max() < first[:, axis].min()
+                            for axis in range(2)))
+
+    def test_sparse_mode_requires_euclidean_distance(self):
+        with self.assertRaises(ValueError):
+            vtna.layout.random_walk_pca_layout(TestRandomWalkPCALayout.temp_graph, p=1, sparse=True)
+        layout = vtna.layout.random_walk_pca_layout(TestRandomWalkPCALayout.temp_graph, p=1, random_state=0)[0]
+        self.assertEqual(len(layout), len(TestRandomWalkPCALayout.temp_graph.get_edge_store().get_node_ids()))
+
+    def test_sparse_mode_is_reproducible(self):
+        layout1 = vtna.layout.random_walk_pca_layout(TestRandomWalkPCALayout.temp_graph, random_state=1,
+                                                     sparse=True)[0]
+        layout2 = vtna.layout.random_walk_pca_layout(TestRandomWalkPCALayout.temp_graph, random_state=1,
+                                                     sparse=True)[0]
+        self.assertEqual(layout1, layout2)
+
+    def test_sequential_repel_in_sparse_mode(self):
+        temp_graph = TestRandomWalkPCALayout.temp_graph
+        layout = vtna.layout.random_walk_pca_layout(temp_graph, random_state=0, sparse=True, sequential_repel=True)[0]
+        unrepelled = vtna.layout.random_walk_pca_layout(temp_graph, repel=0.0, random_state=0, sparse=True)[0]
+        self.assertEqual(layout.keys(), unrepelled.keys())
+        self.assertNotEqual(layout, unrepelled)
+        approximate = vtna.layout.random_walk_pca_layout(temp_graph, random_state=0, sparse=True)[0]
+        self.assertNotEqual(layout, approximate)
+
+    def test_approximate_repel_matches_exact_pushes(self):
+        random_state = np.random.RandomState(0)
+        points = np.concatenate([random_state.randn(500, 2) * 0.3 + center for center in ([0, 0], [3, 1], [-2, 2])])
+        for p in (1, 2):
+            diff = points[:, np.newaxis, :] - points[np.newaxis, :, :]
+            norm = np.sum(np.abs(diff) ** p, axis=-1) ** (1 / p)
+            np.fill_diagonal(norm, np.inf)
+            expected = (diff / norm[..., np.newaxis]).sum(axis=1)
+            # Module level function, so its name is not mangled
+            pushes = getattr(vtna.layout, '__approximate_repel')(points, 1.0, p) - points
+            error = np.linalg.norm(pushes - expected, axis=1)
+            self.assertLess(np.mean(error / np.linalg.norm(expected, axis=1)), 0.01)
+            self.assertLess(error.max(), 0.05 * np.linalg.norm(expected, axis=1).mean())
+
+
+class TestSpringLayoutEngines(unittest.TestCase):
+    temp_graph = None
+
+    @classmethod
+    def setUpClass(cls):
+        edges = vtna.data_import.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        cls.temp_graph = vtna.graph.TemporalGraph(edges, None, 20)
+
+    def test_engines_lay_out_same_nodes(self):
+        temp_graph = TestSpringLayoutEngines.temp_graph
+        for layout_function in (vtna.layout.flexible_spring_layout, vtna.layout.static_spring_layout,
+                                vtna.layout.flexible_weighted_spring_layout,
+                                vtna.layout.chained_weighted_spring_layout,
+                                vtna.layout.static_weighted_spring_layout):
+            networkx_layouts = layout_function(temp_graph, n_iterations=5, engine='networkx')
+            native_layouts = layout_function(temp_graph, n_iterations=5, engine='barnes_hut')
+            self.assertEqual(len(native_layouts), len(temp_graph))
+            for networkx_layout, native_layout in zip(networkx_layouts, native_layouts):
+                self.assertEqual(set(native_layout), set(networkx_layout))
+                if len(native_layout) > 1:
+                    points = np.array(list(native_layout.values()))
+                    self.assertAlmostEqual(np.abs(points).max(), 1.0)
+
+    def test_default_engine_is_networkx(self):
+        temp_graph = TestSpringLayoutEngines.temp_graph
+        np.random.seed(0)
+        networkx_layout = vtna.layout.static_spring_layout(temp_graph, n_iterations=5, engine='networkx')[0]
+        np.random.seed(0)
+        default_layout = vtna.layout.static_spring_layout(temp_graph, n_iterations=5)[0]
+        self.assertEqual(default_layout.keys(), networkx_layout.keys())
+        for node, point in default_layout.items():
+            np.testing.assert_array_equal(point, networkx_layout[node])
+
+    def test_native_engine_matches_networkx(self):
+        node1, node2, counts = vtna.utility.temporal_graph2arrays(TestSpringLayoutEngines.temp_graph)
+        graph = vtna.utility.arrays2networkx(node1, node2, counts)
+        nodes, edges = np.unique(np.concatenate((node1, node2)), return_inverse=True)
+        initial_positions = np.random.RandomState(0).rand(len(nodes), 2)
+        k = 1 / np.sqrt(len(nodes))
+        for weighted in (False, True):
+            weights = counts.astype(np.float64) if weighted else np.ones(len(counts))
+            # Module level function, so its name is not mangled
+            native = getattr(vtna.layout, '__fruchterman_reingold')(
+                len(nodes), edges[:len(node1)], edges[len(node1):], weights, k, 50, initial_positions)
+            layout = networkx.spring_layout(graph, pos=dict(zip(nodes.tolist(), initial_positions)),
+                                            weight='count' if weighted else None, k=k, iterations=50)
+            expected = np.array([layout[node] for node in nodes.tolist()])
+            correlation = np.corrcoef(scipy.spatial.distance.pdist(native),
+                                      scipy.spatial.distance.pdist(expected))[0, 1]
+            self.assertGreater(correlation, 0.95)
+
+    def test_batched_engine_lays_out_same_nodes(self):
+        temp_graph = TestSpringLayoutEngines.temp_graph
+        for layout_function in (vtna.layout.flexible_spring_layout, vtna.layout.flexible_weighted_spring_layout):
+            networkx_layouts = layout_function(temp_graph, n_iterations=5, engine='networkx')
+            batched_layouts = layout_function(temp_graph, n_iterations=5, engine='batched')
+            self.assertEqual([set(layout) for layout in batched_layouts],
+                             [set(layout) for layout in networkx_layouts])
+            for layout in batched_layouts:
+                self.assertAlmostEqual(np.abs(np.array(list(layout.values()))).max(), 1.0)
+
+    def test_batched_engine_matches_networkx(self):
+        edges = vtna.data_import.read_edge_table('vtna/tests/data/highschool_edges.ssv')
+        temp_graph = vtna.graph.TemporalGraph(edges, None, 200)
+        blocks = list()
+        for time_step in range(len(temp_graph)):
+            node1, node2, counts = temp_graph.get_edge_arrays(time_step)
+            nodes, edges = np.unique(np.concatenate((node1, node2)), return_inverse=True)
+            blocks.append((time_step, nodes, edges[:len(node1)], edges[len(node1):], counts.astype(np.float64)))
+        block_sizes = np.array([len(nodes) for _, nodes, _, _, _ in blocks])
+        block_starts = np.cumsum(block_sizes) - block_sizes
+        initial_positions = np.random.RandomState(0).rand(block_sizes.sum(), 2)
+        # Module level function, so its name is not mangled
+        positions = getattr(vtna.layout, '__batched_fruchterman_reingold')(
+            block_sizes, np.concatenate([first + start for (_, _, first, _, _), start in zip(blocks, block_starts)]),
+            np.concatenate([second + start for (_, _, _, second, _), start in zip(blocks, block_starts)]),
+            np.concatenate([weights for _, _, _, _, weights in blocks]), 1 / np.sqrt(block_sizes), 20,
+            initial_positions)
+        for (time_step, nodes, _, _, _), start in zip(blocks, block_starts):
+            block = slice(start, start + len(nodes))
+            layout = networkx.spring_layout(vtna.utility.graph2networkx(temp_graph[time_step]),
+                                            pos=dict(zip(nodes.tolist(), initial_positions[block])),
+                                            weight='count', k=1 / np.sqrt(len(nodes)), iterations=20)
+            expected = np.array([layout[node] for node in nodes.tolist()])
+            # Forces are summed in another order, rounding errors grow with the number of iterations.
+            np.testing.assert_allclose(positions[block], expected, atol=1e-8)
+
+    def test_unknown_engine(self):
+        temp_graph = TestSpringLayoutEngines.temp_graph
+        with self.assertRaisesRegex(ValueError, "engine 'graphviz', expected None or one of networkx, barnes_hut$"):
+            vtna.layout.static_spring_layout(temp_graph, engine='graphviz')
+        with self.assertRaisesRegex(ValueError, "engine 'batched', expected None or one of networkx, barnes_hut$"):
+            vtna.layout.chained_weighted_spring_layout(temp_graph, engine='batched')
+        with self.assertRaisesRegex(ValueError, "engine 'batched', expected None or one of networkx, barnes_hut$"):
+            vtna.layout.static_weighted_spring_layout(temp_graph, engine='batched')
+        with self.assertRaisesRegex(ValueError, "expected None or one of networkx, barnes_hut, batched$"):
+            vtna.layout.flexible_spring_layout(temp_graph, engine='graphviz')
+        self.assertEqual(vtna.layout.FLEXIBLE_SPRING_ENGINES, vtna.layout.SPRING_ENGINES + ('batched',))
+
+
+class TestBarnesHut(unittest.TestCase):
+    def test_interactions_are_bounded_for_clustered_points(self):
+        random_state = np.random.RandomState(0)
+        # A dense cluster with a far outlier, like the PCA of a graph with a small disconnected component
+        for points in (np.concatenate([random_state.randn(6000, 2), [[1e6, 1e6]]]),
+                       np.concatenate([random_state.randn(5000, 2) * 1e-3, random_state.randn(20, 2) * 100]),
+                       np.concatenate([np.zeros((3000, 2)), random_state.rand(100, 2)])):
+            # Module level function, so its name is not mangled
+            interactions = getattr(vtna.layout, '__barnes_hut_interactions')(points)
+            n_interactions = sum(len(targets) for targets, _, _ in interactions)
+            self.assertLess(n_interactions, 200 * len(points))
+            pushes = getattr(vtna.layout, '__approximate_repel')(points, 1.0, 2) - points
+            self.assertTrue(np.isfinite(pushes).all())
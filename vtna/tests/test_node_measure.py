@@ -152,6 +152,140 @@ class TestCentralityMeasures(unittest.TestCase):
             # If it exists, its measure must be greater than 0
             self.assertGreater(att_cent, 0, f"Failed for node {node.get_id()}")
 
+    def test_parallel_local_centralities(self):
+        for measure in (nome.LocalDegreeCentrality, nome.LocalBetweennessCentrality, nome.LocalClosenessCentrality):
+            serial = measure(self._temp_graph)
+            parallel = measure(self._temp_graph, n_workers=2, chunk_size=3)
+            for node in self._temp_graph.get_nodes():
+                self.assertEqual(serial[node.get_id()], parallel[node.get_id()])
+
+    def test_parallel_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            nome.LocalBetweennessCentrality(self._temp_graph, n_workers=0)
+        with self.assertRaises(ValueError):
+            nome.LocalBetweennessCentrality(self._temp_graph, n_workers=2, chunk_size=0)
+
+    def test_sparse_backend(self):
+        for measure in (nome.LocalDegreeCentrality, nome.LocalBetweennessCentrality, nome.LocalClosenessCentrality,
+                        nome.GlobalDegreeCentrality, nome.GlobalBetweennessCentrality, nome.GlobalClosenessCentrality):
+            expected = measure(self._temp_graph)
+            actual = measure(self._temp_graph, backend='sparse')
+            for node in self._temp_graph.get_nodes():
+                np.testing.assert_allclose(actual[node.get_id()], expected[node.get_id()], rtol=1e-9,
+                                           err_msg=measure.get_name())
+
+    def test_sparse_backend_with_self_loops_and_cumulative_graph(self):
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (0, 2, 2), (0, 2, 3), (20, 3, 4), (20, 4, 5), (40, 1, 5)],
+                                         None, 20)
+        temp_graph.set_cumulative(True)
+        for measure in (nome.LocalDegreeCentrality, nome.LocalBetweennessCentrality, nome.LocalClosenessCentrality,
+                        nome.GlobalDegreeCentrality, nome.GlobalBetweennessCentrality, nome.GlobalClosenessCentrality):
+            expected = measure(temp_graph)
+            actual = measure(temp_graph, backend='sparse')
+            for node in temp_graph.get_nodes():
+                np.testing.assert_allclose(actual[node.get_id()], expected[node.get_id()], rtol=1e-9,
+                                           err_msg=measure.get_name())
+
+    def test_approximate_betweenness(self):
+        exact = nome.GlobalBetweennessCentrality(self._temp_graph)
+        for backend in nome.BACKENDS:
+            approx = nome.GlobalBetweennessCentrality(self._temp_graph, backend=backend, k=60, seed=42,
+                                                      confidence=0.99)
+            again = nome.GlobalBetweennessCentrality(self._temp_graph, backend=backend, k=60, seed=42)
+            self.assertGreater(approx.get_error_bound(), 0)
+            for node in self._temp_graph.get_nodes():
+                self.assertEqual(approx[node.get_id()], again[node.get_id()])
+                self.assertLessEqual(abs(approx[node.get_id()] - exact[node.get_id()]), approx.get_error_bound())
+
+    def test_approximate_local_betweenness(self):
+        exact = nome.LocalBetweennessCentrality(self._temp_graph)
+        # Local graphs with at most k nodes are computed exactly
+        approx = nome.LocalBetweennessCentrality(self._temp_graph, backend='sparse', k=lambda n: max(10, n // 4))
+        bounds = approx.get_error_bounds()
+        self.assertEqual(len(bounds), self._timestep_count)
+        for timestep, bound in enumerate(bounds):
+            for node in self._temp_graph.get_nodes():
+                self.assertLessEqual(abs(approx[node.get_id()][timestep] - exact[node.get_id()][timestep]),
+                                     bound + 1e-12)
+        approx.add_to_graph()
+        self.assertEqual(self._temp_graph.get_node(122).get_local_attribute(approx.get_name(), 1), approx[122][1])
+        self.assertEqual(nome.LocalBetweennessCentrality(self._temp_graph, k=1000).get_error_bounds(),
+                         self._timestep_count * [0.0])
+
+    def test_approximate_local_betweenness_with_empty_timestep(self):
+        # Second timestep is empty, the last one has two nodes
+        temp_graph = graph.TemporalGraph([(0, 1, 2), (0, 2, 3), (0, 3, 4), (40, 5, 6)], None, 20)
+        for backend in nome.BACKENDS:
+            approx = nome.LocalBetweennessCentrality(temp_graph, backend=backend, k=lambda n: n // 2, seed=0)
+            self.assertEqual(approx.get_error_bounds()[1:], [0.0, 0.0])
+            self.assertEqual(approx[5], [0.0, 0.0, 0.0])
+            self.assertGreater(approx[2][0], 0.0)
+
+    def test_approximate_betweenness_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            nome.GlobalBetweennessCentrality(self._temp_graph, k=0)
+        with self.assertRaises(ValueError):
+            nome.GlobalBetweennessCentrality(self._temp_graph, k=10, confidence=1.0)
+
+    def test_local_degree_matrix(self):
+        expected = nome.LocalDegreeCentrality(self._temp_graph, backend='networkx')
+        for temp_graph in (self._temp_graph, graph.TemporalGraph([(0, 1, 1), (0, 1, 2), (20, 2, 3)], None, 20)):
+            centrality = nome.LocalDegreeCentrality(temp_graph, backend='sparse')
+            matrix = centrality.get_measure_matrix()
+            node_ids = centrality.get_node_ids()
+            self.assertEqual(matrix.shape, (len(temp_graph.get_nodes()), len(temp_graph)))
+            self.assertEqual(node_ids.tolist(), temp_graph.get_node_ids().tolist())
+            for row, node_id in enumerate(node_ids.tolist()):
+                self.assertEqual(matrix[row].tolist(), centrality[node_id])
+        self.assertEqual(nome.LocalDegreeCentrality(self._temp_graph, backend='sparse').get_measure_matrix().tolist(),
+                         expected.get_measure_matrix().tolist())
+        self.assertEqual(centrality[1], [3, 0])
+
+    def test_measure_rows_follow_graph_nodes(self):
+        # First-seen order of the nodes is not sorted
+        temp_graph = graph.TemporalGraph([(0, 9, 8), (40, 1, 2)], None, 20)
+        for node in temp_graph.get_nodes():
+            node.update_local_attribute('label', [node.get_id()] * len(temp_graph))
+        labels = temp_graph.get_local_attribute_matrix('label')
+        for backend in nome.BACKENDS:
+            for measure in (nome.LocalDegreeCentrality, nome.LocalClosenessCentrality):
+                centrality = measure(temp_graph, backend=backend)
+                self.assertEqual(centrality.get_node_ids().tolist(), temp_graph.get_node_ids().tolist())
+                self.assertEqual(centrality.get_node_ids().tolist(), labels[:, 0].tolist())
+                matrix = centrality.get_measure_matrix()
+                for row, node_id in enumerate(temp_graph.get_node_ids().tolist()):
+                    self.assertEqual(matrix[row].tolist(), centrality[node_id])
+
+    def test_local_degree_workers_with_sparse_backend(self):
+        expected = nome.LocalDegreeCentrality(self._temp_graph, backend='sparse').get_measure_matrix()
+        actual = nome.LocalDegreeCentrality(self._temp_graph, n_workers=2, chunk_size=4)
+        self.assertEqual(actual.get_measure_matrix().tolist(), expected.tolist())
+        with self.assertRaises(ValueError):
+            nome.LocalDegreeCentrality(self._temp_graph, n_workers=2, backend='sparse')
+        with self.assertRaises(ValueError):
+            nome.LocalDegreeCentrality(self._temp_graph, chunk_size=4, backend='sparse')
+
+    def test_local_degree_matrix_of_cumulative_graph(self):
+        temp_graph = graph.TemporalGraph(dimp.read_edge_table('vtna/tests/data/highschool_edges.ssv'), None, 20)
+        temp_graph.set_cumulative(True)
+        expected = nome.LocalDegreeCentrality(temp_graph, backend='networkx')
+        actual = nome.LocalDegreeCentrality(temp_graph, backend='sparse')
+        self.assertTrue(np.array_equal(actual.get_measure_matrix(), expected.get_measure_matrix()))
+
+    def test_measure_matrix(self):
+        centrality = nome.LocalClosenessCentrality(self._temp_graph)
+        matrix = centrality.get_measure_matrix()
+        for row, node_id in enumerate(centrality.get_node_ids().tolist()):
+            self.assertEqual(matrix[row].tolist(), centrality[node_id])
+        with self.assertRaises(ValueError):
+            matrix[0, 0] = 1
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            nome.LocalDegreeCentrality(self._temp_graph, backend='igraph')
+        with self.assertRaises(ValueError):
+            nome.GlobalDegreeCentrality(self._temp_graph, backend='igraph')
+
     @raises(TypeError)
     def test_lbc_getitem_invalid_parameter(self):
         nome.LocalDegreeCentrality(self._temp_graph).__getitem__("NotAnInteger")
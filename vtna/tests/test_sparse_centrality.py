@@ -0,0 +1,64 @@
+import unittest
+
+import networkx as nx
+import numpy as np
+
+import vtna.sparse_centrality as spc
+
+
+class TestSparseCentrality(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        # Two components and a self loop
+        self.node1 = np.concatenate((rng.randint(0, 30, 60), rng.randint(100, 110, 12), [7]))
+        self.node2 = np.concatenate((rng.randint(0, 30, 60), rng.randint(100, 110, 12), [7]))
+        self.nx_graph = nx.Graph()
+        self.nx_graph.add_edges_from(zip(self.node1.tolist(), self.node2.tolist()))
+        self.node_ids, self.adjacency = spc.adjacency_matrix(self.node1, self.node2)
+
+    def assertSameCentralities(self, expected, actual):
+        self.assertEqual(set(expected.keys()), set(self.node_ids.tolist()))
+        for node_id, value in zip(self.node_ids.tolist(), actual.tolist()):
+            self.assertAlmostEqual(value, expected[node_id], places=12)
+
+    def test_adjacency_matrix(self):
+        self.assertEqual(self.node_ids.tolist(), sorted(self.nx_graph.nodes()))
+        n_loops = nx.number_of_selfloops(self.nx_graph)
+        self.assertEqual(self.adjacency.nnz, 2 * self.nx_graph.number_of_edges() - n_loops)
+        self.assertTrue(np.all(self.adjacency.data == 1))
+
+    def test_degree(self):
+        self.assertSameCentralities(dict(nx.degree(self.nx_graph)), spc.degree(self.adjacency))
+        self.assertSameCentralities(nx.degree_centrality(self.nx_graph), spc.degree_centrality(self.adjacency))
+
+    def test_closeness_centrality(self):
+        self.assertSameCentralities(nx.closeness_centrality(self.nx_graph), spc.closeness_centrality(self.adjacency))
+
+    def test_betweenness_centrality(self):
+        expected = nx.betweenness_centrality(self.nx_graph, normalized=True)
+        self.assertSameCentralities(expected, spc.betweenness_centrality(self.adjacency))
+
+    def test_betweenness_centrality_in_blocks(self):
+        block_entries = spc._BLOCK_ENTRIES
+        spc._BLOCK_ENTRIES = 3 * len(self.node_ids)
+        try:
+            actual = spc.betweenness_centrality(self.adjacency)
+        finally:
+            spc._BLOCK_ENTRIES = block_entries
+        self.assertSameCentralities(nx.betweenness_centrality(self.nx_graph, normalized=True), actual)
+
+    def test_small_graphs(self):
+        node_ids, adjacency = spc.adjacency_matrix(np.array([1]), np.array([2]))
+        self.assertEqual(spc.betweenness_centrality(adjacency).tolist(), [0.0, 0.0])
+        self.assertEqual(spc.closeness_centrality(adjacency).tolist(), [1.0, 1.0])
+        node_ids, adjacency = spc.adjacency_matrix(np.array([1]), np.array([1]))
+        self.assertEqual(spc.degree_centrality(adjacency).tolist(), [1.0])
+        self.assertEqual(spc.closeness_centrality(adjacency).tolist(), [0.0])
+
+    def test_sampled_betweenness_centrality(self):
+        n = len(self.node_ids)
+        exact = spc.betweenness_centrality(self.adjacency)
+        np.testing.assert_allclose(spc.betweenness_centrality(self.adjacency, k=n, seed=0), exact)
+        approx = spc.betweenness_centrality(self.adjacency, k=n // 2, seed=0)
+        np.testing.assert_array_equal(approx, spc.betweenness_centrality(self.adjacency, k=n // 2, seed=0))
+        self.assertFalse(np.allclose(approx, exact))
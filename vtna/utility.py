@@ -1,7 +1,10 @@
 import abc
 import collections as col
 
+import typing as typ
+
 import networkx
+import numpy as np
 
 import vtna.graph
 
@@ -40,7 +43,18 @@ def graph2networkx(graph: vtna.graph.Graph) -> networkx.Graph:
     """
     nx_graph = networkx.Graph()
     nx_graph.add_edges_from(tuple(sorted(edge.get_incident_nodes())) + ({'count': edge.get_count()},)
-                            for edge in graph.get_edges())
+                            for edge in graph.iter_edges())
+    return nx_graph
+
+
+def arrays2networkx(node1: np.ndarray, node2: np.ndarray, counts: np.ndarray) -> networkx.Graph:
+    """
+    Converts the array form (node1, node2, count) of a graph, see TemporalGraph.get_edge_arrays, to a networkx graph
+    like graph2networkx.
+    """
+    nx_graph = networkx.Graph()
+    nx_graph.add_edges_from((n1, n2, {'count': count})
+                            for n1, n2, count in zip(node1.tolist(), node2.tolist(), counts.tolist()))
     return nx_graph
 
 
@@ -50,15 +64,40 @@ def temporal_graph2networkx(temp_graph: vtna.graph.TemporalGraph) -> networkx.Gr
     graph over all existing timesteps, as a networkx graph.
     Also adds a 'count' attribute to edges, which describes the amount this
     interaction happend over all timesteps (total interactions).
-    Nodes with no edges are NOT added.
+    Nodes with no edges are NOT added. Nodes are ordered like the nodes of the temporal graph, i.e. by their first
+    interaction, which layouts depend on.
 
     Args:
         A vtna temporal graph object
     """
     edges = col.defaultdict(int)
     for graph in temp_graph:
-        for edge in graph.get_edges():
+        for edge in graph.iter_edges():
             edges[tuple(sorted(edge.get_incident_nodes()))] += edge.get_count()
     nx_graph = networkx.Graph()
+    connected = set(temp_graph.get_edge_store().get_node_ids().tolist())
+    nx_graph.add_nodes_from(node_id for node_id in temp_graph.get_node_ids().tolist() if node_id in connected)
     nx_graph.add_edges_from(edge + ({'count': count},) for edge, count in edges.items())
     return nx_graph
+
+
+def temporal_graph2arrays(temp_graph: vtna.graph.TemporalGraph) -> typ.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Aggregates all edges in the provided temporal graph like temporal_graph2networkx, but returns the
+    static/global graph in array form (node1, node2, count) with one entry per pair of interacting nodes.
+    Like temporal_graph2networkx, respects cumulative mode, where counts are summed over all accumulated graphs.
+
+    Args:
+        A vtna temporal graph object
+    """
+    if temp_graph.is_cumulative():
+        graphs = [temp_graph.get_edge_arrays(time_step) for time_step in range(len(temp_graph))]
+        empty = np.empty(0, dtype=np.int64)
+        node1, node2, weights = (np.concatenate([empty] + [graph[i] for graph in graphs]) for i in range(3))
+    else:
+        store = temp_graph.get_edge_store()
+        node1, node2 = store.get_edge_nodes(slice(None))
+        weights = np.diff(store.get_edge_offsets())
+    pairs, inverse = np.unique(np.stack((node1, node2), axis=1), axis=0, return_inverse=True)
+    counts = np.bincount(inverse.ravel(), weights=weights, minlength=len(pairs))
+    return pairs[:, 0], pairs[:, 1], counts.astype(np.int64)